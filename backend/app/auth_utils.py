@@ -1,17 +1,141 @@
+import asyncio
+import base64
 import hashlib
 import secrets
+from concurrent.futures import ThreadPoolExecutor
 
+from .config import settings
 
-def hash_password(password: str) -> str:
-    salt = secrets.token_hex(16)
-    digest = hashlib.sha256(f"{salt}:{password}".encode("utf-8")).hexdigest()
-    return f"{salt}${digest}"
 
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
 
-def verify_password(password: str, stored_hash: str) -> bool:
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+class ScryptHasher:
+    # Encoded as scrypt$n$r$p$salt$digest; verification always uses the parameters stored in the hash.
+    scheme = "scrypt"
+
+    def __init__(self, n: int = 2**14, r: int = 8, p: int = 1) -> None:
+        self.n = n
+        self.r = r
+        self.p = p
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r * p, dklen=32)
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_bytes(16)
+        digest = self._derive(password, salt, self.n, self.r, self.p)
+        return f"{self.scheme}${self.n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            _, n, r, p, salt, expected = encoded.split("$")
+            digest = self._derive(password, _b64decode(salt), int(n), int(r), int(p))
+        except ValueError:
+            return False
+        return secrets.compare_digest(digest, _b64decode(expected))
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return not encoded.startswith(f"{self.scheme}${self.n}${self.r}${self.p}$")
+
+
+class Pbkdf2Hasher:
+    # Encoded as pbkdf2_sha256$iterations$salt$digest.
+    scheme = "pbkdf2_sha256"
+
+    def __init__(self, iterations: int = 600_000) -> None:
+        self.iterations = iterations
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_bytes(16)
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, self.iterations)
+        return f"{self.scheme}${self.iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            _, iterations, salt, expected = encoded.split("$")
+            digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), _b64decode(salt), int(iterations))
+        except ValueError:
+            return False
+        return secrets.compare_digest(digest, _b64decode(expected))
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return not encoded.startswith(f"{self.scheme}${self.iterations}$")
+
+
+PasswordHasher = ScryptHasher | Pbkdf2Hasher
+
+
+def make_hasher(scheme: str) -> PasswordHasher:
+    if scheme == "pbkdf2":
+        return Pbkdf2Hasher(iterations=settings.password_pbkdf2_iterations)
+    if scheme == "scrypt":
+        return ScryptHasher(n=settings.password_scrypt_n)
+    raise ValueError(f"unsupported password hasher: {scheme}")
+
+
+hasher: PasswordHasher = make_hasher(settings.password_hasher)
+HASHERS_BY_SCHEME = {ScryptHasher.scheme: ScryptHasher(), Pbkdf2Hasher.scheme: Pbkdf2Hasher()}
+
+
+def _verify_legacy(password: str, stored_hash: str) -> bool:
+    # Pre-0.4 format: hex salt and single salted SHA-256 as salt$digest.
     try:
         salt, expected = stored_hash.split("$", 1)
     except ValueError:
         return False
     digest = hashlib.sha256(f"{salt}:{password}".encode("utf-8")).hexdigest()
     return secrets.compare_digest(digest, expected)
+
+
+def hash_password(password: str) -> str:
+    return hasher.hash(password)
+
+
+def verify_password(password: str, stored_hash: str) -> bool:
+    scheme = stored_hash.split("$", 1)[0]
+    known = HASHERS_BY_SCHEME.get(scheme)
+    if known is None:
+        return _verify_legacy(password, stored_hash)
+    return known.verify(password, stored_hash)
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    return hasher.needs_rehash(stored_hash)
+
+
+_dummy_hash: tuple[object, str] | None = None
+
+
+def dummy_hash() -> str:
+    # A throwaway hash at the current scheme and cost, made once per configured hasher.
+    global _dummy_hash
+    if _dummy_hash is None or _dummy_hash[0] is not hasher:
+        _dummy_hash = (hasher, hasher.hash(secrets.token_urlsafe(16)))
+    return _dummy_hash[1]
+
+
+class PasswordHashPool:
+    # Hashing is CPU-bound and hashlib releases the GIL, so a fixed set of workers runs it in parallel
+    # while a burst of logins queues here instead of blocking the event loop or the database pool.
+    def __init__(self, max_workers: int) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password")
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, hash_password, password)
+
+    async def verify(self, password: str, stored_hash: str) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, verify_password, password, stored_hash)
+
+    async def verify_unknown(self, password: str) -> None:
+        # Unknown emails still pay one full verify, so response time does not reveal which emails are registered.
+        await self.verify(password, await asyncio.get_running_loop().run_in_executor(self._executor, dummy_hash))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
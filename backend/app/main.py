@@ -1,18 +1,16 @@
+import copy
 import json
 import asyncio
-import secrets
-import urllib.error
-import urllib.parse
-import urllib.request
+from concurrent.futures import Future
+from functools import partial
 from pathlib import Path
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
 
-from fastapi import Cookie, FastAPI, File, Header, HTTPException, Request, Response, UploadFile, status
-from fastapi.encoders import jsonable_encoder
+from fastapi import Cookie, Depends, FastAPI, File, Header, HTTPException, Query, Request, Response, UploadFile, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from fastapi.responses import JSONResponse
 
 from .schemas import (
@@ -25,9 +23,17 @@ from .schemas import (
     AccountCreate,
     AccountUpdate,
     AccountResponse,
+    AccountBalanceAtResponse,
+    AccountBalanceSeriesResponse,
     AuthResponse,
+    BalanceSeriesBucket,
+    BalanceSeriesPoint,
+    BackupFileInfo,
     BackupImportResponse,
+    BackupJobResponse,
     BackupRunResponse,
+    DashboardPeriod,
+    DashboardSummaryResponse,
     GoogleCalendarConnectRequest,
     GoogleCalendarConnectResponse,
     GoogleCalendarSyncRunRequest,
@@ -45,11 +51,16 @@ from .schemas import (
     UserProfileUpdate,
     UserPasswordChange,
     NotificationRuleCreate,
+    NetWorthResponse,
     NotificationRuleResponse,
     PropertyCostCreate,
     PropertyCostResponse,
     PropertyCreate,
     PropertyResponse,
+    RateCacheStatsResponse,
+    RateHistoryBucket,
+    RateHistoryPoint,
+    RateHistoryResponse,
     RateSnapshotItem,
     RateSnapshotUpsert,
     RatesRefreshRequest,
@@ -60,6 +71,7 @@ from .schemas import (
     TransactionCreate,
     TransactionCategoryStatsResponse,
     TransactionCategoryRename,
+    TransactionListQuery,
     TransactionUpdate,
     TransactionTransferCreate,
     TransactionTransferResponse,
@@ -71,8 +83,29 @@ from .schemas import (
     VehicleServiceRuleCreate,
     VehicleServiceRuleResponse,
 )
+from .auth_utils import PasswordHashPool, needs_rehash
+from .config import settings as app_config
+from .services.backup import (
+    BACKUP_READ_ERRORS,
+    backup_chain,
+    cleanup_backups,
+    compression_suffix,
+    decompressed,
+    iter_backup_json,
+    iter_backup_sections,
+    iter_restored_sections,
+    list_stored_backups,
+    plan_backup,
+    read_backup_meta,
+    write_backup_file,
+)
+from .services.balances import BalanceSeriesCache
+from .services.backup_jobs import BackupBusyError, BackupJob, BackupJobRunner
+from .services.rates import FakeRateProvider, ProviderBackoff, QuoteCache, RateClient, RateRefresher
+from .services.sessions import MemorySessionStore, PostgresSessionStore, SessionStore
 from .services.sync import SyncStats, compute_event_hash, compute_event_uid, make_provider_event_id
-from .persistence import get_persistence
+from .services.valuation import ValuationCache, rate_graph, value_accounts
+from .persistence import PostgresPersistence, get_async_persistence
 from .store import store
 
 app = FastAPI(
@@ -95,10 +128,34 @@ else:
     BACKUP_DIR = ROOT_DIR / "backups"
 CUSTOM_LOCALES_DIR.mkdir(parents=True, exist_ok=True)
 BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-persistence = get_persistence()
+BACKUP_UPLOAD_SUFFIXES = (".json", ".json.gz", ".json.zst")
+BACKUP_MEDIA_TYPES = {".json": "application/json", ".gz": "application/gzip", ".zst": "application/zstd"}
+persistence = get_async_persistence()
+backup_jobs = BackupJobRunner()
+password_hashing = PasswordHashPool(app_config.password_hash_workers)
+rate_cache = QuoteCache(
+    FakeRateProvider() if app_config.rates_provider == "fake" else RateClient(),
+    ttl_seconds=app_config.rates_cache_ttl_seconds,
+    stale_seconds=app_config.rates_cache_stale_seconds,
+)
+rate_refresher = RateRefresher(rate_cache, ProviderBackoff(max_seconds=app_config.rates_backoff_max_seconds))
+rate_refresh_task: asyncio.Task | None = None
+balance_reconcile_task: asyncio.Task | None = None
+valuation_cache = ValuationCache(ttl_seconds=app_config.valuation_cache_seconds)
+balance_series_cache = BalanceSeriesCache(ttl_seconds=app_config.balance_series_cache_seconds)
 backup_scheduler_task: asyncio.Task | None = None
-active_sessions: dict[str, dict[str, Any]] = {}
+session_sweep_task: asyncio.Task | None = None
+session_store: SessionStore = (
+    PostgresSessionStore(persistence.backend.engine, persistence.run)
+    if isinstance(persistence.backend, PostgresPersistence)
+    else MemorySessionStore()
+)
+SESSION_SWEEP_SECONDS = 60
 SESSION_COOKIE_NAME = "mf_session"
+TRANSACTIONS_CURSOR_HEADER = "X-Next-Cursor"
+RATE_HISTORY_DEFAULT_DAYS = 30
+BALANCE_SERIES_DEFAULT_DAYS = 30
+BALANCE_SERIES_MAX_POINTS = 1000
 
 
 def _extract_token_from_request(request: Request) -> str | None:
@@ -110,38 +167,54 @@ def _extract_token_from_request(request: Request) -> str | None:
     return request.cookies.get(SESSION_COOKIE_NAME)
 
 
-def _session_timeout_minutes(user_id: UUID) -> int | None:
+async def _session_timeout_minutes(user_id: UUID) -> int | None:
     try:
-        return persistence.get_app_settings(user_id).sessionTimeoutMinutes
+        return (await persistence.get_app_settings(user_id)).sessionTimeoutMinutes
     except Exception:
         return None
 
 
-def _get_session_user_id(token: str | None) -> UUID | None:
+def _session_ttl(timeout_minutes: int | None) -> timedelta:
+    return timedelta(minutes=timeout_minutes or app_config.session_max_idle_minutes)
+
+
+async def _get_session_user_id(token: str | None) -> UUID | None:
     if not token:
         return None
-    session = active_sessions.get(token)
+    session = await session_store.get(token)
     if session is None:
         return None
     now = datetime.now(timezone.utc)
-    last_seen = session.get("last_seen", now)
-    current_user_id = session.get("user_id")
-    if current_user_id is None:
-        del active_sessions[token]
-        return None
-    timeout_minutes = _session_timeout_minutes(current_user_id)
-    if timeout_minutes and (now - last_seen) > timedelta(minutes=timeout_minutes):
-        del active_sessions[token]
+    timeout_minutes = await _session_timeout_minutes(session.user_id)
+    if timeout_minutes and (now - session.last_seen) > timedelta(minutes=timeout_minutes):
+        await session_store.delete(token)
         return None
-    session["last_seen"] = now
-    active_sessions[token] = session
-    return current_user_id
+    await session_store.touch(token, _session_ttl(timeout_minutes))
+    return session.user_id
 
 
-def _create_session(user_id: UUID) -> str:
-    token = secrets.token_urlsafe(32)
-    active_sessions[token] = {"user_id": user_id, "last_seen": datetime.now(timezone.utc)}
-    return token
+async def current_user(
+    request: Request,
+    authorization: str | None = Header(default=None),
+    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+) -> UUID:
+    # Handler dependency; FastAPI resolves it once per request.
+    token = session_token
+    if authorization:
+        token = _token_from_header(authorization)
+    if not token:
+        raise HTTPException(status_code=401, detail="missing session token")
+    # ui_auth_middleware has already resolved this token for API paths; reuse it instead of touching the session twice.
+    if getattr(request.state, "session_token", None) == token:
+        return request.state.session_user_id
+    user_id = await _get_session_user_id(token)
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="invalid or expired token")
+    return user_id
+
+
+async def _create_session(user_id: UUID) -> str:
+    return await session_store.create(user_id, _session_ttl(await _session_timeout_minutes(user_id)))
 
 
 def build_error_response(details: list[ApiErrorDetail], message: str = "Invalid request payload") -> JSONResponse:
@@ -179,11 +252,14 @@ async def ui_auth_middleware(request: Request, call_next):
         return await call_next(request)
     if path.startswith("/api/v1") and path not in public_api:
         token = _extract_token_from_request(request)
-        if not _get_session_user_id(token):
+        user_id = await _get_session_user_id(token)
+        if not user_id:
             return JSONResponse(status_code=401, content={"detail": "authentication required"})
+        request.state.session_token = token
+        request.state.session_user_id = user_id
     if path.startswith("/ui") and path != "/ui/get-started":
         session_token = _extract_token_from_request(request)
-        if not _get_session_user_id(session_token):
+        if not await _get_session_user_id(session_token):
             return RedirectResponse(url="/ui/get-started", status_code=302)
     return await call_next(request)
 
@@ -191,7 +267,7 @@ async def ui_auth_middleware(request: Request, call_next):
 @app.get("/")
 async def root(request: Request) -> RedirectResponse:
     token = _extract_token_from_request(request)
-    if _get_session_user_id(token):
+    if await _get_session_user_id(token):
         return RedirectResponse(url="/ui/dashboard", status_code=302)
     return RedirectResponse(url="/ui/get-started", status_code=302)
 
@@ -203,30 +279,26 @@ async def health() -> HealthResponse:
 
 @app.get("/api/v1/settings/app", response_model=AppSettings)
 async def get_app_settings(
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> AppSettings:
-    user_id = _require_user(authorization, session_token)
-    return persistence.get_app_settings(user_id)
+    return await persistence.get_app_settings(user_id)
 
 
 @app.put("/api/v1/settings/app", response_model=AppSettings)
 async def update_app_settings(
     payload: AppSettingsUpdate,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> AppSettings:
-    user_id = _require_user(authorization, session_token)
-    return persistence.update_app_settings(user_id, payload)
+    updated = await persistence.update_app_settings(user_id, payload)
+    valuation_cache.invalidate(user_id)
+    return updated
 
 
 @app.get("/api/v1/i18n/locales", response_model=LocaleListResponse)
 async def get_locales(
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> LocaleListResponse:
-    user_id = _require_user(authorization, session_token)
-    locales = persistence.list_locales(user_id)
+    locales = await persistence.list_locales(user_id)
     return LocaleListResponse(locales=locales)
 
 
@@ -238,11 +310,9 @@ async def get_public_locales() -> LocaleListResponse:
 @app.get("/api/v1/i18n/{locale}", response_model=LocaleBundleResponse)
 async def get_locale_bundle(
     locale: str,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> LocaleBundleResponse:
-    user_id = _require_user(authorization, session_token)
-    messages = persistence.get_locale_bundle(user_id, locale)
+    messages = await persistence.get_locale_bundle(user_id, locale)
     if not messages:
         raise HTTPException(status_code=404, detail=f"locale not found: {locale}")
     return LocaleBundleResponse(locale=locale, messages=messages)
@@ -260,22 +330,18 @@ async def get_public_locale_bundle(locale: str) -> LocaleBundleResponse:
 async def upsert_custom_locale(
     locale: str,
     payload: dict[str, str],
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> LocaleBundleResponse:
-    user_id = _require_user(authorization, session_token)
-    merged = persistence.upsert_custom_locale(user_id, locale, payload)
+    merged = await persistence.upsert_custom_locale(user_id, locale, payload)
     return LocaleBundleResponse(locale=locale, messages=merged)
 
 
 @app.post("/api/v1/i18n/{locale}/custom/publish", response_model=LocalePublishResponse)
 async def publish_custom_locale(
     locale: str,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> LocalePublishResponse:
-    user_id = _require_user(authorization, session_token)
-    custom = persistence.get_custom_locale(user_id, locale)
+    custom = await persistence.get_custom_locale(user_id, locale)
     if not custom:
         raise HTTPException(status_code=404, detail=f"custom locale not found: {locale}")
     file_path = CUSTOM_LOCALES_DIR / f"{locale}.json"
@@ -285,23 +351,55 @@ async def publish_custom_locale(
 
 @app.get("/api/v1/rates", response_model=RatesStateResponse)
 async def get_rates_state(
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> RatesStateResponse:
-    user_id = _require_user(authorization, session_token)
-    state = persistence.get_rates_state(user_id)
+    state = await persistence.get_rates_state(user_id)
+    watchlist = state.get("watchlist", [])
     snapshots = {k: RateSnapshotItem(**v) for k, v in state.get("snapshots", {}).items()}
-    return RatesStateResponse(watchlist=state.get("watchlist", []), snapshots=snapshots)
+    # Symbols added since the last scheduled refresh are filled from the shared cache, never from a provider.
+    for sym, quote in rate_cache.peek([sym for sym in watchlist if sym not in snapshots]).items():
+        snapshots[sym] = RateSnapshotItem(**quote)
+    return RatesStateResponse(watchlist=watchlist, snapshots=snapshots)
+
+
+def _as_utc(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+@app.get("/api/v1/rates/history", response_model=RateHistoryResponse, dependencies=[Depends(current_user)])
+async def get_rate_history(
+    symbol: str,
+    range_from: datetime | None = Query(default=None, alias="from"),
+    range_to: datetime | None = Query(default=None, alias="to"),
+    bucket: RateHistoryBucket = RateHistoryBucket.day,
+) -> RateHistoryResponse:
+    end = _as_utc(range_to) if range_to else datetime.now(timezone.utc)
+    start = _as_utc(range_from) if range_from else end - timedelta(days=RATE_HISTORY_DEFAULT_DAYS)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="from must be before to")
+    sym = symbol.strip().upper()
+    rows = await persistence.get_rate_history(sym, start, end, bucket)
+    points = [
+        RateHistoryPoint(
+            bucketStart=row["bucket_start"],
+            open=row["open"],
+            high=row["high"],
+            low=row["low"],
+            close=row["close"],
+            samples=row["samples"],
+        )
+        for row in rows
+    ]
+    return RateHistoryResponse(symbol=sym, bucket=bucket, currency=rows[-1]["currency"] if rows else None, points=points)
 
 
 @app.put("/api/v1/rates/watchlist", response_model=RatesStateResponse)
 async def put_rates_watchlist(
     payload: RatesWatchlistUpdate,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> RatesStateResponse:
-    user_id = _require_user(authorization, session_token)
-    state = persistence.update_rates_watchlist(user_id, payload)
+    state = await persistence.update_rates_watchlist(user_id, payload)
+    valuation_cache.invalidate(user_id)
     snapshots = {k: RateSnapshotItem(**v) for k, v in state.get("snapshots", {}).items()}
     return RatesStateResponse(watchlist=state.get("watchlist", []), snapshots=snapshots)
 
@@ -309,11 +407,10 @@ async def put_rates_watchlist(
 @app.post("/api/v1/rates/snapshot", response_model=RatesStateResponse)
 async def post_rate_snapshot(
     payload: RateSnapshotUpsert,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> RatesStateResponse:
-    user_id = _require_user(authorization, session_token)
-    state = persistence.upsert_rate_snapshot(user_id, payload)
+    state = await persistence.upsert_rate_snapshot(user_id, payload)
+    valuation_cache.invalidate(user_id)
     snapshots = {k: RateSnapshotItem(**v) for k, v in state.get("snapshots", {}).items()}
     return RatesStateResponse(watchlist=state.get("watchlist", []), snapshots=snapshots)
 
@@ -321,11 +418,10 @@ async def post_rate_snapshot(
 @app.delete("/api/v1/rates/watchlist/{symbol}", response_model=RatesStateResponse)
 async def delete_rate_symbol(
     symbol: str,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> RatesStateResponse:
-    user_id = _require_user(authorization, session_token)
-    state = persistence.delete_rate_symbol(user_id, symbol)
+    state = await persistence.delete_rate_symbol(user_id, symbol)
+    valuation_cache.invalidate(user_id)
     snapshots = {k: RateSnapshotItem(**v) for k, v in state.get("snapshots", {}).items()}
     return RatesStateResponse(watchlist=state.get("watchlist", []), snapshots=snapshots)
 
@@ -333,29 +429,38 @@ async def delete_rate_symbol(
 @app.post("/api/v1/rates/refresh", response_model=RatesRefreshResponse)
 async def refresh_rates(
     payload: RatesRefreshRequest,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> RatesRefreshResponse:
-    user_id = _require_user(authorization, session_token)
-    current = persistence.get_rates_state(user_id)
-    symbols = payload.symbols if payload.symbols is not None else current.get("watchlist", [])
-    updated_raw, skipped = _refresh_rates_from_public_apis(symbols)
-    for item in updated_raw.values():
-        persistence.upsert_rate_snapshot(
-            user_id,
+    symbols = payload.symbols
+    if symbols is None:
+        symbols = (await persistence.get_rates_state(user_id)).get("watchlist", [])
+    updated_raw, skipped = await rate_cache.fetch(symbols)
+    if updated_raw:
+        await persistence.append_rate_history(list(updated_raw.values()))
+    state = await persistence.upsert_rate_snapshots(
+        user_id,
+        [
             RateSnapshotUpsert(
                 symbol=item["symbol"],
                 price=item["price"],
                 currency=item["currency"],
                 source=item["source"],
                 updatedAt=item["updatedAt"],
-            ),
-        )
-    state = persistence.get_rates_state(user_id)
+            )
+            for item in updated_raw.values()
+        ],
+    )
+    valuation_cache.invalidate(user_id)
     snapshots = {k: RateSnapshotItem(**v) for k, v in state.get("snapshots", {}).items()}
     return RatesRefreshResponse(updated=sorted(updated_raw.keys()), skipped=skipped, snapshots=snapshots)
 
 
+@app.get("/api/v1/admin/rates/cache", response_model=RateCacheStatsResponse, dependencies=[Depends(current_user)])
+async def rate_cache_stats(
+) -> RateCacheStatsResponse:
+    return RateCacheStatsResponse(**rate_cache.stats())
+
+
 @app.get("/ui/settings")
 async def ui_settings() -> FileResponse:
     return FileResponse(UI_DIR / "settings.html")
@@ -460,105 +565,6 @@ def _token_from_header(authorization: str | None) -> str:
     return parts[1].strip()
 
 
-def _require_user(authorization: str | None = None, session_token: str | None = None) -> UUID:
-    token = session_token
-    if authorization:
-        token = _token_from_header(authorization)
-    if not token:
-        raise HTTPException(status_code=401, detail="missing session token")
-    user_id = _get_session_user_id(token)
-    if user_id is None:
-        raise HTTPException(status_code=401, detail="invalid or expired token")
-    return user_id
-
-
-CRYPTO_SYMBOL_MAP = {
-    "BTC": "bitcoin",
-    "ETH": "ethereum",
-    "SOL": "solana",
-    "SHIB": "shiba-inu",
-    "ADA": "cardano",
-    "DOGE": "dogecoin",
-}
-
-
-def _is_fx_pair(symbol: str) -> bool:
-    parts = symbol.split("/")
-    return len(parts) == 2 and all(len(p) == 3 and p.isalpha() for p in parts)
-
-
-def _http_get_json(url: str) -> dict[str, Any]:
-    req = urllib.request.Request(url, headers={"User-Agent": "my-finance/0.3"})
-    with urllib.request.urlopen(req, timeout=10) as response:
-        return json.loads(response.read().decode("utf-8"))
-
-
-def _refresh_rates_from_public_apis(symbols: list[str]) -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
-    updated: dict[str, dict[str, Any]] = {}
-    skipped: dict[str, str] = {}
-    now = datetime.now(timezone.utc)
-
-    crypto_symbols = [s for s in symbols if s in CRYPTO_SYMBOL_MAP]
-    if crypto_symbols:
-        ids = ",".join(CRYPTO_SYMBOL_MAP[s] for s in crypto_symbols)
-        q = urllib.parse.urlencode({"ids": ids, "vs_currencies": "usd"})
-        url = f"https://api.coingecko.com/api/v3/simple/price?{q}"
-        try:
-            data = _http_get_json(url)
-            for sym in crypto_symbols:
-                key = CRYPTO_SYMBOL_MAP[sym]
-                price = data.get(key, {}).get("usd")
-                if price is None:
-                    skipped[sym] = "no price in provider response"
-                    continue
-                updated[sym] = {
-                    "symbol": sym,
-                    "price": price,
-                    "currency": "USD",
-                    "source": "coingecko",
-                    "updatedAt": now,
-                }
-        except (urllib.error.URLError, TimeoutError, ValueError) as exc:
-            for sym in crypto_symbols:
-                skipped[sym] = f"coingecko error: {exc}"
-
-    for sym in symbols:
-        if sym in updated or sym in CRYPTO_SYMBOL_MAP:
-            continue
-        if _is_fx_pair(sym):
-            base, quote = sym.split("/")
-            if base == quote:
-                updated[sym] = {
-                    "symbol": sym,
-                    "price": 1.0,
-                    "currency": quote,
-                    "source": "fx-static",
-                    "updatedAt": now,
-                }
-                continue
-            q = urllib.parse.urlencode({"from": base, "to": quote})
-            url = f"https://api.frankfurter.app/latest?{q}"
-            try:
-                data = _http_get_json(url)
-                rate = data.get("rates", {}).get(quote)
-                if rate is None:
-                    skipped[sym] = "no fx rate in provider response"
-                    continue
-                updated[sym] = {
-                    "symbol": sym,
-                    "price": rate,
-                    "currency": quote,
-                    "source": "frankfurter",
-                    "updatedAt": now,
-                }
-            except (urllib.error.URLError, TimeoutError, ValueError) as exc:
-                skipped[sym] = f"frankfurter error: {exc}"
-            continue
-        skipped[sym] = "unsupported symbol for auto-refresh"
-
-    return updated, skipped
-
-
 def _transaction_response_from_row(row: dict[str, Any]) -> TransactionResponse:
     return TransactionResponse(
         id=row["id"],
@@ -580,18 +586,25 @@ def _transaction_response_from_row(row: dict[str, Any]) -> TransactionResponse:
 
 @app.post("/api/v1/auth/register", response_model=AuthResponse, status_code=201)
 async def auth_register(payload: RegisterRequest, response: Response) -> AuthResponse:
-    user = persistence.register_user(payload.email, payload.password, payload.fullName)
-    token = _create_session(user["id"])
+    password_hash = await password_hashing.hash(payload.password)
+    user = await persistence.register_user(payload.email, password_hash, payload.fullName)
+    token = await _create_session(user["id"])
     response.set_cookie(SESSION_COOKIE_NAME, token, httponly=True, samesite="lax", secure=False)
     return AuthResponse(token=token, userId=user["id"], email=user["email"], fullName=user.get("full_name"))
 
 
 @app.post("/api/v1/auth/login", response_model=AuthResponse)
 async def auth_login(payload: LoginRequest, response: Response) -> AuthResponse:
-    user = persistence.authenticate_user(payload.email, payload.password)
+    user = await persistence.get_login_credentials(payload.email)
     if user is None:
+        await password_hashing.verify_unknown(payload.password)
         raise HTTPException(status_code=401, detail="invalid email or password")
-    token = _create_session(user["id"])
+    if not await password_hashing.verify(payload.password, user["password_hash"]):
+        raise HTTPException(status_code=401, detail="invalid email or password")
+    if needs_rehash(user["password_hash"]):
+        # Legacy or weaker-cost hashes are upgraded while the plaintext is at hand.
+        await persistence.set_password_hash(user["id"], await password_hashing.hash(payload.password))
+    token = await _create_session(user["id"])
     if payload.rememberMe:
         response.set_cookie(SESSION_COOKIE_NAME, token, httponly=True, samesite="lax", secure=False, max_age=60 * 60 * 24 * 30)
     else:
@@ -600,9 +613,8 @@ async def auth_login(payload: LoginRequest, response: Response) -> AuthResponse:
 
 
 @app.get("/api/v1/auth/me", response_model=AuthResponse)
-async def auth_me(authorization: str | None = Header(default=None), session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME)) -> AuthResponse:
-    user_id = _require_user(authorization, session_token)
-    user = persistence.get_user_by_id(user_id)
+async def auth_me(authorization: str | None = Header(default=None), session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME), user_id: UUID = Depends(current_user)) -> AuthResponse:
+    user = await persistence.get_user_by_id(user_id)
     if user is None:
         raise HTTPException(status_code=401, detail="user not found")
     token = _token_from_header(authorization) if authorization else session_token
@@ -611,11 +623,9 @@ async def auth_me(authorization: str | None = Header(default=None), session_toke
 
 @app.get("/api/v1/users/me", response_model=UserProfileResponse)
 async def get_user_profile(
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> UserProfileResponse:
-    user_id = _require_user(authorization, session_token)
-    user = persistence.get_user_by_id(user_id)
+    user = await persistence.get_user_by_id(user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="user not found")
     return UserProfileResponse(userId=user["id"], email=user["email"], fullName=user.get("full_name"))
@@ -624,22 +634,23 @@ async def get_user_profile(
 @app.put("/api/v1/users/me", response_model=UserProfileResponse)
 async def update_user_profile(
     payload: UserProfileUpdate,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> UserProfileResponse:
-    user_id = _require_user(authorization, session_token)
-    user = persistence.update_user_profile(user_id, payload.email, payload.fullName)
+    user = await persistence.update_user_profile(user_id, payload.email, payload.fullName)
     return UserProfileResponse(userId=user["id"], email=user["email"], fullName=user.get("full_name"))
 
 
 @app.post("/api/v1/users/me/change-password")
 async def change_user_password(
     payload: UserPasswordChange,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> dict[str, bool]:
-    user_id = _require_user(authorization, session_token)
-    persistence.change_user_password(user_id, payload.currentPassword, payload.newPassword)
+    current_hash = await persistence.get_password_hash(user_id)
+    if current_hash is None:
+        raise HTTPException(status_code=404, detail="credentials not found")
+    if not await password_hashing.verify(payload.currentPassword, current_hash):
+        raise HTTPException(status_code=401, detail="invalid current password")
+    await persistence.set_password_hash(user_id, await password_hashing.hash(payload.newPassword))
     return {"updated": True}
 
 
@@ -650,8 +661,8 @@ async def auth_logout(
     session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
 ) -> dict[str, bool]:
     token = _token_from_header(authorization) if authorization else session_token
-    if token and token in active_sessions:
-        del active_sessions[token]
+    if token:
+        await session_store.delete(token)
     response.delete_cookie(SESSION_COOKIE_NAME)
     return {"ok": True}
 
@@ -659,14 +670,10 @@ async def auth_logout(
 @app.delete("/api/v1/auth/me")
 async def delete_my_account(
     response: Response,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> dict[str, bool]:
-    user_id = _require_user(authorization, session_token)
-    persistence.delete_user(user_id)
-    tokens_to_remove = [token for token, data in active_sessions.items() if data.get("user_id") == user_id]
-    for token in tokens_to_remove:
-        del active_sessions[token]
+    await persistence.delete_user(user_id)
+    await session_store.delete_user(user_id)
     response.delete_cookie(SESSION_COOKIE_NAME)
     return {"deleted": True}
 
@@ -674,11 +681,10 @@ async def delete_my_account(
 @app.post("/api/v1/accounts", response_model=AccountResponse, status_code=201)
 async def create_account(
     payload: AccountCreate,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> AccountResponse:
-    user_id = _require_user(authorization, session_token)
-    row = persistence.create_account(user_id, payload)
+    row = await persistence.create_account(user_id, payload)
+    valuation_cache.invalidate(user_id)
     return AccountResponse(
         id=row["id"],
         name=row["name"],
@@ -693,11 +699,9 @@ async def create_account(
 
 @app.get("/api/v1/accounts", response_model=list[AccountResponse])
 async def list_accounts(
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> list[AccountResponse]:
-    user_id = _require_user(authorization, session_token)
-    rows = persistence.list_accounts(user_id)
+    rows = await persistence.list_accounts(user_id)
     return [
         AccountResponse(
             id=row["id"],
@@ -713,15 +717,46 @@ async def list_accounts(
     ]
 
 
+@app.get("/api/v1/dashboard/summary", response_model=DashboardSummaryResponse)
+async def dashboard_summary(
+    period: DashboardPeriod = DashboardPeriod.month,
+    user_id: UUID = Depends(current_user),
+) -> DashboardSummaryResponse:
+    summary = await persistence.get_dashboard_summary(user_id, period)
+    return DashboardSummaryResponse(**summary)
+
+
+@app.get("/api/v1/valuation/net-worth", response_model=NetWorthResponse)
+async def net_worth(
+    user_id: UUID = Depends(current_user),
+) -> NetWorthResponse:
+    cached = valuation_cache.get(user_id)
+    if cached is not None:
+        return cached
+    cfg = await persistence.get_app_settings(user_id)
+    accounts = await persistence.list_accounts(user_id)
+    state = await persistence.get_rates_state(user_id)
+    currencies = list(dict.fromkeys([cfg.defaultDisplayCurrency.upper(), cfg.secondaryDisplayCurrency.upper()]))
+    snapshots = list(state.get("snapshots", {}).values())
+    valuation = value_accounts(accounts, rate_graph(snapshots), currencies)
+    result = NetWorthResponse(
+        **valuation,
+        ratesAsOf=max((snap["updatedAt"] for snap in snapshots), default=None),
+        computedAt=datetime.now(timezone.utc),
+    )
+    valuation_cache.put(user_id, result)
+    return result
+
+
 @app.put("/api/v1/accounts/{account_id}", response_model=AccountResponse)
 async def update_account(
     account_id: UUID,
     payload: AccountUpdate,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> AccountResponse:
-    user_id = _require_user(authorization, session_token)
-    row = persistence.update_account(user_id, account_id, payload)
+    row = await persistence.update_account(user_id, account_id, payload)
+    valuation_cache.invalidate(user_id)
+    balance_series_cache.invalidate(user_id)
     return AccountResponse(
         id=row["id"],
         name=row["name"],
@@ -734,71 +769,131 @@ async def update_account(
     )
 
 
+@app.get("/api/v1/accounts/{account_id}/balance", response_model=AccountBalanceAtResponse)
+async def get_account_balance_at(
+    account_id: UUID,
+    at: date | None = None,
+    user_id: UUID = Depends(current_user),
+) -> AccountBalanceAtResponse:
+    day = at or datetime.now(timezone.utc).date()
+    row = await persistence.get_account_balance_at(user_id, account_id, day)
+    return AccountBalanceAtResponse(accountId=row["id"], at=day, currency=row["currency"], balance=row["balance"])
+
+
+@app.get("/api/v1/accounts/{account_id}/balance-series", response_model=AccountBalanceSeriesResponse)
+async def get_account_balance_series(
+    account_id: UUID,
+    range_from: date | None = Query(default=None, alias="from"),
+    range_to: date | None = Query(default=None, alias="to"),
+    bucket: BalanceSeriesBucket = BalanceSeriesBucket.day,
+    user_id: UUID = Depends(current_user),
+) -> AccountBalanceSeriesResponse:
+    end = range_to or datetime.now(timezone.utc).date()
+    start = range_from or end - timedelta(days=BALANCE_SERIES_DEFAULT_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+    if bucket == BalanceSeriesBucket.day and (end - start).days >= BALANCE_SERIES_MAX_POINTS:
+        raise HTTPException(status_code=400, detail=f"at most {BALANCE_SERIES_MAX_POINTS} daily points; use bucket=week or month")
+    key = (account_id, start, end, bucket)
+    cached = balance_series_cache.get(user_id, key)
+    if cached is not None:
+        return cached
+    series = await persistence.get_account_balance_series(user_id, account_id, start, end, bucket)
+    result = AccountBalanceSeriesResponse(
+        accountId=account_id,
+        currency=series["currency"],
+        bucket=bucket,
+        fromDate=start,
+        toDate=end,
+        openingBalance=series["opening"],
+        points=[BalanceSeriesPoint(bucketStart=p["bucket_start"], balance=p["balance"], change=p["change"]) for p in series["points"]],
+    )
+    balance_series_cache.put(user_id, key, result)
+    return result
+
+
 @app.delete("/api/v1/accounts/{account_id}")
 async def delete_account(
     account_id: UUID,
     action: AccountDeleteAction,
     targetAccountId: UUID | None = None,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> dict[str, bool]:
-    user_id = _require_user(authorization, session_token)
-    persistence.delete_account(user_id, account_id, action, targetAccountId)
+    await persistence.delete_account(user_id, account_id, action, targetAccountId)
+    valuation_cache.invalidate(user_id)
+    balance_series_cache.invalidate(user_id)
     return {"deleted": True}
 
 
 @app.post("/api/v1/transactions", response_model=TransactionResponse, status_code=201)
 async def create_transaction(
     payload: TransactionCreate,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> TransactionResponse:
-    user_id = _require_user(authorization, session_token)
-    row = persistence.create_transaction(user_id, payload)
+    row = await persistence.create_transaction(user_id, payload)
+    valuation_cache.invalidate(user_id)
+    balance_series_cache.invalidate(user_id)
     return _transaction_response_from_row(row)
 
 
 @app.get("/api/v1/transactions", response_model=list[TransactionResponse])
 async def list_transactions(
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    response: Response,
+    accountId: UUID | None = None,
+    direction: str | None = None,
+    category: str | None = None,
+    occurredFrom: datetime | None = None,
+    occurredTo: datetime | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
+    user_id: UUID = Depends(current_user),
 ) -> list[TransactionResponse]:
-    user_id = _require_user(authorization, session_token)
-    rows = persistence.list_transactions(user_id)
-    return [_transaction_response_from_row(row) for row in rows]
+    query = TransactionListQuery(
+        accountId=accountId,
+        direction=direction,
+        category=category,
+        occurredFrom=occurredFrom,
+        occurredTo=occurredTo,
+        limit=limit,
+        cursor=cursor,
+    )
+    page = await persistence.list_transactions(user_id, query)
+    if page["nextCursor"]:
+        response.headers[TRANSACTIONS_CURSOR_HEADER] = page["nextCursor"]
+    return [_transaction_response_from_row(row) for row in page["items"]]
 
 
 @app.put("/api/v1/transactions/{transaction_id}", response_model=TransactionResponse)
 async def update_transaction(
     transaction_id: UUID,
     payload: TransactionUpdate,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> TransactionResponse:
-    user_id = _require_user(authorization, session_token)
-    row = persistence.update_transaction(user_id, transaction_id, payload)
+    row = await persistence.update_transaction(user_id, transaction_id, payload)
+    valuation_cache.invalidate(user_id)
+    balance_series_cache.invalidate(user_id)
     return _transaction_response_from_row(row)
 
 
 @app.delete("/api/v1/transactions/{transaction_id}")
 async def delete_transaction(
     transaction_id: UUID,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> dict[str, bool]:
-    user_id = _require_user(authorization, session_token)
-    persistence.delete_transaction(user_id, transaction_id)
+    await persistence.delete_transaction(user_id, transaction_id)
+    valuation_cache.invalidate(user_id)
+    balance_series_cache.invalidate(user_id)
     return {"deleted": True}
 
 
 @app.post("/api/v1/account-transfers", response_model=TransactionTransferResponse, status_code=201)
 async def transfer_transaction(
     payload: TransactionTransferCreate,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> TransactionTransferResponse:
-    user_id = _require_user(authorization, session_token)
-    data = persistence.transfer_between_accounts(user_id, payload)
+    data = await persistence.transfer_between_accounts(user_id, payload)
+    valuation_cache.invalidate(user_id)
+    balance_series_cache.invalidate(user_id)
     return TransactionTransferResponse(
         transferGroupId=data["transferGroupId"],
         outgoing=_transaction_response_from_row(data["outgoing"]),
@@ -808,62 +903,54 @@ async def transfer_transaction(
 
 @app.get("/api/v1/transactions/categories", response_model=TransactionCategoryStatsResponse)
 async def transaction_categories(
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> TransactionCategoryStatsResponse:
-    user_id = _require_user(authorization, session_token)
-    return persistence.list_transaction_category_stats(user_id)
+    return await persistence.list_transaction_category_stats(user_id)
 
 
 @app.put("/api/v1/transactions/categories/{category}", response_model=TransactionCategoryStatsResponse)
 async def rename_transaction_category(
     category: str,
     payload: TransactionCategoryRename,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> TransactionCategoryStatsResponse:
-    user_id = _require_user(authorization, session_token)
-    return persistence.rename_transaction_category(user_id, category, payload)
+    return await persistence.rename_transaction_category(user_id, category, payload)
 
 
 @app.delete("/api/v1/transactions/categories/{category}", response_model=TransactionCategoryStatsResponse)
 async def delete_transaction_category(
     category: str,
     deleteTransactions: bool = False,
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> TransactionCategoryStatsResponse:
-    user_id = _require_user(authorization, session_token)
-    return persistence.delete_transaction_category(user_id, category, deleteTransactions)
+    result = await persistence.delete_transaction_category(user_id, category, deleteTransactions)
+    if deleteTransactions:
+        valuation_cache.invalidate(user_id)
+        balance_series_cache.invalidate(user_id)
+    return result
 
 
-@app.post("/api/v1/auth/ping")
+@app.post("/api/v1/auth/ping", dependencies=[Depends(current_user)])
 async def auth_ping(
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
 ) -> dict[str, bool]:
-    _require_user(authorization, session_token)
     return {"ok": True}
 
 
 @app.get("/api/v1/admin/backup/export")
 async def export_backup(
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
-) -> dict[str, Any]:
-    user_id = _require_user(authorization, session_token)
-    return persistence.export_backup(user_id)
+    user_id: UUID = Depends(current_user),
+) -> StreamingResponse:
+    backend = persistence.backend
+    return StreamingResponse(
+        iter_backup_json(backend.backup_meta(), backend.export_backup_sections(user_id)),
+        media_type="application/json",
+    )
 
 
 @app.post("/api/v1/bootstrap/restore", response_model=BackupImportResponse)
 async def bootstrap_restore(file: UploadFile = File(...)) -> BackupImportResponse:
-    if not file.filename.lower().endswith(".json"):
+    if not file.filename.lower().endswith(BACKUP_UPLOAD_SUFFIXES):
         raise HTTPException(status_code=400, detail="backup file must be JSON")
-    content = await file.read()
-    try:
-        payload = json.loads(content.decode("utf-8"))
-    except json.JSONDecodeError as exc:
-        raise HTTPException(status_code=400, detail=f"invalid JSON: {exc}") from exc
     user_id: UUID | None = None
     default_user_id = getattr(persistence, "default_user_id", None)
     if default_user_id:
@@ -871,91 +958,209 @@ async def bootstrap_restore(file: UploadFile = File(...)) -> BackupImportRespons
     elif store.users:
         user_id = next(iter(store.users.keys()))
     if user_id is None:
-        user = persistence.register_user("bootstrap@local", "ChangeMe123!", "Bootstrap User")
+        password_hash = await password_hashing.hash("ChangeMe123!")
+        user = await persistence.register_user("bootstrap@local", password_hash, "Bootstrap User")
         user_id = user["id"]
-    counts = persistence.import_backup(user_id, payload)
-    return BackupImportResponse(replaced=True, counts=counts)
+    return await _import_backup_upload(user_id, file)
+
+
+async def _import_backup_upload(user_id: UUID, file: UploadFile) -> BackupImportResponse:
+    # The upload is already spooled to a temp file; rows are parsed from it lazily while importing.
+    await file.seek(0)
+    try:
+        if read_backup_meta(decompressed(file.file)).get("kind") == "incremental":
+            raise HTTPException(status_code=400, detail="incremental backup must be restored from its chain on the server")
+        await file.seek(0)
+        result = await persistence.import_backup_sections(user_id, iter_backup_sections(decompressed(file.file)))
+        valuation_cache.clear()
+        balance_series_cache.clear()
+    except BACKUP_READ_ERRORS as exc:
+        raise HTTPException(status_code=400, detail=f"invalid JSON: {exc}") from exc
+    return BackupImportResponse(replaced=True, **result)
 
 
 @app.get("/api/v1/admin/backup/download")
 async def download_backup(
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
-) -> Response:
-    user_id = _require_user(authorization, session_token)
-    file_path, ts = _create_backup_file(user_id)
-    persistence.mark_auto_backup_run(user_id, ts)
-    backup = json.loads(file_path.read_text(encoding="utf-8"))
-    content = json.dumps(jsonable_encoder(backup), ensure_ascii=False, indent=2).encode("utf-8")
-    return Response(
-        content=content,
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=my-finance-backup.json"},
-    )
-
+    user_id: UUID = Depends(current_user),
+) -> FileResponse:
+    job, future = _start_backup(user_id, "download", incremental=False)
+    await asyncio.wrap_future(future)
+    file_path = ROOT_DIR / job.file
+    filename = "my-finance-backup" + "".join(file_path.suffixes)
+    return FileResponse(file_path, media_type=BACKUP_MEDIA_TYPES[file_path.suffix], filename=filename)
+
+
+def _start_backup(
+    user_id: UUID,
+    trigger: str,
+    incremental: bool = True,
+    retention_days: int | None = None,
+) -> tuple[BackupJob, Future]:
+    # Export, compression and retention run on the backup worker thread.
+    # Scheduled and run-now backups extend the current chain; downloads are always full snapshots.
+    try:
+        compression_suffix(app_config.backup_compression)
+    except ValueError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    backend = persistence.backend
+    loop = asyncio.get_running_loop()
+    in_memory = not isinstance(backend, PostgresPersistence)
+    if not in_memory:
+        sections_for = partial(backend.export_backup_sections, user_id)
+        present_for = partial(backend.export_backup_row_ids, user_id)
+    else:
+        # The event loop owns the in-memory store, so rows are copied here and only encoded off-loop;
+        # the worker never sees a dict that a request may be mutating.
+        snapshot = copy.deepcopy(
+            [(name, content if isinstance(content, (dict, list)) else list(content)) for name, content in backend.export_backup_sections(user_id)]
+        )
+        row_ids = copy.deepcopy(list(backend.export_backup_row_ids(user_id)))
 
-def _backup_file_path(ts: datetime | None = None) -> Path:
-    current = ts or datetime.now(timezone.utc)
-    stamp = current.strftime("%Y%m%d_%H%M%S")
-    return BACKUP_DIR / f"my-finance-backup-{stamp}.json"
+        def sections_for(changed_since: datetime | None) -> list[tuple[str, Any]]:
+            return snapshot
 
+        def present_for() -> list[tuple[str, Any]]:
+            return row_ids
 
-def _create_backup_file(user_id: UUID) -> tuple[Path, datetime]:
-    ts = datetime.now(timezone.utc)
-    file_path = _backup_file_path(ts)
-    payload = persistence.export_backup(user_id)
-    file_path.write_text(json.dumps(jsonable_encoder(payload), ensure_ascii=False, indent=2), encoding="utf-8")
-    return file_path, ts
+    full_every = app_config.backup_full_every if incremental else 1
 
+    def work(job: BackupJob) -> None:
+        plan = plan_backup(BACKUP_DIR, user_id, job.started_at, app_config.backup_compression, full_every)
+        job.kind = plan.meta["kind"]
+        job.file = str(plan.path.relative_to(ROOT_DIR))
+        meta = {**backend.backup_meta(), **plan.meta}
+        present = present_for() if plan.changed_since is not None else None
+        write_backup_file(plan.path, meta, job.track(sections_for(plan.changed_since)), present)
+        if not in_memory:
+            backend.mark_auto_backup_run(user_id, job.started_at)
+        if retention_days is not None:
+            cleanup_backups(BACKUP_DIR, retention_days)
 
-def _cleanup_old_backups(retention_days: int) -> None:
-    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
-    for file_path in BACKUP_DIR.glob("my-finance-backup-*.json"):
-        mtime = datetime.fromtimestamp(file_path.stat().st_mtime, tz=timezone.utc)
-        if mtime < cutoff:
-            file_path.unlink(missing_ok=True)
+    try:
+        job, future = backup_jobs.submit(user_id, trigger, work)
+    except BackupBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if in_memory:
+        # store.settings belongs to the event loop, so the auto-backup mark is applied there. The
+        # callback is registered before any caller wraps the future, so the mark lands before it resumes.
+        def mark_run(done: Future) -> None:
+            if not done.cancelled() and done.exception() is None:
+                loop.call_soon_threadsafe(backend.mark_auto_backup_run, user_id, job.started_at)
+
+        future.add_done_callback(mark_run)
+    return job, future
+
+
+def _backup_job_response(job: BackupJob) -> BackupJobResponse:
+    return BackupJobResponse(
+        id=job.id,
+        status=job.status,
+        trigger=job.trigger,
+        kind=job.kind,
+        file=job.file,
+        section=job.section,
+        rowsWritten=job.rows_written,
+        createdAt=job.created_at,
+        startedAt=job.started_at,
+        finishedAt=job.finished_at,
+        error=job.error,
+    )
 
 
 @app.post("/api/v1/admin/backup/run-now", response_model=BackupRunResponse)
 async def run_backup_now(
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> BackupRunResponse:
-    user_id = _require_user(authorization, session_token)
-    settings = persistence.get_app_settings(user_id)
-    file_path, ts = _create_backup_file(user_id)
-    persistence.mark_auto_backup_run(user_id, ts)
-    _cleanup_old_backups(settings.autoBackupRetentionDays)
-    return BackupRunResponse(created=True, file=str(file_path.relative_to(ROOT_DIR)), timestamp=ts)
+    settings = await persistence.get_app_settings(user_id)
+    job, future = _start_backup(user_id, "manual", retention_days=settings.autoBackupRetentionDays)
+    await asyncio.wrap_future(future)
+    return BackupRunResponse(created=True, file=job.file, timestamp=job.started_at, kind=job.kind)
+
+
+@app.post("/api/v1/admin/backup/jobs", response_model=BackupJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_backup_job(
+    user_id: UUID = Depends(current_user),
+) -> BackupJobResponse:
+    settings = await persistence.get_app_settings(user_id)
+    job, _ = _start_backup(user_id, "manual", retention_days=settings.autoBackupRetentionDays)
+    return _backup_job_response(job)
+
+
+@app.get("/api/v1/admin/backup/jobs", response_model=list[BackupJobResponse])
+async def list_backup_jobs(
+    user_id: UUID = Depends(current_user),
+) -> list[BackupJobResponse]:
+    return [_backup_job_response(job) for job in backup_jobs.list(user_id)]
+
+
+@app.get("/api/v1/admin/backup/jobs/{job_id}", response_model=BackupJobResponse)
+async def get_backup_job(
+    job_id: str,
+    user_id: UUID = Depends(current_user),
+) -> BackupJobResponse:
+    job = backup_jobs.get(job_id)
+    if job is None or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail=f"backup job not found: {job_id}")
+    return _backup_job_response(job)
+
+
+@app.get("/api/v1/admin/backup/files", response_model=list[BackupFileInfo])
+async def list_backup_files(
+    user_id: UUID = Depends(current_user),
+) -> list[BackupFileInfo]:
+    stored = await persistence.run(list_stored_backups, BACKUP_DIR, user_id)
+    return [
+        BackupFileInfo(
+            file=item.path.name,
+            kind=item.kind,
+            base=item.base,
+            sequence=item.meta.get("sequence", 0),
+            startedAt=item.started_at,
+            sizeBytes=item.path.stat().st_size,
+        )
+        for item in reversed(stored)
+    ]
+
+
+@app.post("/api/v1/admin/backup/files/{file_name}/restore", response_model=BackupImportResponse)
+async def restore_backup_file(
+    file_name: str,
+    user_id: UUID = Depends(current_user),
+) -> BackupImportResponse:
+    owned = {item.path.name for item in await persistence.run(list_stored_backups, BACKUP_DIR, user_id)}
+    if file_name not in owned:
+        raise HTTPException(status_code=404, detail=f"backup not found: {file_name}")
+    try:
+        chain = await persistence.run(backup_chain, BACKUP_DIR, file_name)
+        result = await persistence.import_backup_sections(user_id, iter_restored_sections(chain))
+        valuation_cache.clear()
+        balance_series_cache.clear()
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=409, detail=f"backup chain is incomplete, missing: {exc}") from exc
+    except BACKUP_READ_ERRORS as exc:
+        raise HTTPException(status_code=400, detail=f"invalid JSON: {exc}") from exc
+    return BackupImportResponse(replaced=True, **result)
 
 
 @app.post("/api/v1/admin/backup/import", response_model=BackupImportResponse)
 async def import_backup(
     payload: dict[str, Any],
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> BackupImportResponse:
-    user_id = _require_user(authorization, session_token)
-    counts = persistence.import_backup(user_id, payload)
-    return BackupImportResponse(replaced=True, counts=counts)
+    result = await persistence.import_backup(user_id, payload)
+    valuation_cache.clear()
+    balance_series_cache.clear()
+    return BackupImportResponse(replaced=True, **result)
 
 
 @app.post("/api/v1/admin/backup/import-file", response_model=BackupImportResponse)
 async def import_backup_file(
     file: UploadFile = File(...),
-    authorization: str | None = Header(default=None),
-    session_token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+    user_id: UUID = Depends(current_user),
 ) -> BackupImportResponse:
-    user_id = _require_user(authorization, session_token)
-    if not file.filename.lower().endswith(".json"):
+    if not file.filename.lower().endswith(BACKUP_UPLOAD_SUFFIXES):
         raise HTTPException(status_code=400, detail="backup file must be JSON")
-    content = await file.read()
-    try:
-        payload = json.loads(content.decode("utf-8"))
-    except json.JSONDecodeError as exc:
-        raise HTTPException(status_code=400, detail=f"invalid JSON: {exc}") from exc
-    counts = persistence.import_backup(user_id, payload)
-    return BackupImportResponse(replaced=True, counts=counts)
+    return await _import_backup_upload(user_id, file)
 
 
 async def _auto_backup_loop() -> None:
@@ -969,38 +1174,100 @@ async def _auto_backup_loop() -> None:
                 scheduler_user_id = next(iter(store.users.keys()))
             else:
                 continue
-            cfg = persistence.get_app_settings(scheduler_user_id)
+            cfg = await persistence.get_app_settings(scheduler_user_id)
             if not cfg.autoBackupEnabled:
                 continue
             now = datetime.now(timezone.utc)
             last = cfg.autoBackupLastRunAt
             if last is None or (now - last).total_seconds() >= cfg.autoBackupIntervalMinutes * 60:
-                _, ts = _create_backup_file(scheduler_user_id)
-                persistence.mark_auto_backup_run(scheduler_user_id, ts)
-                _cleanup_old_backups(cfg.autoBackupRetentionDays)
+                _, future = _start_backup(scheduler_user_id, "scheduled", retention_days=cfg.autoBackupRetentionDays)
+                await asyncio.wrap_future(future)
         except Exception:
             # Keep scheduler alive even if one run fails.
             continue
 
 
+async def _rate_refresh_loop() -> None:
+    while True:
+        try:
+            symbols = await persistence.list_rate_symbols()
+            if symbols:
+                updated, _ = await rate_refresher.refresh(symbols)
+                if updated:
+                    await persistence.apply_rate_quotes(list(updated.values()))
+                    await persistence.append_rate_history(list(updated.values()))
+                    valuation_cache.clear()
+            now = datetime.now(timezone.utc)
+            await persistence.downsample_rate_history(
+                now - timedelta(days=app_config.rate_history_raw_days),
+                now - timedelta(days=app_config.rate_history_daily_days),
+            )
+        except Exception:
+            # Provider errors are handled by the per-provider backoff; keep the loop alive on anything else.
+            pass
+        await asyncio.sleep(app_config.rates_refresh_seconds)
+
+
+async def _balance_reconcile_loop() -> None:
+    while True:
+        await asyncio.sleep(app_config.balance_reconcile_seconds)
+        try:
+            result = await persistence.reconcile_account_balances()
+            if result["accounts"] or result["ledgers"]:
+                valuation_cache.clear()
+                balance_series_cache.clear()
+        except Exception:
+            # Incremental updates keep balances current between passes; retry on the next one.
+            pass
+
+
+async def _session_sweep_loop() -> None:
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_SECONDS)
+        try:
+            await session_store.sweep()
+        except Exception:
+            continue
+
+
 @app.on_event("startup")
 async def on_startup() -> None:
-    global backup_scheduler_task
+    global backup_scheduler_task, session_sweep_task, rate_refresh_task, balance_reconcile_task
+    await persistence.ensure_schema()
     if backup_scheduler_task is None:
         backup_scheduler_task = asyncio.create_task(_auto_backup_loop())
+    if rate_refresh_task is None and app_config.rates_refresh_seconds > 0:
+        rate_refresh_task = asyncio.create_task(_rate_refresh_loop())
+    if balance_reconcile_task is None and app_config.balance_reconcile_seconds > 0:
+        balance_reconcile_task = asyncio.create_task(_balance_reconcile_loop())
+    if session_sweep_task is None:
+        session_sweep_task = asyncio.create_task(_session_sweep_loop())
 
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
-    global backup_scheduler_task
+    global backup_scheduler_task, session_sweep_task, rate_refresh_task, balance_reconcile_task
     if backup_scheduler_task is not None:
         backup_scheduler_task.cancel()
         backup_scheduler_task = None
+    if rate_refresh_task is not None:
+        rate_refresh_task.cancel()
+        rate_refresh_task = None
+    if balance_reconcile_task is not None:
+        balance_reconcile_task.cancel()
+        balance_reconcile_task = None
+    if session_sweep_task is not None:
+        session_sweep_task.cancel()
+        session_sweep_task = None
+    persistence.shutdown()
+    backup_jobs.shutdown()
+    password_hashing.shutdown()
+    await rate_cache.aclose()
 
 
 @app.post("/api/v1/vehicles", response_model=VehicleResponse, status_code=201)
 async def create_vehicle(payload: VehicleCreate) -> VehicleResponse:
-    row = persistence.create_vehicle(payload)
+    row = await persistence.create_vehicle(payload)
     return VehicleResponse(
         id=row["id"],
         type=row["type"],
@@ -1012,7 +1279,7 @@ async def create_vehicle(payload: VehicleCreate) -> VehicleResponse:
 
 @app.post("/api/v1/vehicles/{vehicle_id}/services", response_model=VehicleServiceResponse, status_code=201)
 async def create_vehicle_service(vehicle_id: UUID, payload: VehicleServiceCreate) -> VehicleServiceResponse:
-    row = persistence.create_vehicle_service(vehicle_id, payload)
+    row = await persistence.create_vehicle_service(vehicle_id, payload)
     return VehicleServiceResponse(
         id=row["id"],
         vehicleId=row["vehicle_id"],
@@ -1029,7 +1296,7 @@ async def create_vehicle_service_rule(vehicle_id: UUID, payload: VehicleServiceR
         next_due_date = date.fromordinal(date.today().toordinal() + payload.intervalValue)
     elif payload.intervalUnit == "months":
         next_due_date = date.fromordinal(date.today().toordinal() + payload.intervalValue * 30)
-    row = persistence.create_vehicle_service_rule(vehicle_id, payload, next_due_date)
+    row = await persistence.create_vehicle_service_rule(vehicle_id, payload, next_due_date)
     return VehicleServiceRuleResponse(
         id=row["id"],
         vehicleId=row["vehicle_id"],
@@ -1041,31 +1308,31 @@ async def create_vehicle_service_rule(vehicle_id: UUID, payload: VehicleServiceR
 
 @app.post("/api/v1/properties", response_model=PropertyResponse, status_code=201)
 async def create_property(payload: PropertyCreate) -> PropertyResponse:
-    row = persistence.create_property(payload)
+    row = await persistence.create_property(payload)
     return PropertyResponse(id=row["id"], type=row["type"], name=row["name"], estimatedValue=row["estimated_value"])
 
 
 @app.post("/api/v1/properties/{property_id}/costs", response_model=PropertyCostResponse, status_code=201)
 async def create_property_cost(property_id: UUID, payload: PropertyCostCreate) -> PropertyCostResponse:
-    row = persistence.create_property_cost(property_id, payload)
+    row = await persistence.create_property_cost(property_id, payload)
     return PropertyCostResponse(id=row["id"], propertyId=row["property_id"], costType=row["cost_type"], amount=row["amount"], currency=row["currency"])
 
 
 @app.post("/api/v1/insurances", response_model=InsuranceResponse, status_code=201)
 async def create_insurance(payload: InsuranceCreate) -> InsuranceResponse:
-    row = persistence.create_insurance(payload)
+    row = await persistence.create_insurance(payload)
     return InsuranceResponse(id=row["id"], insuranceType=row["insurance_type"], provider=row["provider"], validTo=row["valid_to"], isActive=row["is_active"])
 
 
 @app.post("/api/v1/insurances/{insurance_id}/premiums", response_model=InsurancePremiumResponse, status_code=201)
 async def create_insurance_premium(insurance_id: UUID, payload: InsurancePremiumCreate) -> InsurancePremiumResponse:
-    row = persistence.create_insurance_premium(insurance_id, payload)
+    row = await persistence.create_insurance_premium(insurance_id, payload)
     return InsurancePremiumResponse(id=row["id"], insuranceId=row["insurance_id"], amount=row["amount"], currency=row["currency"])
 
 
 @app.post("/api/v1/integrations/google-calendar/connect", response_model=GoogleCalendarConnectResponse)
 async def connect_google_calendar(payload: GoogleCalendarConnectRequest) -> GoogleCalendarConnectResponse:
-    row = persistence.create_calendar_integration(payload)
+    row = await persistence.create_calendar_integration(payload)
     return GoogleCalendarConnectResponse(
         integrationId=row["id"],
         provider=row["provider"],
@@ -1076,15 +1343,15 @@ async def connect_google_calendar(payload: GoogleCalendarConnectRequest) -> Goog
 
 @app.post("/api/v1/notification-rules", response_model=NotificationRuleResponse, status_code=201)
 async def create_notification_rule(payload: NotificationRuleCreate) -> NotificationRuleResponse:
-    row = persistence.create_notification_rule(payload)
+    row = await persistence.create_notification_rule(payload)
     return NotificationRuleResponse(id=row["id"], channel=row["channel"], dueAt=row["due_at"], isActive=row["is_active"])
 
 
 @app.post("/api/v1/sync/google-calendar/run", response_model=GoogleCalendarSyncRunResponse)
 async def run_google_calendar_sync(payload: GoogleCalendarSyncRunRequest) -> GoogleCalendarSyncRunResponse:
     stats = SyncStats()
-    active_rules = persistence.list_google_notification_rules()
-    any_integration = persistence.any_calendar_integration_id()
+    active_rules = await persistence.list_google_notification_rules()
+    any_integration = await persistence.any_calendar_integration_id()
 
     if not any_integration:
         return GoogleCalendarSyncRunResponse(created=0, updated=0, unchanged=0, canceled=0, failed=0)
@@ -1101,17 +1368,17 @@ async def run_google_calendar_sync(payload: GoogleCalendarSyncRunRequest) -> Goo
             due_at_iso=rule["due_at"].isoformat(),
             timezone=rule["timezone"],
         )
-        existing = persistence.get_calendar_event(any_integration, event_uid)
+        existing = await persistence.get_calendar_event(any_integration, event_uid)
         if existing is None:
             if not payload.dryRun:
-                persistence.create_calendar_event(any_integration, rule["id"], event_uid, event_hash, make_provider_event_id())
+                await persistence.create_calendar_event(any_integration, rule["id"], event_uid, event_hash, make_provider_event_id())
             stats.created += 1
             continue
         if existing["event_hash"] == event_hash:
             stats.unchanged += 1
             continue
         if not payload.dryRun:
-            persistence.update_calendar_event_hash(existing["id"], event_hash)
+            await persistence.update_calendar_event_hash(existing["id"], event_hash)
         stats.updated += 1
 
     return GoogleCalendarSyncRunResponse(
@@ -1125,4 +1392,4 @@ async def run_google_calendar_sync(payload: GoogleCalendarSyncRunRequest) -> Goo
 
 @app.get("/api/v1/debug/state")
 async def debug_state() -> dict[str, Any]:
-    return persistence.debug_counts()
+    return await persistence.debug_counts()
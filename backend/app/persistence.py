@@ -1,35 +1,50 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
 from calendar import monthrange
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any
+from functools import cache, partial, wraps
+from itertools import islice
+from typing import Any, TypeVar
 from uuid import UUID, uuid4
 
+import psycopg
 from fastapi import HTTPException
 from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.exc import SQLAlchemyError
 
 from .config import settings
-from .auth_utils import hash_password, verify_password
+from .auth_utils import hash_password
 from .schemas import (
     AccountDeleteAction,
     AccountCreate,
     AccountUpdate,
     AppSettings,
     AppSettingsUpdate,
+    BalanceSeriesBucket,
+    DashboardPeriod,
     GoogleCalendarConnectRequest,
     InsuranceCreate,
     InsurancePremiumCreate,
     NotificationRuleCreate,
     PropertyCostCreate,
     PropertyCreate,
+    RateHistoryBucket,
     RateSnapshotUpsert,
     RatesWatchlistUpdate,
     TransactionCategoryStatsResponse,
     TransactionCategoryRename,
     TransactionCreate,
+    TransactionListQuery,
     TransactionTransferCreate,
     TransactionUpdate,
     VehicleCreate,
@@ -38,6 +53,27 @@ from .schemas import (
 )
 from .store import store
 
+logger = logging.getLogger(__name__)
+
+
+_pg_connection: ContextVar[Connection | None] = ContextVar("pg_connection", default=None)
+_Method = TypeVar("_Method", bound=Callable[..., Any])
+
+
+def _unit_of_work(method: _Method) -> _Method:
+    # One connection and one commit per persistence call; nested calls join the open transaction.
+    @wraps(method)
+    def wrapper(self: "PostgresPersistence", *args: Any, **kwargs: Any) -> Any:
+        with self._connection():
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _normalize_email(email: str) -> str:
+    # Must match the uq_users_email_lower expression so lookups hit the index.
+    return email.strip().lower()
+
 
 def _to_float(value: Decimal | None) -> float | None:
     return float(value) if value is not None else None
@@ -47,6 +83,374 @@ def _tx_sign(direction: str) -> Decimal:
     return Decimal("1") if direction == "income" else Decimal("-1")
 
 
+def _tx_timestamp(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return 0.0
+
+
+def _encode_tx_cursor(row: dict[str, Any]) -> str:
+    raw = f"{row['transaction_at'].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_tx_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        moment, entity_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(moment), UUID(entity_id)
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("invalid transactions cursor") from exc
+
+
+def _tx_page(rows: list[dict[str, Any]], limit: int) -> dict[str, Any]:
+    items = rows[:limit]
+    next_cursor = _encode_tx_cursor(items[-1]) if len(rows) > limit and items else None
+    return {"items": items, "nextCursor": next_cursor}
+
+
+BACKUP_STREAM_BATCH = 500
+# Backup section -> (query, column prefix). Sections with a prefix are tracked by id and updated_at,
+# so incremental backups fill "{changed}" with an updated_at filter and list their ids separately.
+PG_BACKUP_QUERIES: tuple[tuple[str, str, str | None], ...] = (
+    ("customLocales", "select locale, message_key, message_value from locale_custom_messages where user_id = :user_id order by locale, message_key", None),
+    ("users", "select id, email, full_name, created_at, updated_at from users where id = :user_id", None),
+    ("userCredentials", "select user_id, password_hash, created_at, updated_at from user_credentials where user_id = :user_id", None),
+    ("accounts", "select * from accounts where user_id = :user_id{changed} order by created_at", ""),
+    ("transactions", "select * from transactions where user_id = :user_id{changed} order by created_at", ""),
+    ("rateWatchlist", "select symbol from rate_assets where user_id = :user_id order by symbol", None),
+    (
+        "rateSnapshots",
+        "select symbol, price, currency, source, last_updated_at as updated_at from rate_snapshots where user_id = :user_id order by symbol",
+        None,
+    ),
+    ("vehicles", "select * from vehicles where user_id = :user_id{changed} order by created_at", ""),
+    (
+        "vehicleServices",
+        """
+        select vs.* from vehicle_services vs
+        join vehicles v on v.id = vs.vehicle_id
+        where v.user_id = :user_id{changed}
+        order by vs.created_at
+        """,
+        "vs.",
+    ),
+    (
+        "vehicleServiceRules",
+        """
+        select vr.* from vehicle_service_rules vr
+        join vehicles v on v.id = vr.vehicle_id
+        where v.user_id = :user_id{changed}
+        order by vr.created_at
+        """,
+        "vr.",
+    ),
+    ("properties", "select * from properties where user_id = :user_id{changed} order by created_at", ""),
+    (
+        "propertyCosts",
+        """
+        select pc.* from property_costs pc
+        join properties p on p.id = pc.property_id
+        where p.user_id = :user_id{changed}
+        order by pc.created_at
+        """,
+        "pc.",
+    ),
+    ("insurances", "select * from insurances where user_id = :user_id{changed} order by created_at", ""),
+    (
+        "insurancePremiums",
+        """
+        select ip.* from insurance_premiums ip
+        join insurances i on i.id = ip.insurance_id
+        where i.user_id = :user_id{changed}
+        order by ip.created_at
+        """,
+        "ip.",
+    ),
+    ("calendarIntegrations", "select * from calendar_integrations where user_id = :user_id{changed} order by created_at", ""),
+    ("notificationRules", "select * from notification_rules where user_id = :user_id{changed} order by created_at", ""),
+    (
+        "notificationDeliveries",
+        """
+        select nd.* from notification_deliveries nd
+        join notification_rules nr on nr.id = nd.notification_rule_id
+        where nr.user_id = :user_id{changed}
+        order by nd.created_at
+        """,
+        "nd.",
+    ),
+    (
+        "calendarEvents",
+        """
+        select ce.* from calendar_events ce
+        join calendar_integrations ci on ci.id = ce.calendar_integration_id
+        where ci.user_id = :user_id{changed}
+        order by ce.created_at
+        """,
+        "ce.",
+    ),
+)
+BACKUP_TRACKED_SECTIONS = frozenset(name for name, _, prefix in PG_BACKUP_QUERIES if prefix is not None)
+
+
+BACKUP_IMPORT_CHUNK = 5000
+# Export order, parents before children; imports load sections in this order whatever the payload's key order.
+BACKUP_SECTION_ORDER = ("appSettings", *(name for name, _, _ in PG_BACKUP_QUERIES))
+# Backup section -> (table, columns, owned by the importing user) for sections loaded with COPY as-is.
+PG_IMPORT_TABLES: dict[str, tuple[str, list[str], bool]] = {
+    "accounts": ("accounts", ["id", "user_id", "name", "account_type", "currency", "initial_balance", "initial_balance_at", "current_balance"], True),
+    "transactions": (
+        "transactions",
+        [
+            "id",
+            "user_id",
+            "account_id",
+            "amount",
+            "currency",
+            "transaction_at",
+            "direction",
+            "category",
+            "note",
+            "transfer_group_id",
+            "recurring_group_id",
+            "recurring_frequency",
+            "recurring_index",
+            "recurring_day_of_month",
+            "recurring_weekend_policy",
+        ],
+        True,
+    ),
+    "vehicles": ("vehicles", ["id", "user_id", "type", "label", "vin", "plate_number", "make", "model", "production_year", "purchased_at", "current_odometer_km", "notes"], True),
+    "vehicleServices": ("vehicle_services", ["id", "vehicle_id", "service_type", "service_at", "odometer_km", "total_cost", "currency", "vendor", "description", "receipt_url"], False),
+    "vehicleServiceRules": ("vehicle_service_rules", ["id", "vehicle_id", "service_type", "interval_value", "interval_unit", "lead_days", "last_service_id", "next_due_date", "next_due_odometer_km", "is_active"], False),
+    "properties": ("properties", ["id", "user_id", "type", "name", "address_line1", "city", "postal_code", "country_code", "acquired_at", "purchase_price", "purchase_currency", "estimated_value", "estimated_value_currency", "estimated_value_updated_at", "floor_area_m2", "land_area_m2", "notes"], True),
+    "propertyCosts": ("property_costs", ["id", "property_id", "cost_type", "period_start", "period_end", "amount", "currency", "provider", "meter_value", "meter_unit", "is_recurring", "recurring_template_id"], False),
+    "insurances": ("insurances", ["id", "user_id", "insurance_type", "provider", "policy_number", "subject_vehicle_id", "subject_property_id", "coverage_amount", "coverage_currency", "deductible_amount", "deductible_currency", "valid_from", "valid_to", "payment_frequency", "is_active"], True),
+    "insurancePremiums": ("insurance_premiums", ["id", "insurance_id", "period_start", "period_end", "amount", "currency", "paid_at", "payment_transaction_id"], False),
+    "calendarIntegrations": ("calendar_integrations", ["id", "user_id", "provider", "external_calendar_id", "access_token_encrypted", "refresh_token_encrypted", "token_expires_at", "sync_enabled"], True),
+    "notificationRules": ("notification_rules", ["id", "user_id", "source", "source_entity_id", "title_template", "message_template", "due_at", "lead_days", "channel", "timezone", "is_active"], True),
+    "notificationDeliveries": ("notification_deliveries", ["id", "notification_rule_id", "scheduled_for", "delivered_at", "status", "attempts", "error_message", "provider_message_id"], False),
+    "calendarEvents": ("calendar_events", ["id", "notification_rule_id", "calendar_integration_id", "provider_event_id", "event_uid", "event_hash", "last_synced_at"], False),
+}
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _in_import_order(sections: Iterable[tuple[str, Any]]) -> Iterator[tuple[str, Any]]:
+    # Exports arrive in BACKUP_SECTION_ORDER and stream straight through. A section that arrives
+    # ahead of an earlier one (or after a gap) is read into memory and held until its turn, so a
+    # child table is never loaded before its parent; unknown sections pass through untouched.
+    rank = {name: pos for pos, name in enumerate(BACKUP_SECTION_ORDER)}
+    held: dict[int, tuple[str, Any]] = {}
+    expected = 0
+    for name, content in sections:
+        pos = rank.get(name)
+        if pos is None:
+            yield name, content
+        elif pos != expected:
+            held[pos] = (name, content if isinstance(content, dict) else list(content))
+        else:
+            yield name, content
+            expected += 1
+            while expected in held:
+                yield held.pop(expected)
+                expected += 1
+    for pos in sorted(held):
+        yield held[pos]
+
+
+def _calendar_integration_import_row(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": row.get("id", str(uuid4())),
+        "provider": row.get("provider", "google"),
+        "external_calendar_id": row.get("external_calendar_id", row.get("externalCalendarId", "primary")),
+        "access_token_encrypted": row.get("access_token_encrypted", "imported-token"),
+        "refresh_token_encrypted": row.get("refresh_token_encrypted", "imported-token"),
+        "token_expires_at": row.get("token_expires_at"),
+        "sync_enabled": row.get("sync_enabled", row.get("syncEnabled", True)),
+    }
+
+
+DASHBOARD_PERIOD_DAYS = {
+    DashboardPeriod.week: 7,
+    DashboardPeriod.month: 30,
+    DashboardPeriod.quarter: 90,
+    DashboardPeriod.year: 365,
+}
+DASHBOARD_WEEKLY_BUCKET_AFTER_DAYS = 366
+DASHBOARD_TOP_CATEGORIES = 10
+# Stored resolutions that feed each requested history bucket; raw points are folded up on read.
+RATE_HISTORY_SOURCES = {
+    RateHistoryBucket.raw: ["raw"],
+    RateHistoryBucket.day: ["raw", "day"],
+    RateHistoryBucket.week: ["raw", "day", "week"],
+}
+
+
+def _utc_day(value: Any) -> date:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+    return value
+
+
+def _utc_midnight(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+def _month_bounds(today: date) -> tuple[date, date]:
+    start = today.replace(day=1)
+    end = date(start.year + 1, 1, 1) if start.month == 12 else date(start.year, start.month + 1, 1)
+    return start, end
+
+
+def _dashboard_range_start(period: DashboardPeriod, today: date) -> date | None:
+    days = DASHBOARD_PERIOD_DAYS.get(period)
+    return today - timedelta(days=days - 1) if days else None
+
+
+def _rate_bucket_start(moment: datetime, bucket: RateHistoryBucket) -> datetime:
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    if bucket == RateHistoryBucket.raw:
+        return moment
+    day = moment.date()
+    if bucket == RateHistoryBucket.week:
+        day -= timedelta(days=day.weekday())
+    return _utc_midnight(day)
+
+
+def _series_bucket_start(day: date, bucket: BalanceSeriesBucket) -> date:
+    # Same boundaries as Postgres date_trunc: ISO weeks start on Monday.
+    if bucket == BalanceSeriesBucket.week:
+        return day - timedelta(days=day.weekday())
+    if bucket == BalanceSeriesBucket.month:
+        return day.replace(day=1)
+    return day
+
+
+def _series_bucket_starts(start: date, end: date, bucket: BalanceSeriesBucket) -> list[date]:
+    starts = []
+    current = _series_bucket_start(start, bucket)
+    while current <= end:
+        starts.append(current)
+        if bucket == BalanceSeriesBucket.month:
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            current += timedelta(days=7 if bucket == BalanceSeriesBucket.week else 1)
+    return starts
+
+
+def _balance_series(opening: Decimal, closings: dict[date, Decimal], starts: list[date]) -> list[dict[str, Any]]:
+    # closings holds the balance at the end of buckets that had transactions; quiet buckets carry it forward.
+    points = []
+    previous = opening
+    for bucket_start in starts:
+        balance = closings.get(bucket_start, previous)
+        points.append({"bucket_start": bucket_start, "balance": balance, "change": balance - previous})
+        previous = balance
+    return points
+
+
+def _fold_rate_history(rows: Iterable[dict[str, Any]], bucket: RateHistoryBucket) -> list[dict[str, Any]]:
+    # rows are stored points of any resolution; they are merged into OHLC buckets in time order.
+    buckets: dict[datetime, dict[str, Any]] = {}
+    for row in sorted(rows, key=lambda item: item["bucket_start"]):
+        key = _rate_bucket_start(row["bucket_start"], bucket)
+        current = buckets.get(key)
+        if current is None:
+            buckets[key] = {**row, "bucket_start": key}
+            continue
+        current["high"] = max(current["high"], row["high"])
+        current["low"] = min(current["low"], row["low"])
+        current["close"] = row["close"]
+        current["currency"] = row["currency"]
+        current["samples"] += row["samples"]
+    return list(buckets.values())
+
+
+def _dashboard_summary(
+    period: DashboardPeriod,
+    start: date,
+    end: date,
+    accounts: list[dict[str, Any]],
+    account_stats: dict[Any, dict[str, Any]],
+    account_days: dict[Any, list[dict[str, Any]]],
+    month_totals: dict[str, Any],
+    categories: list[dict[str, Any]],
+) -> dict[str, Any]:
+    # account_stats carries lifetime income/expense plus the signed net before and across all
+    # time; account_days carries in-range daily income/expense and the running signed net.
+    zero = Decimal("0")
+    total_balance = zero
+    opening_total = zero
+    daily_totals: dict[date, list[Decimal]] = {}
+    account_items = []
+    for account in accounts:
+        stats = account_stats.get(account["id"], {})
+        current = Decimal(str(account.get("current_balance") or 0))
+        base = current - Decimal(str(stats.get("net") or 0))
+        total_balance += current
+        opening_total += base + Decimal(str(stats.get("net_before") or 0))
+        series = []
+        for item in account_days.get(account["id"], []):
+            income = Decimal(str(item["income"]))
+            expense = Decimal(str(item["expense"]))
+            bucket = daily_totals.setdefault(item["day"], [zero, zero])
+            bucket[0] += income
+            bucket[1] += expense
+            series.append(
+                {"day": item["day"], "balance": base + Decimal(str(item["cumulative"])), "income": income, "expense": expense}
+            )
+        account_items.append(
+            {
+                "accountId": account["id"],
+                "income": stats.get("income") or zero,
+                "expense": stats.get("expense") or zero,
+                "balanceSeries": series,
+            }
+        )
+
+    span = (end - start).days + 1
+    bucket_days = 7 if span > DASHBOARD_WEEKLY_BUCKET_AFTER_DAYS else 1
+    running = opening_total
+    period_income = zero
+    period_expense = zero
+    bucket_income = zero
+    bucket_expense = zero
+    points = []
+    for offset in range(span):
+        day = start + timedelta(days=offset)
+        income, expense = daily_totals.get(day, (zero, zero))
+        running += income - expense
+        bucket_income += income
+        bucket_expense += expense
+        if (offset + 1) % bucket_days == 0 or offset == span - 1:
+            points.append({"day": day, "balance": running, "income": bucket_income, "expense": bucket_expense})
+            period_income += bucket_income
+            period_expense += bucket_expense
+            bucket_income = zero
+            bucket_expense = zero
+
+    return {
+        "period": period,
+        "rangeStart": start,
+        "rangeEnd": end,
+        "bucketDays": bucket_days,
+        "totalBalance": total_balance,
+        "periodIncome": period_income,
+        "periodExpense": period_expense,
+        "balanceSeries": points,
+        "accounts": account_items,
+        "monthTotals": month_totals,
+        "topExpenseCategories": categories,
+    }
+
+
 def _move_from_weekend(moment: datetime, weekend_policy: str | None) -> datetime:
     policy = (weekend_policy or "exact").lower()
     weekday = moment.weekday()
@@ -70,6 +474,15 @@ def _add_months(base: datetime, months: int, day_anchor: int | None = None) -> d
     return base.replace(year=year, month=month, day=target_day)
 
 
+def _transaction_schedule(payload: TransactionCreate, day_anchor: int, weekend_policy: str) -> list[datetime]:
+    if not payload.recurringFrequency:
+        return [_move_from_weekend(payload.occurredAt, weekend_policy)] * payload.recurringCount
+    return [
+        _shift_recurring(payload.occurredAt, payload.recurringFrequency, idx, day_anchor, weekend_policy)
+        for idx in range(payload.recurringCount)
+    ]
+
+
 def _shift_recurring(base: datetime, frequency: str, step: int, day_anchor: int | None = None, weekend_policy: str | None = None) -> datetime:
     if frequency == "daily":
         return _move_from_weekend(base + timedelta(days=step), weekend_policy)
@@ -83,25 +496,50 @@ def _shift_recurring(base: datetime, frequency: str, step: int, day_anchor: int
 
 
 class Persistence:
+    storage_name = ""
+
+    def ensure_schema(self) -> None:
+        raise NotImplementedError
+
     def get_app_settings(self, user_id: UUID) -> AppSettings:
         raise NotImplementedError
 
     def update_app_settings(self, user_id: UUID, payload: AppSettingsUpdate) -> AppSettings:
         raise NotImplementedError
 
-    def export_backup(self, user_id: UUID) -> dict[str, Any]:
+    def backup_meta(self) -> dict[str, Any]:
+        return {
+            "version": 1,
+            "exportedAt": datetime.utcnow().isoformat() + "Z",
+            "storageBackend": self.storage_name,
+        }
+
+    def export_backup_sections(self, user_id: UUID, changed_since: datetime | None = None) -> Iterator[tuple[str, Any]]:
+        raise NotImplementedError
+
+    def export_backup_row_ids(self, user_id: UUID) -> Iterator[tuple[str, Any]]:
         raise NotImplementedError
 
-    def import_backup(self, user_id: UUID, payload: dict[str, Any]) -> dict[str, int]:
+    def export_backup(self, user_id: UUID) -> dict[str, Any]:
+        data = {
+            name: content if isinstance(content, (dict, list)) else list(content)
+            for name, content in self.export_backup_sections(user_id)
+        }
+        return {"meta": self.backup_meta(), "data": data}
+
+    def import_backup_sections(self, user_id: UUID, sections: Iterable[tuple[str, Any]]) -> dict[str, Any]:
         raise NotImplementedError
 
+    def import_backup(self, user_id: UUID, payload: dict[str, Any]) -> dict[str, Any]:
+        return self.import_backup_sections(user_id, payload.get("data", {}).items())
+
     def mark_auto_backup_run(self, user_id: UUID, when: datetime) -> None:
         raise NotImplementedError
 
-    def register_user(self, email: str, password: str, full_name: str | None) -> dict[str, Any]:
+    def register_user(self, email: str, password_hash: str, full_name: str | None) -> dict[str, Any]:
         raise NotImplementedError
 
-    def authenticate_user(self, email: str, password: str) -> dict[str, Any] | None:
+    def get_login_credentials(self, email: str) -> dict[str, Any] | None:
         raise NotImplementedError
 
     def get_user_by_id(self, user_id: UUID) -> dict[str, Any] | None:
@@ -110,7 +548,10 @@ class Persistence:
     def update_user_profile(self, user_id: UUID, email: str | None, full_name: str | None) -> dict[str, Any]:
         raise NotImplementedError
 
-    def change_user_password(self, user_id: UUID, current_password: str, new_password: str) -> None:
+    def get_password_hash(self, user_id: UUID) -> str | None:
+        raise NotImplementedError
+
+    def set_password_hash(self, user_id: UUID, password_hash: str) -> None:
         raise NotImplementedError
 
     def list_locales(self, user_id: UUID) -> list[str]:
@@ -132,11 +573,29 @@ class Persistence:
         raise NotImplementedError
 
     def upsert_rate_snapshot(self, user_id: UUID, payload: RateSnapshotUpsert) -> dict[str, Any]:
+        return self.upsert_rate_snapshots(user_id, [payload])
+
+    def upsert_rate_snapshots(self, user_id: UUID, payloads: list[RateSnapshotUpsert]) -> dict[str, Any]:
         raise NotImplementedError
 
     def delete_rate_symbol(self, user_id: UUID, symbol: str) -> dict[str, Any]:
         raise NotImplementedError
 
+    def list_rate_symbols(self) -> list[str]:
+        raise NotImplementedError
+
+    def apply_rate_quotes(self, quotes: list[dict[str, Any]]) -> int:
+        raise NotImplementedError
+
+    def append_rate_history(self, quotes: list[dict[str, Any]]) -> int:
+        raise NotImplementedError
+
+    def downsample_rate_history(self, raw_before: datetime, daily_before: datetime) -> int:
+        raise NotImplementedError
+
+    def get_rate_history(self, symbol: str, start: datetime, end: datetime, bucket: RateHistoryBucket) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
     def create_account(self, user_id: UUID, payload: AccountCreate) -> dict[str, Any]:
         raise NotImplementedError
 
@@ -146,7 +605,10 @@ class Persistence:
     def create_transaction(self, user_id: UUID, payload: TransactionCreate) -> dict[str, Any]:
         raise NotImplementedError
 
-    def list_transactions(self, user_id: UUID) -> list[dict[str, Any]]:
+    def list_transactions(self, user_id: UUID, query: TransactionListQuery | None = None) -> dict[str, Any]:
+        raise NotImplementedError
+
+    def get_dashboard_summary(self, user_id: UUID, period: DashboardPeriod) -> dict[str, Any]:
         raise NotImplementedError
 
     def update_account(self, user_id: UUID, account_id: UUID, payload: AccountUpdate) -> dict[str, Any]:
@@ -155,6 +617,15 @@ class Persistence:
     def delete_account(self, user_id: UUID, account_id: UUID, action: AccountDeleteAction, target_account_id: UUID | None = None) -> None:
         raise NotImplementedError
 
+    def get_account_balance_at(self, user_id: UUID, account_id: UUID, day: date) -> dict[str, Any]:
+        raise NotImplementedError
+
+    def get_account_balance_series(self, user_id: UUID, account_id: UUID, start: date, end: date, bucket: BalanceSeriesBucket) -> dict[str, Any]:
+        raise NotImplementedError
+
+    def reconcile_account_balances(self) -> dict[str, int]:
+        raise NotImplementedError
+
     def update_transaction(self, user_id: UUID, transaction_id: UUID, payload: TransactionUpdate) -> dict[str, Any]:
         raise NotImplementedError
 
@@ -178,6 +649,11 @@ class Persistence:
 
 
 class InMemoryPersistence(Persistence):
+    storage_name = "memory"
+
+    def ensure_schema(self) -> None:
+        return None
+
     def get_app_settings(self, user_id: UUID) -> AppSettings:
         return AppSettings(**store.settings)
 
@@ -212,21 +688,20 @@ class InMemoryPersistence(Persistence):
         store.rate_snapshots[user_id] = {sym: existing[sym] for sym in watch if sym in existing}
         return self.get_rates_state(user_id)
 
-    def upsert_rate_snapshot(self, user_id: UUID, payload: RateSnapshotUpsert) -> dict[str, Any]:
-        sym = payload.symbol
-        if user_id not in store.rate_watchlists:
-            store.rate_watchlists[user_id] = []
-        if sym not in store.rate_watchlists[user_id]:
-            store.rate_watchlists[user_id].append(sym)
-        if user_id not in store.rate_snapshots:
-            store.rate_snapshots[user_id] = {}
-        store.rate_snapshots[user_id][sym] = {
-            "symbol": sym,
-            "price": payload.price,
-            "currency": payload.currency,
-            "source": payload.source,
-            "updatedAt": payload.updatedAt or datetime.utcnow(),
-        }
+    def upsert_rate_snapshots(self, user_id: UUID, payloads: list[RateSnapshotUpsert]) -> dict[str, Any]:
+        watch = store.rate_watchlists.setdefault(user_id, [])
+        snaps = store.rate_snapshots.setdefault(user_id, {})
+        for payload in payloads:
+            sym = payload.symbol
+            if sym not in watch:
+                watch.append(sym)
+            snaps[sym] = {
+                "symbol": sym,
+                "price": payload.price,
+                "currency": payload.currency,
+                "source": payload.source,
+                "updatedAt": payload.updatedAt or datetime.utcnow(),
+            }
         return self.get_rates_state(user_id)
 
     def delete_rate_symbol(self, user_id: UUID, symbol: str) -> dict[str, Any]:
@@ -237,6 +712,77 @@ class InMemoryPersistence(Persistence):
             del store.rate_snapshots[user_id][sym]
         return self.get_rates_state(user_id)
 
+    def list_rate_symbols(self) -> list[str]:
+        return sorted({sym for watch in store.rate_watchlists.values() for sym in watch})
+
+    def apply_rate_quotes(self, quotes: list[dict[str, Any]]) -> int:
+        by_symbol = {quote["symbol"]: quote for quote in quotes}
+        written = 0
+        for user_id, watch in store.rate_watchlists.items():
+            snaps = store.rate_snapshots.setdefault(user_id, {})
+            for sym in watch:
+                quote = by_symbol.get(sym)
+                if quote is None:
+                    continue
+                snaps[sym] = {
+                    "symbol": sym,
+                    "price": Decimal(str(quote["price"])),
+                    "currency": quote["currency"],
+                    "source": quote["source"],
+                    "updatedAt": quote["updatedAt"],
+                }
+                written += 1
+        return written
+
+    def append_rate_history(self, quotes: list[dict[str, Any]]) -> int:
+        written = 0
+        for quote in quotes:
+            points = store.rate_history.setdefault((quote["symbol"], "raw"), {})
+            moment = _rate_bucket_start(quote["updatedAt"], RateHistoryBucket.raw)
+            if moment in points:
+                continue
+            price = Decimal(str(quote["price"]))
+            points[moment] = {
+                "symbol": quote["symbol"],
+                "bucket_start": moment,
+                "open": price,
+                "high": price,
+                "low": price,
+                "close": price,
+                "currency": quote["currency"],
+                "samples": 1,
+            }
+            written += 1
+        return written
+
+    def _downsample_rate_history(self, source: str, target: RateHistoryBucket, before: datetime) -> int:
+        moved = 0
+        for (symbol, resolution), points in list(store.rate_history.items()):
+            if resolution != source:
+                continue
+            old = [points.pop(moment) for moment in sorted(points) if moment < before]
+            if not old:
+                continue
+            targets = store.rate_history.setdefault((symbol, target.value), {})
+            for row in _fold_rate_history(old, target):
+                existing = targets.get(row["bucket_start"])
+                targets[row["bucket_start"]] = _fold_rate_history([existing, row], target)[0] if existing else row
+            moved += len(old)
+        return moved
+
+    def downsample_rate_history(self, raw_before: datetime, daily_before: datetime) -> int:
+        moved = self._downsample_rate_history("raw", RateHistoryBucket.day, raw_before)
+        return moved + self._downsample_rate_history("day", RateHistoryBucket.week, daily_before)
+
+    def get_rate_history(self, symbol: str, start: datetime, end: datetime, bucket: RateHistoryBucket) -> list[dict[str, Any]]:
+        rows = [
+            row
+            for resolution in RATE_HISTORY_SOURCES[bucket]
+            for moment, row in store.rate_history.get((symbol, resolution), {}).items()
+            if start <= moment < end
+        ]
+        return _fold_rate_history(rows, bucket)
+
     def create_vehicle(self, payload: VehicleCreate) -> dict[str, Any]:
         entity_id = uuid4()
         now = datetime.utcnow()
@@ -396,43 +942,44 @@ class InMemoryPersistence(Persistence):
             "rateSnapshotsUsers": len(store.rate_snapshots),
         }
 
-    def export_backup(self, user_id: UUID) -> dict[str, Any]:
+    def export_backup_sections(self, user_id: UUID, changed_since: datetime | None = None) -> Iterator[tuple[str, Any]]:
+        # In-memory rows carry no reliable modification time, so incrementals repeat every row; the
+        # chain stays correct, it just does not get smaller.
+        return self._backup_sections(user_id)
+
+    def export_backup_row_ids(self, user_id: UUID) -> Iterator[tuple[str, Any]]:
+        for name, rows in self._backup_sections(user_id):
+            if name in BACKUP_TRACKED_SECTIONS:
+                yield name, [row["id"] for row in rows if row.get("id") is not None]
+
+    def _backup_sections(self, user_id: UUID) -> Iterator[tuple[str, Any]]:
         vehicle_ids = {k for k, v in store.vehicles.items() if v.get("user_id") == user_id}
         property_ids = {k for k, v in store.properties.items() if v.get("user_id") == user_id}
         insurance_ids = {k for k, v in store.insurances.items() if v.get("user_id") == user_id}
         integration_ids = {k for k, v in store.calendar_integrations.items() if v.get("user_id") == user_id}
         rule_ids = {k for k, v in store.notification_rules.items() if v.get("user_id") == user_id}
-        return {
-            "meta": {
-                "version": 1,
-                "exportedAt": datetime.utcnow().isoformat() + "Z",
-                "storageBackend": "memory",
-            },
-            "data": {
-                "appSettings": store.settings,
-                "customLocales": store.custom_locales,
-                "users": [u for u in store.users.values() if u.get("id") == user_id],
-                "userCredentials": [{"user_id": uid, "password_hash": pwd_hash} for uid, pwd_hash in store.user_credentials.items() if uid == user_id],
-                "accounts": [a for a in store.accounts.values() if a.get("user_id") == user_id],
-                "transactions": [t for t in store.transactions.values() if t.get("user_id") == user_id],
-                "rateWatchlist": store.rate_watchlists.get(user_id, []),
-                "rateSnapshots": list(store.rate_snapshots.get(user_id, {}).values()),
-                "vehicles": [v for v in store.vehicles.values() if v.get("user_id") == user_id],
-                "vehicleServices": [vs for vs in store.vehicle_services.values() if vs.get("vehicle_id") in vehicle_ids],
-                "vehicleServiceRules": [vr for vr in store.vehicle_service_rules.values() if vr.get("vehicle_id") in vehicle_ids],
-                "properties": [p for p in store.properties.values() if p.get("user_id") == user_id],
-                "propertyCosts": [pc for pc in store.property_costs.values() if pc.get("property_id") in property_ids],
-                "insurances": [i for i in store.insurances.values() if i.get("user_id") == user_id],
-                "insurancePremiums": [ip for ip in store.insurance_premiums.values() if ip.get("insurance_id") in insurance_ids],
-                "calendarIntegrations": [ci for ci in store.calendar_integrations.values() if ci.get("user_id") == user_id],
-                "notificationRules": [nr for nr in store.notification_rules.values() if nr.get("user_id") == user_id],
-                "notificationDeliveries": [nd for nd in store.notification_deliveries.values() if nd.get("notification_rule_id") in rule_ids],
-                "calendarEvents": [ce for ce in store.calendar_events.values() if ce.get("calendar_integration_id") in integration_ids],
-            },
-        }
-
-    def import_backup(self, user_id: UUID, payload: dict[str, Any]) -> dict[str, int]:
-        data = payload.get("data", {})
+        yield "appSettings", store.settings
+        yield "customLocales", store.custom_locales
+        yield "users", [store.users[user_id]] if user_id in store.users else []
+        yield "userCredentials", [{"user_id": uid, "password_hash": pwd_hash} for uid, pwd_hash in store.user_credentials.items() if uid == user_id]
+        yield "accounts", store.user_accounts(user_id)
+        yield "transactions", list(store.user_transactions(user_id))
+        yield "rateWatchlist", store.rate_watchlists.get(user_id, [])
+        yield "rateSnapshots", list(store.rate_snapshots.get(user_id, {}).values())
+        yield "vehicles", [v for v in store.vehicles.values() if v.get("user_id") == user_id]
+        yield "vehicleServices", [vs for vs in store.vehicle_services.values() if vs.get("vehicle_id") in vehicle_ids]
+        yield "vehicleServiceRules", [vr for vr in store.vehicle_service_rules.values() if vr.get("vehicle_id") in vehicle_ids]
+        yield "properties", [p for p in store.properties.values() if p.get("user_id") == user_id]
+        yield "propertyCosts", [pc for pc in store.property_costs.values() if pc.get("property_id") in property_ids]
+        yield "insurances", [i for i in store.insurances.values() if i.get("user_id") == user_id]
+        yield "insurancePremiums", [ip for ip in store.insurance_premiums.values() if ip.get("insurance_id") in insurance_ids]
+        yield "calendarIntegrations", [ci for ci in store.calendar_integrations.values() if ci.get("user_id") == user_id]
+        yield "notificationRules", [nr for nr in store.notification_rules.values() if nr.get("user_id") == user_id]
+        yield "notificationDeliveries", [nd for nd in store.notification_deliveries.values() if nd.get("notification_rule_id") in rule_ids]
+        yield "calendarEvents", [ce for ce in store.calendar_events.values() if ce.get("calendar_integration_id") in integration_ids]
+
+    def import_backup_sections(self, user_id: UUID, sections: Iterable[tuple[str, Any]]) -> dict[str, Any]:
+        data = {name: content if isinstance(content, dict) else list(content) for name, content in sections}
         store.settings = data.get("appSettings", store.settings)
         store.custom_locales = data.get("customLocales", {})
 
@@ -456,6 +1003,7 @@ class InMemoryPersistence(Persistence):
             store.user_credentials[UUID(str(uid))] = row.get("password_hash", "")
         store.accounts = map_by_id(data.get("accounts", []))
         store.transactions = map_by_id(data.get("transactions", []))
+        store.rebuild_indexes()
         store.rate_watchlists[user_id] = [str(s).strip().upper() for s in data.get("rateWatchlist", []) if str(s).strip()]
         store.rate_snapshots[user_id] = {}
         for row in data.get("rateSnapshots", []):
@@ -487,29 +1035,26 @@ class InMemoryPersistence(Persistence):
             key = f"{row.get('calendar_integration_id')}:{row.get('event_uid')}"
             store.calendar_events[key] = row
 
-        return self.debug_counts()
+        return {"counts": self.debug_counts(), "loadStats": []}
 
     def mark_auto_backup_run(self, user_id: UUID, when: datetime) -> None:
         store.settings["autoBackupLastRunAt"] = when
 
-    def register_user(self, email: str, password: str, full_name: str | None) -> dict[str, Any]:
-        for row in store.users.values():
-            if row["email"] == email:
-                raise HTTPException(status_code=409, detail="email already registered")
+    def register_user(self, email: str, password_hash: str, full_name: str | None) -> dict[str, Any]:
+        if store.user_by_email(email) is not None:
+            raise HTTPException(status_code=409, detail="email already registered")
         user_id = uuid4()
         user_row = {"id": user_id, "email": email, "full_name": full_name, "created_at": datetime.utcnow()}
-        store.users[user_id] = user_row
-        store.user_credentials[user_id] = hash_password(password)
+        store.put_user(user_row)
+        store.user_credentials[user_id] = password_hash
         return user_row
 
-    def authenticate_user(self, email: str, password: str) -> dict[str, Any] | None:
-        for user_id, row in store.users.items():
-            if row["email"] == email:
-                stored_hash = store.user_credentials.get(user_id)
-                if stored_hash and verify_password(password, stored_hash):
-                    return row
-                return None
-        return None
+    def get_login_credentials(self, email: str) -> dict[str, Any] | None:
+        row = store.user_by_email(email)
+        stored_hash = store.user_credentials.get(row["id"]) if row is not None else None
+        if not stored_hash:
+            return None
+        return {**row, "password_hash": stored_hash}
 
     def get_user_by_id(self, user_id: UUID) -> dict[str, Any] | None:
         return store.users.get(user_id)
@@ -519,23 +1064,20 @@ class InMemoryPersistence(Persistence):
         if row is None:
             raise HTTPException(status_code=404, detail="user not found")
         if email is not None:
-            for uid, user_row in store.users.items():
-                if uid != user_id and user_row.get("email", "").lower() == email.lower():
-                    raise HTTPException(status_code=409, detail="email already registered")
+            existing = store.user_by_email(email)
+            if existing is not None and existing["id"] != user_id:
+                raise HTTPException(status_code=409, detail="email already registered")
             row["email"] = email
         if full_name is not None:
             row["full_name"] = full_name
-        store.users[user_id] = row
+        store.put_user(row)
         return row
 
-    def change_user_password(self, user_id: UUID, current_password: str, new_password: str) -> None:
-        row = store.users.get(user_id)
-        if row is None:
-            raise HTTPException(status_code=404, detail="user not found")
-        current_hash = store.user_credentials.get(user_id)
-        if not current_hash or not verify_password(current_password, current_hash):
-            raise HTTPException(status_code=401, detail="invalid current password")
-        store.user_credentials[user_id] = hash_password(new_password)
+    def get_password_hash(self, user_id: UUID) -> str | None:
+        return store.user_credentials.get(user_id) if user_id in store.users else None
+
+    def set_password_hash(self, user_id: UUID, password_hash: str) -> None:
+        store.user_credentials[user_id] = password_hash
 
     def create_account(self, user_id: UUID, payload: AccountCreate) -> dict[str, Any]:
         entity_id = uuid4()
@@ -552,11 +1094,11 @@ class InMemoryPersistence(Persistence):
             "current_balance": payload.initialBalance,
             "created_at": now,
         }
-        store.accounts[entity_id] = row
+        store.put_account(row)
         return row
 
     def list_accounts(self, user_id: UUID) -> list[dict[str, Any]]:
-        return sorted([a for a in store.accounts.values() if a["user_id"] == user_id], key=lambda a: a.get("created_at", datetime.min), reverse=True)
+        return sorted(store.user_accounts(user_id), key=lambda a: a.get("created_at", datetime.min), reverse=True)
 
     def create_transaction(self, user_id: UUID, payload: TransactionCreate) -> dict[str, Any]:
         account = store.accounts.get(payload.accountId)
@@ -566,14 +1108,9 @@ class InMemoryPersistence(Persistence):
         day_anchor = payload.recurringDayOfMonth or payload.occurredAt.day
         weekend_policy = payload.recurringWeekendPolicy or "exact"
         first_row: dict[str, Any] | None = None
-        for idx in range(payload.recurringCount):
-            tx_time = (
-                _move_from_weekend(payload.occurredAt, weekend_policy)
-                if not payload.recurringFrequency
-                else _shift_recurring(payload.occurredAt, payload.recurringFrequency, idx, day_anchor, weekend_policy)
-            )
+        schedule = _transaction_schedule(payload, day_anchor, weekend_policy)
+        for idx, tx_time in enumerate(schedule):
             entity_id = uuid4()
-            account["current_balance"] = Decimal(account["current_balance"]) + (payload.amount * _tx_sign(payload.direction))
             row = {
                 "id": entity_id,
                 "user_id": user_id,
@@ -591,20 +1128,95 @@ class InMemoryPersistence(Persistence):
                 "recurring_day_of_month": day_anchor if payload.recurringFrequency in {"monthly", "yearly"} else None,
                 "recurring_weekend_policy": weekend_policy if payload.recurringFrequency else None,
             }
-            store.transactions[entity_id] = row
+            store.put_transaction(row)
             if first_row is None:
                 first_row = row
+        account["current_balance"] = Decimal(account["current_balance"]) + (payload.amount * _tx_sign(payload.direction) * len(schedule))
         return first_row or {}
 
-    def list_transactions(self, user_id: UUID) -> list[dict[str, Any]]:
-        def _ts(val: Any) -> float:
-            if isinstance(val, datetime):
-                return val.timestamp()
-            return 0.0
-        return sorted(
-            [t for t in store.transactions.values() if t["user_id"] == user_id],
-            key=lambda x: _ts(x.get("transaction_at")),
-            reverse=True,
+    def list_transactions(self, user_id: UUID, query: TransactionListQuery | None = None) -> dict[str, Any]:
+        query = query or TransactionListQuery()
+        after: tuple[float, str] | None = None
+        if query.cursor:
+            cursor_at, cursor_id = _decode_tx_cursor(query.cursor)
+            after = (cursor_at.timestamp(), str(cursor_id))
+        ts_from = query.occurredFrom.timestamp() if query.occurredFrom else None
+        ts_to = query.occurredTo.timestamp() if query.occurredTo else None
+        rows: list[dict[str, Any]] = []
+        for tx in store.user_transactions(user_id, before=after):
+            ts = _tx_timestamp(tx.get("transaction_at"))
+            if ts_from is not None and ts < ts_from:
+                break
+            if ts_to is not None and ts > ts_to:
+                continue
+            if query.accountId and tx.get("account_id") != query.accountId:
+                continue
+            if query.direction and tx.get("direction") != query.direction:
+                continue
+            if query.category and tx.get("category") != query.category:
+                continue
+            rows.append(tx)
+            if len(rows) > query.limit:
+                break
+        return _tx_page(rows, query.limit)
+
+    def get_dashboard_summary(self, user_id: UUID, period: DashboardPeriod) -> dict[str, Any]:
+        today = datetime.now(timezone.utc).date()
+        start = _dashboard_range_start(period, today)
+        month_start, month_end = _month_bounds(today)
+        zero = Decimal("0")
+        account_stats: dict[Any, dict[str, Any]] = {}
+        daily: dict[Any, dict[date, list[Decimal]]] = {}
+        month_income = zero
+        month_expense = zero
+        categories: dict[str, Decimal] = {}
+        first_day: date | None = None
+        for tx in store.user_transactions(user_id):
+            day = _utc_day(tx["transaction_at"])
+            amount = Decimal(str(tx["amount"]))
+            is_income = tx["direction"] == "income"
+            stats = account_stats.setdefault(
+                tx.get("account_id"), {"net": zero, "net_before": zero, "income": zero, "expense": zero}
+            )
+            signed = amount if is_income else -amount
+            stats["net"] += signed
+            stats["income" if is_income else "expense"] += amount
+            if start is not None and day < start:
+                stats["net_before"] += signed
+            bucket = daily.setdefault(tx.get("account_id"), {}).setdefault(day, [zero, zero])
+            bucket[0 if is_income else 1] += amount
+            if month_start <= day < month_end:
+                if is_income:
+                    month_income += amount
+                else:
+                    month_expense += amount
+            if first_day is None or day < first_day:
+                first_day = day
+            category = (tx.get("category") or "").strip()
+            if not is_income and category and (start is None or start <= day <= today):
+                categories[category] = categories.get(category, zero) + amount
+        if start is None:
+            start = min(first_day or today, today)
+        account_days: dict[Any, list[dict[str, Any]]] = {}
+        for account_id, by_day in daily.items():
+            cumulative = zero
+            items = []
+            for day in sorted(by_day):
+                income, expense = by_day[day]
+                cumulative += income - expense
+                if start <= day <= today:
+                    items.append({"day": day, "income": income, "expense": expense, "cumulative": cumulative})
+            account_days[account_id] = items
+        top = sorted(categories.items(), key=lambda item: (-item[1], item[0].lower()))[:DASHBOARD_TOP_CATEGORIES]
+        return _dashboard_summary(
+            period,
+            start,
+            today,
+            self.list_accounts(user_id),
+            account_stats,
+            account_days,
+            {"month": month_start.strftime("%Y-%m"), "income": month_income, "expense": month_expense},
+            [{"category": name, "amount": amount} for name, amount in top],
         )
 
     def update_account(self, user_id: UUID, account_id: UUID, payload: AccountUpdate) -> dict[str, Any]:
@@ -623,18 +1235,17 @@ class InMemoryPersistence(Persistence):
         if "initialBalance" in updates:
             row["initial_balance"] = updates["initialBalance"]
             tx_total = Decimal("0")
-            for tx in store.transactions.values():
-                if tx.get("account_id") == account_id and tx.get("user_id") == user_id:
-                    tx_total += Decimal(tx["amount"]) * _tx_sign(tx["direction"])
+            for tx in store.account_transactions(account_id):
+                tx_total += Decimal(tx["amount"]) * _tx_sign(tx["direction"])
             row["current_balance"] = Decimal(row["initial_balance"]) + tx_total
-        store.accounts[account_id] = row
+        store.put_account(row)
         return row
 
     def delete_account(self, user_id: UUID, account_id: UUID, action: AccountDeleteAction, target_account_id: UUID | None = None) -> None:
         row = store.accounts.get(account_id)
         if not row or row.get("user_id") != user_id:
             raise HTTPException(status_code=404, detail=f"account not found: {account_id}")
-        account_transactions = [tx_id for tx_id, tx in store.transactions.items() if tx.get("account_id") == account_id and tx.get("user_id") == user_id]
+        account_transactions = [tx["id"] for tx in store.account_transactions(account_id)]
         if action == AccountDeleteAction.transfer_balance:
             if target_account_id is None:
                 raise HTTPException(status_code=400, detail="targetAccountId is required for transfer_balance")
@@ -643,10 +1254,47 @@ class InMemoryPersistence(Persistence):
             target = store.accounts.get(target_account_id)
             if not target or target.get("user_id") != user_id:
                 raise HTTPException(status_code=404, detail=f"account not found: {target_account_id}")
-            target["current_balance"] = Decimal(target["current_balance"]) + Decimal(row["current_balance"])
+            # Folded into the target's opening balance so current_balance stays initial_balance + transactions.
+            target["initial_balance"] = Decimal(str(target["initial_balance"])) + Decimal(str(row["current_balance"]))
+            target["current_balance"] = Decimal(str(target["current_balance"])) + Decimal(str(row["current_balance"]))
         for tx_id in account_transactions:
-            del store.transactions[tx_id]
-        del store.accounts[account_id]
+            store.remove_transaction(tx_id)
+        store.remove_account(account_id)
+
+    def get_account_balance_at(self, user_id: UUID, account_id: UUID, day: date) -> dict[str, Any]:
+        row = store.accounts.get(account_id)
+        if not row or row.get("user_id") != user_id:
+            raise HTTPException(status_code=404, detail=f"account not found: {account_id}")
+        balance = Decimal(str(row.get("initial_balance") or 0)) + store.account_net_through(account_id, day)
+        return {"id": account_id, "currency": row["currency"], "balance": balance}
+
+    def get_account_balance_series(self, user_id: UUID, account_id: UUID, start: date, end: date, bucket: BalanceSeriesBucket) -> dict[str, Any]:
+        row = store.accounts.get(account_id)
+        if not row or row.get("user_id") != user_id:
+            raise HTTPException(status_code=404, detail=f"account not found: {account_id}")
+        initial = Decimal(str(row.get("initial_balance") or 0))
+        starts = _series_bucket_starts(start, end, bucket)
+        last_days = [s - timedelta(days=1) for s in starts[1:]] + [end]
+        opening = initial + store.account_net_through(account_id, start - timedelta(days=1))
+        closings = {s: initial + store.account_net_through(account_id, d) for s, d in zip(starts, last_days)}
+        return {"currency": row["currency"], "opening": opening, "points": _balance_series(opening, closings, starts)}
+
+    def reconcile_account_balances(self) -> dict[str, int]:
+        # Re-derives every account's net from the transactions themselves; the per-day ledgers are rebuilt
+        # if any of them disagree, then balances are reset to initial_balance + net.
+        nets: dict[Any, Decimal] = {}
+        for tx in store.transactions.values():
+            nets[tx.get("account_id")] = nets.get(tx.get("account_id"), Decimal("0")) + Decimal(str(tx["amount"])) * _tx_sign(tx["direction"])
+        ledgers_off = sum(1 for account_id in store.accounts if store.account_net_total(account_id) != nets.get(account_id, Decimal("0")))
+        if ledgers_off:
+            store.rebuild_indexes()
+        fixed = 0
+        for account_id, row in store.accounts.items():
+            expected = Decimal(str(row.get("initial_balance") or 0)) + nets.get(account_id, Decimal("0"))
+            if Decimal(str(row.get("current_balance") or 0)) != expected:
+                row["current_balance"] = expected
+                fixed += 1
+        return {"ledgers": ledgers_off, "accounts": fixed}
 
     def update_transaction(self, user_id: UUID, transaction_id: UUID, payload: TransactionUpdate) -> dict[str, Any]:
         original = store.transactions.get(transaction_id)
@@ -681,7 +1329,7 @@ class InMemoryPersistence(Persistence):
             row["note"] = updates["note"]
         new_delta = Decimal(row["amount"]) * _tx_sign(row["direction"])
         account["current_balance"] = Decimal(account["current_balance"]) - old_delta + new_delta
-        store.transactions[transaction_id] = row
+        store.put_transaction(row)
         return row
 
     def delete_transaction(self, user_id: UUID, transaction_id: UUID) -> None:
@@ -692,7 +1340,7 @@ class InMemoryPersistence(Persistence):
         if account and account.get("user_id") == user_id:
             delta = Decimal(row["amount"]) * _tx_sign(row["direction"])
             account["current_balance"] = Decimal(account["current_balance"]) - delta
-        del store.transactions[transaction_id]
+        store.remove_transaction(transaction_id)
 
     def transfer_between_accounts(self, user_id: UUID, payload: TransactionTransferCreate) -> dict[str, Any]:
         from_account = store.accounts.get(payload.fromAccountId)
@@ -736,19 +1384,12 @@ class InMemoryPersistence(Persistence):
             "recurring_frequency": None,
             "recurring_index": None,
         }
-        store.transactions[out_id] = outgoing
-        store.transactions[in_id] = incoming
+        store.put_transaction(outgoing)
+        store.put_transaction(incoming)
         return {"transferGroupId": transfer_group_id, "outgoing": outgoing, "incoming": incoming}
 
     def list_transaction_category_stats(self, user_id: UUID) -> TransactionCategoryStatsResponse:
-        counts: dict[str, int] = {}
-        for tx in store.transactions.values():
-            if tx.get("user_id") != user_id:
-                continue
-            category = (tx.get("category") or "").strip()
-            if not category:
-                continue
-            counts[category] = counts.get(category, 0) + 1
+        counts = store.category_counts(user_id)
         sorted_items = sorted(counts.items(), key=lambda item: (-item[1], item[0].lower()))
         most_used = sorted_items[0][0] if sorted_items else None
         categories = [{"category": name, "usageCount": cnt} for name, cnt in sorted_items]
@@ -758,14 +1399,12 @@ class InMemoryPersistence(Persistence):
         old_name = category.strip()
         if not old_name:
             raise HTTPException(status_code=400, detail="category must not be empty")
-        changed = False
-        for tx in store.transactions.values():
-            if tx.get("user_id") != user_id:
-                continue
-            if (tx.get("category") or "").strip() == old_name:
-                tx["category"] = payload.newCategory
-                changed = True
-        if not changed:
+        tx_ids = store.category_transaction_ids(user_id, old_name)
+        for tx_id in tx_ids:
+            tx = store.transactions[tx_id]
+            tx["category"] = payload.newCategory
+            store.put_transaction(tx)
+        if not tx_ids:
             raise HTTPException(status_code=404, detail=f"category not found: {category}")
         return self.list_transaction_category_stats(user_id)
 
@@ -773,12 +1412,7 @@ class InMemoryPersistence(Persistence):
         name = category.strip()
         if not name:
             raise HTTPException(status_code=400, detail="category must not be empty")
-        hits = []
-        for tx_id, tx in store.transactions.items():
-            if tx.get("user_id") != user_id:
-                continue
-            if (tx.get("category") or "").strip() == name:
-                hits.append((tx_id, tx))
+        hits = [(tx_id, store.transactions[tx_id]) for tx_id in store.category_transaction_ids(user_id, name)]
         if not hits:
             raise HTTPException(status_code=404, detail=f"category not found: {category}")
         if delete_transactions:
@@ -787,15 +1421,15 @@ class InMemoryPersistence(Persistence):
                 if account and account.get("user_id") == user_id:
                     delta = Decimal(tx["amount"]) * _tx_sign(tx["direction"])
                     account["current_balance"] = Decimal(account["current_balance"]) - delta
-                del store.transactions[tx_id]
+                store.remove_transaction(tx_id)
         else:
             for _, tx in hits:
                 tx["category"] = None
+                store.put_transaction(tx)
         return self.list_transaction_category_stats(user_id)
 
     def delete_user(self, user_id: UUID) -> None:
-        if user_id in store.users:
-            del store.users[user_id]
+        store.remove_user(user_id)
         if user_id in store.user_credentials:
             del store.user_credentials[user_id]
         vehicle_ids = {k for k, v in store.vehicles.items() if v.get("user_id") == user_id}
@@ -803,8 +1437,10 @@ class InMemoryPersistence(Persistence):
         insurance_ids = {k for k, v in store.insurances.items() if v.get("user_id") == user_id}
         integration_ids = {k for k, v in store.calendar_integrations.items() if v.get("user_id") == user_id}
         rule_ids = {k for k, v in store.notification_rules.items() if v.get("user_id") == user_id}
-        store.accounts = {k: v for k, v in store.accounts.items() if v.get("user_id") != user_id}
-        store.transactions = {k: v for k, v in store.transactions.items() if v.get("user_id") != user_id}
+        for tx in list(store.user_transactions(user_id)):
+            store.remove_transaction(tx["id"])
+        for account in store.user_accounts(user_id):
+            store.remove_account(account["id"])
         store.vehicles = {k: v for k, v in store.vehicles.items() if v.get("user_id") != user_id}
         store.vehicle_services = {k: v for k, v in store.vehicle_services.items() if v.get("vehicle_id") not in vehicle_ids}
         store.vehicle_service_rules = {k: v for k, v in store.vehicle_service_rules.items() if v.get("vehicle_id") not in vehicle_ids}
@@ -824,14 +1460,101 @@ class InMemoryPersistence(Persistence):
             del store.rate_snapshots[user_id]
 
 
+class _BulkLoader:
+    # Loads backup rows table by table inside the caller's transaction: COPY ... FROM STDIN when the
+    # driver is psycopg, a single executemany otherwise. Each load is timed for the import report.
+    def __init__(self, conn: Connection) -> None:
+        self.conn = conn
+        self._totals: dict[str, list[float]] = {}
+        driver = getattr(getattr(conn, "connection", None), "driver_connection", None)
+        self._driver = driver if isinstance(driver, psycopg.Connection) else None
+
+    def _record(self, table: str, rows: int, started: float) -> None:
+        totals = self._totals.setdefault(table, [0, 0.0])
+        totals[0] += rows
+        totals[1] += time.perf_counter() - started
+
+    @property
+    def stats(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "table": table,
+                "rows": int(rows),
+                "seconds": round(seconds, 4),
+                "rowsPerSecond": round(rows / seconds) if seconds > 0 else int(rows),
+            }
+            for table, (rows, seconds) in self._totals.items()
+        ]
+
+    def copy(self, table: str, cols: list[str], rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        started = time.perf_counter()
+        if self._driver is None:
+            stmt = text(f"insert into {table} ({', '.join(cols)}) values ({', '.join(f':{c}' for c in cols)})")
+            self.conn.execute(stmt, [{c: r.get(c) for c in cols} for r in rows])
+        else:
+            with self._driver.cursor() as cursor:
+                with cursor.copy(f"copy {table} ({', '.join(cols)}) from stdin") as copy:
+                    for r in rows:
+                        copy.write_row([r.get(c) for c in cols])
+        self._record(table, len(rows), started)
+
+    def execute_many(self, table: str, sql: str, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        started = time.perf_counter()
+        self.conn.execute(text(sql), rows)
+        self._record(table, len(rows), started)
+
+
 class PostgresPersistence(Persistence):
+    storage_name = "postgres"
+
     def __init__(self, database_url: str, default_user_id: str) -> None:
-        self.engine: Engine = create_engine(database_url, future=True, pool_pre_ping=True)
+        self.engine: Engine = create_engine(database_url, future=True, pool_pre_ping=True, pool_size=settings.db_pool_size)
         self.default_user_id = default_user_id
+        # Session checks read app settings on every request; entries are dropped on every settings write
+        # here and expire after a few seconds so writes made by other workers are picked up too.
+        self.app_settings_ttl_seconds = settings.app_settings_cache_seconds
+        self._app_settings_cache: dict[str, tuple[float, AppSettings]] = {}
+        self._schema_ready = False
+        # Cleared by ensure_schema when case-duplicate emails keep uq_users_email_lower from being created.
+        self._email_index_ready = True
+
+    def ensure_schema(self) -> None:
+        # Runs once per process at startup; request handlers never issue DDL.
+        if self._schema_ready:
+            return
+        with self._connection():
+            self._ensure_auth_columns()
+            self._ensure_app_settings_columns()
+            self._ensure_rates_tables()
+            self._ensure_balance_ledger()
+        self._schema_ready = True
+
+    def _invalidate_app_settings(self, user_id: UUID) -> None:
+        self._app_settings_cache.pop(str(user_id), None)
+
+    @contextmanager
+    def _connection(self) -> Iterator[Connection]:
+        current = _pg_connection.get()
+        if current is not None:
+            yield current
+            return
+        try:
+            with self.engine.begin() as conn:
+                token = _pg_connection.set(conn)
+                try:
+                    yield conn
+                finally:
+                    _pg_connection.reset(token)
+        except SQLAlchemyError as exc:
+            raise HTTPException(status_code=500, detail=f"postgres error: {exc.__class__.__name__}") from exc
 
     def _run(self, sql: str, params: dict[str, Any] | None = None) -> list[dict[str, Any]]:
         try:
-            with self.engine.begin() as conn:
+            with self._connection() as conn:
                 result = conn.execute(text(sql), params or {})
                 if result.returns_rows:
                     return [dict(row._mapping) for row in result.fetchall()]
@@ -858,8 +1581,32 @@ class PostgresPersistence(Persistence):
             """
         )
 
+    def _ensure_email_index(self) -> None:
+        # Same steps as migration 0014, but an existing database with case-duplicate emails must not keep
+        # the app from starting; those rows are reported and the index waits until they are merged.
+        duplicates = self._run(
+            """
+            select lower(trim(email)) as email, count(*)::integer as users
+            from users
+            group by 1
+            having count(*) > 1
+            """
+        )
+        if duplicates:
+            logger.error(
+                "uq_users_email_lower not created: %d email(s) are used by several users differing only in case or "
+                "whitespace; merge or rename those users and restart",
+                len(duplicates),
+            )
+            self._email_index_ready = False
+            return
+        self._run("update users set email = lower(trim(email)) where email <> lower(trim(email))")
+        self._run("create unique index if not exists uq_users_email_lower on users (lower(email))")
+        self._email_index_ready = True
+
     def _ensure_auth_columns(self) -> None:
         self._run("alter table if exists users add column if not exists full_name text")
+        self._ensure_email_index()
         self._run(
             """
             create table if not exists user_credentials (
@@ -886,6 +1633,19 @@ class PostgresPersistence(Persistence):
             )
             """
         )
+        self._run(
+            """
+            create table if not exists user_sessions (
+              token_hash text primary key,
+              user_id uuid not null references users(id) on delete cascade,
+              last_seen_at timestamptz not null default now(),
+              expires_at timestamptz not null,
+              created_at timestamptz not null default now()
+            )
+            """
+        )
+        self._run("create index if not exists idx_user_sessions_expires on user_sessions(expires_at)")
+        self._run("create index if not exists idx_user_sessions_user on user_sessions(user_id)")
         self._run("alter table if exists accounts add column if not exists initial_balance_at timestamptz")
         self._run("create index if not exists idx_accounts_user on accounts(user_id, created_at desc)")
         self._run(
@@ -903,6 +1663,104 @@ class PostgresPersistence(Persistence):
             """
         )
 
+    def _ensure_balance_ledger(self) -> None:
+        self._run(
+            """
+            create table if not exists account_balance_days (
+              account_id uuid not null references accounts(id) on delete cascade,
+              day date not null,
+              net_change numeric(14,2) not null default 0,
+              closing_net numeric(14,2) not null default 0,
+              primary key (account_id, day)
+            )
+            """
+        )
+
+    def _shift_balance_days(self, changes: Iterable[tuple[Any, date, Decimal]]) -> None:
+        # Keeps account_balance_days in step with a write: closing_net is the running signed transaction
+        # total through the day, so each change adds its delta to its own day and every later day.
+        merged: dict[tuple[str, date], Decimal] = {}
+        for account_id, day, delta in changes:
+            key = (str(account_id), day)
+            merged[key] = merged.get(key, Decimal("0")) + delta
+        merged = {key: delta for key, delta in merged.items() if delta}
+        if not merged:
+            return
+        params = {
+            "account_ids": [account_id for account_id, _ in merged],
+            "days": [day for _, day in merged],
+            "deltas": list(merged.values()),
+        }
+        self._run(
+            """
+            insert into account_balance_days (account_id, day, net_change, closing_net)
+            select d.account_id, d.day, 0, coalesce((
+                select b.closing_net from account_balance_days b
+                where b.account_id = d.account_id and b.day < d.day
+                order by b.day desc
+                limit 1
+            ), 0)
+            from unnest(cast(:account_ids as uuid[]), cast(:days as date[])) as d(account_id, day)
+            on conflict (account_id, day) do nothing
+            """,
+            params,
+        )
+        self._run(
+            """
+            update account_balance_days b
+            set closing_net = b.closing_net + s.through, net_change = b.net_change + s.same_day
+            from (
+                select b2.account_id, b2.day, sum(d.delta) as through,
+                       coalesce(sum(d.delta) filter (where d.day = b2.day), 0) as same_day
+                from account_balance_days b2
+                join unnest(cast(:account_ids as uuid[]), cast(:days as date[]), cast(:deltas as numeric[])) as d(account_id, day, delta)
+                  on d.account_id = b2.account_id and d.day <= b2.day
+                group by b2.account_id, b2.day
+            ) s
+            where b.account_id = s.account_id and b.day = s.day
+            """,
+            params,
+        )
+
+    def _rebuild_balance_days(self, user_id: UUID | None = None) -> int:
+        # Re-derives the ledger from transactions in one statement (one user, or everyone when user_id is
+        # None) and returns how many accounts had wrong, missing or stale day rows.
+        rows = self._run(
+            """
+            with derived as (
+                select account_id, day, net_change, sum(net_change) over (partition by account_id order by day) as closing_net
+                from (
+                    select t.account_id, (t.transaction_at at time zone 'UTC')::date as day,
+                           sum(case when t.direction = 'income' then t.amount else -t.amount end) as net_change
+                    from transactions t
+                    where cast(:user_id as uuid) is null or t.user_id = cast(:user_id as uuid)
+                    group by 1, 2
+                ) per_day
+            ),
+            stale as (
+                delete from account_balance_days b
+                using accounts a
+                where a.id = b.account_id
+                  and (cast(:user_id as uuid) is null or a.user_id = cast(:user_id as uuid))
+                  and not exists (select 1 from derived d where d.account_id = b.account_id and d.day = b.day)
+                returning b.account_id
+            ),
+            upserted as (
+                insert into account_balance_days (account_id, day, net_change, closing_net)
+                select account_id, day, net_change, closing_net from derived
+                on conflict (account_id, day) do update
+                  set net_change = excluded.net_change, closing_net = excluded.closing_net
+                  where (account_balance_days.net_change, account_balance_days.closing_net)
+                        is distinct from (excluded.net_change, excluded.closing_net)
+                returning account_id
+            )
+            select count(distinct account_id) as fixed
+            from (select account_id from stale union all select account_id from upserted) changed
+            """,
+            {"user_id": user_id},
+        )
+        return int(rows[0]["fixed"]) if rows else 0
+
     def _ensure_rates_tables(self) -> None:
         self._run(
             """
@@ -934,9 +1792,30 @@ class PostgresPersistence(Persistence):
         )
         self._run("create index if not exists idx_rate_assets_user on rate_assets(user_id, symbol)")
         self._run("create index if not exists idx_rate_snapshots_user on rate_snapshots(user_id, symbol)")
+        self._run("create index if not exists idx_rate_assets_symbol on rate_assets(symbol, user_id)")
+        self._run(
+            """
+            create table if not exists rate_history (
+              symbol text not null,
+              resolution text not null check (resolution in ('raw', 'day', 'week')),
+              bucket_start timestamptz not null,
+              open numeric(30,10) not null,
+              high numeric(30,10) not null,
+              low numeric(30,10) not null,
+              close numeric(30,10) not null,
+              currency text not null,
+              samples integer not null default 1,
+              primary key (symbol, resolution, bucket_start)
+            )
+            """
+        )
+        self._run("create index if not exists idx_rate_history_resolution on rate_history(resolution, bucket_start)")
 
+    @_unit_of_work
     def get_app_settings(self, user_id: UUID) -> AppSettings:
-        self._ensure_app_settings_columns()
+        cached = self._app_settings_cache.get(str(user_id))
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1].model_copy()
         rows = self._run(
             """
             select default_locale, default_timezone, calendar_provider, calendar_sync_enabled, self_registration_enabled, smtp_enabled,
@@ -971,7 +1850,7 @@ class PostgresPersistence(Persistence):
                 {"user_id": user_id},
             )
         row = rows[0]
-        return AppSettings(
+        settings_row = AppSettings(
             defaultLocale=row.get("default_locale", "en"),
             defaultTimezone=row["default_timezone"],
             defaultDisplayCurrency=row.get("default_display_currency", "CZK"),
@@ -986,7 +1865,10 @@ class PostgresPersistence(Persistence):
             autoBackupLastRunAt=row["auto_backup_last_run_at"],
             sessionTimeoutMinutes=row.get("session_timeout_minutes"),
         )
+        self._app_settings_cache[str(user_id)] = (time.monotonic() + self.app_settings_ttl_seconds, settings_row)
+        return settings_row.model_copy()
 
+    @_unit_of_work
     def update_app_settings(self, user_id: UUID, payload: AppSettingsUpdate) -> AppSettings:
         current = self.get_app_settings(user_id)
         merged = current.model_dump()
@@ -1027,13 +1909,16 @@ class PostgresPersistence(Persistence):
                 "user_id": user_id,
             },
         )
+        self._invalidate_app_settings(user_id)
         return AppSettings(**merged)
 
+    @_unit_of_work
     def list_locales(self, user_id: UUID) -> list[str]:
         rows = self._run("select locale from locale_custom_messages where user_id = :user_id group by locale", {"user_id": user_id})
         custom = [r["locale"] for r in rows]
         return sorted(set(store.base_locales.keys()) | set(custom))
 
+    @_unit_of_work
     def get_locale_bundle(self, user_id: UUID, locale: str) -> dict[str, str]:
         rows = self._run(
             "select message_key, message_value from locale_custom_messages where user_id = :user_id and locale = :locale",
@@ -1042,6 +1927,7 @@ class PostgresPersistence(Persistence):
         custom = {r["message_key"]: r["message_value"] for r in rows}
         return {**store.base_locales.get(locale, {}), **custom}
 
+    @_unit_of_work
     def get_custom_locale(self, user_id: UUID, locale: str) -> dict[str, str]:
         rows = self._run(
             "select message_key, message_value from locale_custom_messages where user_id = :user_id and locale = :locale",
@@ -1049,6 +1935,7 @@ class PostgresPersistence(Persistence):
         )
         return {r["message_key"]: r["message_value"] for r in rows}
 
+    @_unit_of_work
     def upsert_custom_locale(self, user_id: UUID, locale: str, payload: dict[str, str]) -> dict[str, str]:
         for k, v in payload.items():
             self._run(
@@ -1068,8 +1955,8 @@ class PostgresPersistence(Persistence):
             )
         return self.get_locale_bundle(user_id, locale)
 
+    @_unit_of_work
     def get_rates_state(self, user_id: UUID) -> dict[str, Any]:
-        self._ensure_rates_tables()
         watch_rows = self._run(
             "select symbol from rate_assets where user_id = :user_id order by symbol asc",
             {"user_id": user_id},
@@ -1094,70 +1981,205 @@ class PostgresPersistence(Persistence):
         }
         return {"watchlist": [r["symbol"] for r in watch_rows], "snapshots": snapshots}
 
+    @_unit_of_work
     def update_rates_watchlist(self, user_id: UUID, payload: RatesWatchlistUpdate) -> dict[str, Any]:
-        self._ensure_rates_tables()
-        symbols = payload.symbols
-        for sym in symbols:
-            self._run(
-                """
+        # One statement regardless of watchlist size; "<> all('{}')" also covers clearing the list.
+        self._run(
+            """
+            with upserted as (
                 insert into rate_assets (id, user_id, symbol, created_at, updated_at)
-                values (:id, :user_id, :symbol, now(), now())
+                select gen_random_uuid(), cast(:user_id as uuid), s.symbol, now(), now()
+                from unnest(cast(:symbols as text[])) as s(symbol)
                 on conflict (user_id, symbol)
                 do update set updated_at = now()
-                """,
-                {"id": str(uuid4()), "user_id": user_id, "symbol": sym},
-            )
-        if symbols:
-            self._run(
-                "delete from rate_assets where user_id = :user_id and symbol <> all(:symbols)",
-                {"user_id": user_id, "symbols": symbols},
+            ), dropped_snapshots as (
+                delete from rate_snapshots where user_id = :user_id and symbol <> all(cast(:symbols as text[]))
             )
+            delete from rate_assets where user_id = :user_id and symbol <> all(cast(:symbols as text[]))
+            """,
+            {"user_id": user_id, "symbols": payload.symbols},
+        )
+        return self.get_rates_state(user_id)
+
+    @_unit_of_work
+    def upsert_rate_snapshots(self, user_id: UUID, payloads: list[RateSnapshotUpsert]) -> dict[str, Any]:
+        # A symbol may only appear once per INSERT ... ON CONFLICT; the last payload wins.
+        payloads = list({payload.symbol: payload for payload in payloads}.values())
+        if payloads:
+            fallback = datetime.utcnow()
             self._run(
-                "delete from rate_snapshots where user_id = :user_id and symbol <> all(:symbols)",
-                {"user_id": user_id, "symbols": symbols},
+                """
+                with incoming as (
+                    select * from unnest(
+                      cast(:symbols as text[]), cast(:prices as numeric[]), cast(:currencies as text[]),
+                      cast(:sources as text[]), cast(:times as timestamptz[])
+                    ) as q(symbol, price, currency, source, last_updated_at)
+                ), assets as (
+                    insert into rate_assets (id, user_id, symbol, created_at, updated_at)
+                    select gen_random_uuid(), cast(:user_id as uuid), symbol, now(), now() from incoming
+                    on conflict (user_id, symbol)
+                    do update set updated_at = now()
+                )
+                insert into rate_snapshots (id, user_id, symbol, price, currency, source, last_updated_at, created_at, updated_at)
+                select gen_random_uuid(), cast(:user_id as uuid), symbol, price, currency, source, last_updated_at, now(), now()
+                from incoming
+                on conflict (user_id, symbol)
+                do update set price = excluded.price, currency = excluded.currency, source = excluded.source, last_updated_at = excluded.last_updated_at, updated_at = now()
+                """,
+                {
+                    "user_id": user_id,
+                    "symbols": [payload.symbol for payload in payloads],
+                    "prices": [_to_float(payload.price) for payload in payloads],
+                    "currencies": [payload.currency for payload in payloads],
+                    "sources": [payload.source for payload in payloads],
+                    "times": [payload.updatedAt or fallback for payload in payloads],
+                },
             )
-        else:
-            self._run("delete from rate_assets where user_id = :user_id", {"user_id": user_id})
-            self._run("delete from rate_snapshots where user_id = :user_id", {"user_id": user_id})
         return self.get_rates_state(user_id)
 
-    def upsert_rate_snapshot(self, user_id: UUID, payload: RateSnapshotUpsert) -> dict[str, Any]:
-        self._ensure_rates_tables()
-        self._run(
+    @_unit_of_work
+    def delete_rate_symbol(self, user_id: UUID, symbol: str) -> dict[str, Any]:
+        sym = symbol.strip().upper()
+        self._run("delete from rate_snapshots where user_id = :user_id and symbol = :symbol", {"user_id": user_id, "symbol": sym})
+        self._run("delete from rate_assets where user_id = :user_id and symbol = :symbol", {"user_id": user_id, "symbol": sym})
+        return self.get_rates_state(user_id)
+
+    @_unit_of_work
+    def list_rate_symbols(self) -> list[str]:
+        return [row["symbol"] for row in self._run("select distinct symbol from rate_assets order by symbol")]
+
+    @_unit_of_work
+    def apply_rate_quotes(self, quotes: list[dict[str, Any]]) -> int:
+        if not quotes:
+            return 0
+        # One INSERT ... SELECT joins the quotes to every watcher of each symbol; older quotes never
+        # overwrite a newer snapshot (e.g. a manual one).
+        rows = self._run(
             """
-            insert into rate_assets (id, user_id, symbol, created_at, updated_at)
-            values (:id, :user_id, :symbol, now(), now())
-            on conflict (user_id, symbol)
-            do update set updated_at = now()
+            with upserted as (
+                insert into rate_snapshots (id, user_id, symbol, price, currency, source, last_updated_at, created_at, updated_at)
+                select gen_random_uuid(), a.user_id, q.symbol, q.price, q.currency, q.source, q.last_updated_at, now(), now()
+                from unnest(
+                  cast(:symbols as text[]), cast(:prices as numeric[]), cast(:currencies as text[]),
+                  cast(:sources as text[]), cast(:times as timestamptz[])
+                ) as q(symbol, price, currency, source, last_updated_at)
+                join rate_assets a on a.symbol = q.symbol
+                on conflict (user_id, symbol)
+                do update set price = excluded.price, currency = excluded.currency, source = excluded.source,
+                              last_updated_at = excluded.last_updated_at, updated_at = now()
+                where rate_snapshots.last_updated_at <= excluded.last_updated_at
+                returning 1
+            )
+            select count(*) as written from upserted
             """,
-            {"id": str(uuid4()), "user_id": user_id, "symbol": payload.symbol},
+            {
+                "symbols": [quote["symbol"] for quote in quotes],
+                "prices": [float(quote["price"]) for quote in quotes],
+                "currencies": [quote["currency"] for quote in quotes],
+                "sources": [quote["source"] for quote in quotes],
+                "times": [quote["updatedAt"] for quote in quotes],
+            },
         )
-        self._run(
+        return int(rows[0]["written"]) if rows else 0
+
+    @_unit_of_work
+    def append_rate_history(self, quotes: list[dict[str, Any]]) -> int:
+        if not quotes:
+            return 0
+        rows = self._run(
             """
-            insert into rate_snapshots (id, user_id, symbol, price, currency, source, last_updated_at, created_at, updated_at)
-            values (:id, :user_id, :symbol, :price, :currency, :source, :last_updated_at, now(), now())
-            on conflict (user_id, symbol)
-            do update set price = excluded.price, currency = excluded.currency, source = excluded.source, last_updated_at = excluded.last_updated_at, updated_at = now()
+            with inserted as (
+                insert into rate_history (symbol, resolution, bucket_start, open, high, low, close, currency, samples)
+                select q.symbol, 'raw', q.bucket_start, q.price, q.price, q.price, q.price, q.currency, 1
+                from unnest(cast(:symbols as text[]), cast(:times as timestamptz[]), cast(:prices as numeric[]), cast(:currencies as text[]))
+                  as q(symbol, bucket_start, price, currency)
+                on conflict (symbol, resolution, bucket_start) do nothing
+                returning 1
+            )
+            select count(*) as written from inserted
             """,
             {
-                "id": str(uuid4()),
-                "user_id": user_id,
-                "symbol": payload.symbol,
-                "price": _to_float(payload.price),
-                "currency": payload.currency,
-                "source": payload.source,
-                "last_updated_at": payload.updatedAt or datetime.utcnow(),
+                "symbols": [quote["symbol"] for quote in quotes],
+                "times": [quote["updatedAt"] for quote in quotes],
+                "prices": [float(quote["price"]) for quote in quotes],
+                "currencies": [quote["currency"] for quote in quotes],
             },
         )
-        return self.get_rates_state(user_id)
+        return int(rows[0]["written"]) if rows else 0
 
-    def delete_rate_symbol(self, user_id: UUID, symbol: str) -> dict[str, Any]:
-        self._ensure_rates_tables()
-        sym = symbol.strip().upper()
-        self._run("delete from rate_snapshots where user_id = :user_id and symbol = :symbol", {"user_id": user_id, "symbol": sym})
-        self._run("delete from rate_assets where user_id = :user_id and symbol = :symbol", {"user_id": user_id, "symbol": sym})
-        return self.get_rates_state(user_id)
+    def _downsample_rate_history(self, source: str, target: str, before: datetime) -> int:
+        # Moves every point older than the cutoff into its day/week bucket in one statement; a bucket
+        # that already exists keeps its open and absorbs the new high/low/close.
+        rows = self._run(
+            """
+            with moved as (
+                delete from rate_history
+                where resolution = :source and bucket_start < :before
+                returning symbol, bucket_start, open, high, low, close, currency, samples
+            ), grouped as (
+                select symbol,
+                       date_trunc(:target, bucket_start at time zone 'UTC') at time zone 'UTC' as bucket,
+                       (array_agg(open order by bucket_start))[1] as open,
+                       max(high) as high,
+                       min(low) as low,
+                       (array_agg(close order by bucket_start desc))[1] as close,
+                       (array_agg(currency order by bucket_start desc))[1] as currency,
+                       sum(samples) as samples,
+                       count(*) as moved
+                from moved
+                group by symbol, bucket
+            ), merged as (
+                insert into rate_history (symbol, resolution, bucket_start, open, high, low, close, currency, samples)
+                select symbol, :target, bucket, open, high, low, close, currency, samples from grouped
+                on conflict (symbol, resolution, bucket_start)
+                do update set high = greatest(rate_history.high, excluded.high),
+                              low = least(rate_history.low, excluded.low),
+                              close = excluded.close,
+                              currency = excluded.currency,
+                              samples = rate_history.samples + excluded.samples
+            )
+            select coalesce(sum(moved), 0) as moved from grouped
+            """,
+            {"source": source, "target": target, "before": before},
+        )
+        return int(rows[0]["moved"]) if rows else 0
+
+    @_unit_of_work
+    def downsample_rate_history(self, raw_before: datetime, daily_before: datetime) -> int:
+        moved = self._downsample_rate_history("raw", "day", raw_before)
+        return moved + self._downsample_rate_history("day", "week", daily_before)
 
+    @_unit_of_work
+    def get_rate_history(self, symbol: str, start: datetime, end: datetime, bucket: RateHistoryBucket) -> list[dict[str, Any]]:
+        if bucket == RateHistoryBucket.raw:
+            return self._run(
+                """
+                select symbol, bucket_start, open, high, low, close, currency, samples
+                from rate_history
+                where symbol = :symbol and resolution = 'raw' and bucket_start >= :start and bucket_start < :end
+                order by bucket_start
+                """,
+                {"symbol": symbol, "start": start, "end": end},
+            )
+        return self._run(
+            """
+            select symbol,
+                   date_trunc(:bucket, bucket_start at time zone 'UTC') at time zone 'UTC' as bucket_start,
+                   (array_agg(open order by bucket_start))[1] as open,
+                   max(high) as high,
+                   min(low) as low,
+                   (array_agg(close order by bucket_start desc))[1] as close,
+                   (array_agg(currency order by bucket_start desc))[1] as currency,
+                   sum(samples) as samples
+            from rate_history
+            where symbol = :symbol and resolution = any(:resolutions) and bucket_start >= :start and bucket_start < :end
+            group by 1, 2
+            order by 2
+            """,
+            {"symbol": symbol, "bucket": bucket.value, "resolutions": RATE_HISTORY_SOURCES[bucket], "start": start, "end": end},
+        )
+
+    @_unit_of_work
     def create_vehicle(self, payload: VehicleCreate) -> dict[str, Any]:
         row = self._run(
             """
@@ -1182,6 +2204,7 @@ class PostgresPersistence(Persistence):
         )[0]
         return row
 
+    @_unit_of_work
     def create_vehicle_service(self, vehicle_id: UUID, payload: VehicleServiceCreate) -> dict[str, Any]:
         if not self._exists("vehicles", vehicle_id):
             raise HTTPException(status_code=404, detail=f"vehicle not found: {vehicle_id}")
@@ -1205,6 +2228,7 @@ class PostgresPersistence(Persistence):
         )[0]
         return row
 
+    @_unit_of_work
     def create_vehicle_service_rule(self, vehicle_id: UUID, payload: VehicleServiceRuleCreate, next_due_date: date | None) -> dict[str, Any]:
         if not self._exists("vehicles", vehicle_id):
             raise HTTPException(status_code=404, detail=f"vehicle not found: {vehicle_id}")
@@ -1226,6 +2250,7 @@ class PostgresPersistence(Persistence):
         )[0]
         return row
 
+    @_unit_of_work
     def create_property(self, payload: PropertyCreate) -> dict[str, Any]:
         row = self._run(
             """
@@ -1252,6 +2277,7 @@ class PostgresPersistence(Persistence):
         )[0]
         return row
 
+    @_unit_of_work
     def create_property_cost(self, property_id: UUID, payload: PropertyCostCreate) -> dict[str, Any]:
         if not self._exists("properties", property_id):
             raise HTTPException(status_code=404, detail=f"property not found: {property_id}")
@@ -1277,6 +2303,7 @@ class PostgresPersistence(Persistence):
         )[0]
         return row
 
+    @_unit_of_work
     def create_insurance(self, payload: InsuranceCreate) -> dict[str, Any]:
         row = self._run(
             """
@@ -1303,6 +2330,7 @@ class PostgresPersistence(Persistence):
         )[0]
         return row
 
+    @_unit_of_work
     def create_insurance_premium(self, insurance_id: UUID, payload: InsurancePremiumCreate) -> dict[str, Any]:
         if not self._exists("insurances", insurance_id):
             raise HTTPException(status_code=404, detail=f"insurance not found: {insurance_id}")
@@ -1325,6 +2353,7 @@ class PostgresPersistence(Persistence):
         )[0]
         return row
 
+    @_unit_of_work
     def create_calendar_integration(self, payload: GoogleCalendarConnectRequest) -> dict[str, Any]:
         row = self._run(
             """
@@ -1342,6 +2371,7 @@ class PostgresPersistence(Persistence):
         )[0]
         return row
 
+    @_unit_of_work
     def create_notification_rule(self, payload: NotificationRuleCreate) -> dict[str, Any]:
         row = self._run(
             """
@@ -1365,6 +2395,7 @@ class PostgresPersistence(Persistence):
         )[0]
         return row
 
+    @_unit_of_work
     def list_google_notification_rules(self) -> list[dict[str, Any]]:
         return self._run(
             """
@@ -1375,6 +2406,7 @@ class PostgresPersistence(Persistence):
             {"user_id": self.default_user_id},
         )
 
+    @_unit_of_work
     def any_calendar_integration_id(self) -> UUID | None:
         rows = self._run(
             """
@@ -1387,6 +2419,7 @@ class PostgresPersistence(Persistence):
         )
         return rows[0]["id"] if rows else None
 
+    @_unit_of_work
     def get_calendar_event(self, integration_id: UUID, event_uid: str) -> dict[str, Any] | None:
         rows = self._run(
             """
@@ -1398,6 +2431,7 @@ class PostgresPersistence(Persistence):
         )
         return rows[0] if rows else None
 
+    @_unit_of_work
     def create_calendar_event(self, integration_id: UUID, rule_id: UUID, event_uid: str, event_hash: str, provider_event_id: str) -> None:
         self._run(
             """
@@ -1414,14 +2448,15 @@ class PostgresPersistence(Persistence):
             },
         )
 
+    @_unit_of_work
     def update_calendar_event_hash(self, event_id: UUID, event_hash: str) -> None:
         self._run(
             "update calendar_events set event_hash = :event_hash, updated_at = now(), last_synced_at = now() where id = :id",
             {"id": event_id, "event_hash": event_hash},
         )
 
+    @_unit_of_work
     def debug_counts(self) -> dict[str, int]:
-        self._ensure_rates_tables()
         queries = {
             "users": "select count(*) as c from users",
             "accounts": "select count(*) as c from accounts where user_id = :user_id",
@@ -1446,102 +2481,50 @@ class PostgresPersistence(Persistence):
             out[key] = int(rows[0]["c"])
         return out
 
-    def export_backup(self, user_id: UUID) -> dict[str, Any]:
-        return {
-            "meta": {
-                "version": 1,
-                "exportedAt": datetime.utcnow().isoformat() + "Z",
-                "storageBackend": "postgres",
-            },
-            "data": {
-                "appSettings": self.get_app_settings(user_id).model_dump(),
-                "customLocales": self._run(
-                    "select locale, message_key, message_value from locale_custom_messages where user_id = :user_id order by locale, message_key",
-                    {"user_id": user_id},
-                ),
-                "users": self._run("select id, email, full_name, created_at, updated_at from users where id = :user_id", {"user_id": user_id}),
-                "userCredentials": self._run("select user_id, password_hash, created_at, updated_at from user_credentials where user_id = :user_id", {"user_id": user_id}),
-                "accounts": self._run("select * from accounts where user_id = :user_id order by created_at", {"user_id": user_id}),
-                "transactions": self._run("select * from transactions where user_id = :user_id order by created_at", {"user_id": user_id}),
-                "rateWatchlist": [row["symbol"] for row in self._run("select symbol from rate_assets where user_id = :user_id order by symbol", {"user_id": user_id})],
-                "rateSnapshots": self._run(
-                    "select symbol, price, currency, source, last_updated_at as updated_at from rate_snapshots where user_id = :user_id order by symbol",
-                    {"user_id": user_id},
-                ),
-                "vehicles": self._run("select * from vehicles where user_id = :user_id order by created_at", {"user_id": user_id}),
-                "vehicleServices": self._run(
-                    """
-                    select vs.* from vehicle_services vs
-                    join vehicles v on v.id = vs.vehicle_id
-                    where v.user_id = :user_id
-                    order by vs.created_at
-                    """,
-                    {"user_id": user_id},
-                ),
-                "vehicleServiceRules": self._run(
-                    """
-                    select vr.* from vehicle_service_rules vr
-                    join vehicles v on v.id = vr.vehicle_id
-                    where v.user_id = :user_id
-                    order by vr.created_at
-                    """,
-                    {"user_id": user_id},
-                ),
-                "properties": self._run("select * from properties where user_id = :user_id order by created_at", {"user_id": user_id}),
-                "propertyCosts": self._run(
-                    """
-                    select pc.* from property_costs pc
-                    join properties p on p.id = pc.property_id
-                    where p.user_id = :user_id
-                    order by pc.created_at
-                    """,
-                    {"user_id": user_id},
-                ),
-                "insurances": self._run("select * from insurances where user_id = :user_id order by created_at", {"user_id": user_id}),
-                "insurancePremiums": self._run(
-                    """
-                    select ip.* from insurance_premiums ip
-                    join insurances i on i.id = ip.insurance_id
-                    where i.user_id = :user_id
-                    order by ip.created_at
-                    """,
-                    {"user_id": user_id},
-                ),
-                "calendarIntegrations": self._run(
-                    "select * from calendar_integrations where user_id = :user_id order by created_at",
-                    {"user_id": user_id},
-                ),
-                "notificationRules": self._run(
-                    "select * from notification_rules where user_id = :user_id order by created_at",
-                    {"user_id": user_id},
-                ),
-                "notificationDeliveries": self._run(
-                    """
-                    select nd.* from notification_deliveries nd
-                    join notification_rules nr on nr.id = nd.notification_rule_id
-                    where nr.user_id = :user_id
-                    order by nd.created_at
-                    """,
-                    {"user_id": user_id},
-                ),
-                "calendarEvents": self._run(
-                    """
-                    select ce.* from calendar_events ce
-                    join calendar_integrations ci on ci.id = ce.calendar_integration_id
-                    where ci.user_id = :user_id
-                    order by ce.created_at
-                    """,
-                    {"user_id": user_id},
-                ),
-            },
-        }
+    def _stream(self, conn: Connection, sql: str, params: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        # Server-side cursor: rows arrive in batches of BACKUP_STREAM_BATCH instead of one fetchall().
+        result = conn.execution_options(yield_per=BACKUP_STREAM_BATCH).execute(text(sql), params)
+        for row in result:
+            yield dict(row._mapping)
+
+    def export_backup_sections(self, user_id: UUID, changed_since: datetime | None = None) -> Iterator[tuple[str, Any]]:
+        # Runs on its own repeatable-read connection so every section sees one snapshot while rows
+        # are streamed out; it must not join the request's unit of work because it is consumed lazily.
+        app_settings = self.get_app_settings(user_id).model_dump()
+        params = {"user_id": user_id, "since": changed_since}
+        try:
+            with self.engine.connect() as conn:
+                conn = conn.execution_options(isolation_level="REPEATABLE READ")
+                with conn.begin():
+                    yield "appSettings", app_settings
+                    for name, sql, prefix in PG_BACKUP_QUERIES:
+                        changed = f" and {prefix}updated_at > :since" if changed_since is not None and prefix is not None else ""
+                        rows = self._stream(conn, sql.format(changed=changed), params)
+                        if name == "rateWatchlist":
+                            rows = (row["symbol"] for row in rows)
+                        yield name, rows
+        except SQLAlchemyError as exc:
+            raise HTTPException(status_code=500, detail=f"postgres error: {exc.__class__.__name__}") from exc
 
-    def import_backup(self, user_id: UUID, payload: dict[str, Any]) -> dict[str, int]:
-        self._ensure_auth_columns()
-        self._ensure_app_settings_columns()
-        self._ensure_rates_tables()
-        data = payload.get("data", {})
-        with self.engine.begin() as conn:
+    def export_backup_row_ids(self, user_id: UUID) -> Iterator[tuple[str, Any]]:
+        params = {"user_id": user_id}
+        try:
+            with self.engine.connect() as conn:
+                with conn.begin():
+                    for name, sql, prefix in PG_BACKUP_QUERIES:
+                        if prefix is None:
+                            continue
+                        source = sql[sql.index(" from "):].format(changed="")
+                        yield name, (row["id"] for row in self._stream(conn, f"select {prefix}id{source}", params))
+        except SQLAlchemyError as exc:
+            raise HTTPException(status_code=500, detail=f"postgres error: {exc.__class__.__name__}") from exc
+
+    @_unit_of_work
+    def import_backup_sections(self, user_id: UUID, sections: Iterable[tuple[str, Any]]) -> dict[str, Any]:
+        # Sections are loaded parent-before-child (see _in_import_order), list sections in chunks of
+        # BACKUP_IMPORT_CHUNK rows so a streamed upload in export order is never held whole.
+        default_hash = cache(partial(hash_password, "ChangeMe123!"))
+        with self._connection() as conn:
             conn.execute(
                 text("insert into users (id, email) values (:id, :email) on conflict (id) do nothing"),
                 {"id": user_id, "email": "default@local"},
@@ -1569,266 +2552,192 @@ class PostgresPersistence(Persistence):
             for q in cleanup_sql:
                 conn.execute(text(q), {"user_id": user_id})
 
-            users_rows = data.get("users", [])
-            if users_rows:
-                for u in users_rows:
-                    conn.execute(
-                        text(
+            loader = _BulkLoader(conn)
+            rate_symbols: set[str] = set()
+
+            def load_rate_assets(symbols: list[str]) -> None:
+                fresh = [sym for sym in dict.fromkeys(symbols) if sym not in rate_symbols]
+                rate_symbols.update(fresh)
+                loader.copy("rate_assets", ["id", "user_id", "symbol"], [{"id": uuid4(), "user_id": user_id, "symbol": sym} for sym in fresh])
+
+            for name, content in _in_import_order(sections):
+                if name == "appSettings":
+                    if content:
+                        conn.execute(
+                            text(
+                                """
+                                insert into app_settings (
+                                  id, user_id, default_timezone, calendar_provider, calendar_sync_enabled, self_registration_enabled, smtp_enabled,
+                                  default_locale, default_display_currency, secondary_display_currency, auto_backup_enabled, auto_backup_interval_minutes, auto_backup_retention_days, auto_backup_last_run_at,
+                                  session_timeout_minutes
+                                )
+                                values (
+                                  :id, :user_id, :default_timezone, :calendar_provider, :calendar_sync_enabled, :self_registration_enabled, :smtp_enabled,
+                                  :default_locale, :default_display_currency, :secondary_display_currency, :auto_backup_enabled, :auto_backup_interval_minutes, :auto_backup_retention_days, :auto_backup_last_run_at,
+                                  :session_timeout_minutes
+                                )
+                                """
+                            ),
+                            {
+                                "id": str(uuid4()),
+                                "user_id": user_id,
+                                "default_timezone": content.get("defaultTimezone", "Europe/Prague"),
+                                "calendar_provider": content.get("calendarProvider", "google"),
+                                "calendar_sync_enabled": content.get("calendarSyncEnabled", True),
+                                "self_registration_enabled": content.get("selfRegistrationEnabled", True),
+                                "smtp_enabled": content.get("smtpEnabled", False),
+                                "default_locale": content.get("defaultLocale", "en"),
+                                "default_display_currency": content.get("defaultDisplayCurrency", "CZK"),
+                                "secondary_display_currency": content.get("secondaryDisplayCurrency", "USD"),
+                                "auto_backup_enabled": content.get("autoBackupEnabled", False),
+                                "auto_backup_interval_minutes": content.get("autoBackupIntervalMinutes", 1440),
+                                "auto_backup_retention_days": content.get("autoBackupRetentionDays", 30),
+                                "auto_backup_last_run_at": content.get("autoBackupLastRunAt"),
+                                "session_timeout_minutes": content.get("sessionTimeoutMinutes"),
+                            },
+                        )
+                    continue
+                if name == "customLocales" and isinstance(content, dict):
+                    content = (
+                        {"locale": locale, "message_key": key, "message_value": value}
+                        for locale, messages in content.items()
+                        for key, value in (messages or {}).items()
+                    )
+                if not isinstance(content, (list, Iterator)):
+                    continue
+                for chunk in _chunks(content, BACKUP_IMPORT_CHUNK):
+                    if name == "users":
+                        loader.execute_many(
+                            "users",
                             """
                             insert into users (id, email, full_name)
                             values (:id, :email, :full_name)
                             on conflict (id) do update set email = excluded.email, full_name = excluded.full_name, updated_at = now()
-                            """
-                        ),
-                        {
-                            "id": u.get("id", user_id),
-                            "email": u.get("email", "default@local"),
-                            "full_name": u.get("full_name"),
-                        },
-                    )
-
-            for c in data.get("userCredentials", []):
-                conn.execute(
-                    text(
-                        "insert into user_credentials (user_id, password_hash) values (:user_id, :password_hash) on conflict (user_id) do update set password_hash = excluded.password_hash, updated_at = now()"
-                    ),
-                    {"user_id": c.get("user_id", user_id), "password_hash": c.get("password_hash", hash_password("ChangeMe123!"))},
-                )
-
-            app_settings = data.get("appSettings", {})
-            if app_settings:
-                conn.execute(
-                    text(
-                        """
-                        insert into app_settings (
-                          id, user_id, default_timezone, calendar_provider, calendar_sync_enabled, self_registration_enabled, smtp_enabled,
-                          default_locale, default_display_currency, secondary_display_currency, auto_backup_enabled, auto_backup_interval_minutes, auto_backup_retention_days, auto_backup_last_run_at,
-                          session_timeout_minutes
+                            """,
+                            [{"id": u.get("id", user_id), "email": u.get("email", "default@local"), "full_name": u.get("full_name")} for u in chunk],
                         )
-                        values (
-                          :id, :user_id, :default_timezone, :calendar_provider, :calendar_sync_enabled, :self_registration_enabled, :smtp_enabled,
-                          :default_locale, :default_display_currency, :secondary_display_currency, :auto_backup_enabled, :auto_backup_interval_minutes, :auto_backup_retention_days, :auto_backup_last_run_at,
-                          :session_timeout_minutes
+                    elif name == "userCredentials":
+                        loader.execute_many(
+                            "user_credentials",
+                            "insert into user_credentials (user_id, password_hash) values (:user_id, :password_hash) on conflict (user_id) do update set password_hash = excluded.password_hash, updated_at = now()",
+                            [
+                                {"user_id": c.get("user_id", user_id), "password_hash": c["password_hash"] if "password_hash" in c else default_hash()}
+                                for c in chunk
+                            ],
                         )
-                        """
-                    ),
-                    {
-                        "id": str(uuid4()),
-                        "user_id": user_id,
-                        "default_timezone": app_settings.get("defaultTimezone", "Europe/Prague"),
-                        "calendar_provider": app_settings.get("calendarProvider", "google"),
-                        "calendar_sync_enabled": app_settings.get("calendarSyncEnabled", True),
-                        "self_registration_enabled": app_settings.get("selfRegistrationEnabled", True),
-                        "smtp_enabled": app_settings.get("smtpEnabled", False),
-                        "default_locale": app_settings.get("defaultLocale", "en"),
-                        "default_display_currency": app_settings.get("defaultDisplayCurrency", "CZK"),
-                        "secondary_display_currency": app_settings.get("secondaryDisplayCurrency", "USD"),
-                        "auto_backup_enabled": app_settings.get("autoBackupEnabled", False),
-                        "auto_backup_interval_minutes": app_settings.get("autoBackupIntervalMinutes", 1440),
-                        "auto_backup_retention_days": app_settings.get("autoBackupRetentionDays", 30),
-                        "auto_backup_last_run_at": app_settings.get("autoBackupLastRunAt"),
-                        "session_timeout_minutes": app_settings.get("sessionTimeoutMinutes"),
-                    },
-                )
-
-            custom_locales = data.get("customLocales", [])
-            if isinstance(custom_locales, dict):
-                custom_rows: list[dict[str, Any]] = []
-                for locale, messages in custom_locales.items():
-                    for key, value in (messages or {}).items():
-                        custom_rows.append({"locale": locale, "message_key": key, "message_value": value})
-            else:
-                custom_rows = custom_locales
-
-            for row in custom_rows:
-                if isinstance(row, dict) and "locale" in row and "message_key" in row:
-                    conn.execute(
-                        text(
-                            """
-                            insert into locale_custom_messages (id, user_id, locale, message_key, message_value)
-                            values (:id, :user_id, :locale, :message_key, :message_value)
+                    elif name == "customLocales":
+                        loader.copy(
+                            "locale_custom_messages",
+                            ["id", "user_id", "locale", "message_key", "message_value"],
+                            [
+                                {"id": uuid4(), "user_id": user_id, "locale": row["locale"], "message_key": row["message_key"], "message_value": row.get("message_value")}
+                                for row in chunk
+                                if isinstance(row, dict) and "locale" in row and "message_key" in row
+                            ],
+                        )
+                    elif name == "rateWatchlist":
+                        load_rate_assets([str(sym).strip().upper() for sym in chunk if str(sym).strip()])
+                    elif name == "rateSnapshots":
+                        snapshot_rows = [
+                            {
+                                "id": uuid4(),
+                                "user_id": user_id,
+                                "symbol": str(row.get("symbol", "")).strip().upper(),
+                                "price": row.get("price"),
+                                "currency": str(row.get("currency", "USD")).strip().upper(),
+                                "source": str(row.get("source", "manual")).strip().lower(),
+                                "last_updated_at": row.get("updatedAt") or row.get("updated_at") or datetime.utcnow(),
+                            }
+                            for row in chunk
+                            if isinstance(row, dict) and str(row.get("symbol", "")).strip()
+                        ]
+                        load_rate_assets([row["symbol"] for row in snapshot_rows])
+                        loader.execute_many(
+                            "rate_snapshots",
                             """
-                        ),
-                        {
-                            "id": str(uuid4()),
-                            "user_id": user_id,
-                            "locale": row["locale"],
-                            "message_key": row["message_key"],
-                            "message_value": row["message_value"],
-                        },
-                    )
-
-            def insert_rows(table: str, rows: list[dict[str, Any]], cols: list[str], force_user: bool = False) -> None:
-                if not rows:
-                    return
-                col_csv = ", ".join(cols)
-                val_csv = ", ".join(f":{c}" for c in cols)
-                stmt = text(f"insert into {table} ({col_csv}) values ({val_csv})")
-                for r in rows:
-                    params = {c: r.get(c) for c in cols}
-                    if force_user:
-                        params["user_id"] = user_id
-                    conn.execute(stmt, params)
-
-            insert_rows("vehicles", data.get("vehicles", []), ["id", "user_id", "type", "label", "vin", "plate_number", "make", "model", "production_year", "purchased_at", "current_odometer_km", "notes"], True)
-            insert_rows("accounts", data.get("accounts", []), ["id", "user_id", "name", "account_type", "currency", "initial_balance", "initial_balance_at", "current_balance"], True)
-            insert_rows(
-                "transactions",
-                data.get("transactions", []),
-                [
-                    "id",
-                    "user_id",
-                    "account_id",
-                    "amount",
-                    "currency",
-                    "transaction_at",
-                    "direction",
-                    "category",
-                    "note",
-                    "transfer_group_id",
-                    "recurring_group_id",
-                    "recurring_frequency",
-                    "recurring_index",
-                    "recurring_day_of_month",
-                    "recurring_weekend_policy",
-                ],
-                True,
-            )
-            rate_watch = [str(s).strip().upper() for s in data.get("rateWatchlist", []) if str(s).strip()]
-            for sym in rate_watch:
-                conn.execute(
-                    text(
-                        """
-                        insert into rate_assets (id, user_id, symbol, created_at, updated_at)
-                        values (:id, :user_id, :symbol, now(), now())
-                        on conflict (user_id, symbol)
-                        do update set updated_at = now()
-                        """
-                    ),
-                    {"id": str(uuid4()), "user_id": user_id, "symbol": sym},
-                )
-            for row in data.get("rateSnapshots", []):
-                if not isinstance(row, dict):
-                    continue
-                sym = str(row.get("symbol", "")).strip().upper()
-                if not sym:
-                    continue
-                conn.execute(
-                    text(
-                        """
-                        insert into rate_assets (id, user_id, symbol, created_at, updated_at)
-                        values (:id, :user_id, :symbol, now(), now())
-                        on conflict (user_id, symbol)
-                        do update set updated_at = now()
-                        """
-                    ),
-                    {"id": str(uuid4()), "user_id": user_id, "symbol": sym},
-                )
-                conn.execute(
-                    text(
-                        """
-                        insert into rate_snapshots (id, user_id, symbol, price, currency, source, last_updated_at, created_at, updated_at)
-                        values (:id, :user_id, :symbol, :price, :currency, :source, :last_updated_at, now(), now())
-                        on conflict (user_id, symbol)
-                        do update set price = excluded.price, currency = excluded.currency, source = excluded.source, last_updated_at = excluded.last_updated_at, updated_at = now()
-                        """
-                    ),
-                    {
-                        "id": str(uuid4()),
-                        "user_id": user_id,
-                        "symbol": sym,
-                        "price": row.get("price"),
-                        "currency": str(row.get("currency", "USD")).strip().upper(),
-                        "source": str(row.get("source", "manual")).strip().lower(),
-                        "last_updated_at": row.get("updatedAt") or row.get("updated_at") or datetime.utcnow(),
-                    },
-                )
-            insert_rows("vehicle_services", data.get("vehicleServices", []), ["id", "vehicle_id", "service_type", "service_at", "odometer_km", "total_cost", "currency", "vendor", "description", "receipt_url"])
-            insert_rows("vehicle_service_rules", data.get("vehicleServiceRules", []), ["id", "vehicle_id", "service_type", "interval_value", "interval_unit", "lead_days", "last_service_id", "next_due_date", "next_due_odometer_km", "is_active"])
-            insert_rows("properties", data.get("properties", []), ["id", "user_id", "type", "name", "address_line1", "city", "postal_code", "country_code", "acquired_at", "purchase_price", "purchase_currency", "estimated_value", "estimated_value_currency", "estimated_value_updated_at", "floor_area_m2", "land_area_m2", "notes"], True)
-            insert_rows("property_costs", data.get("propertyCosts", []), ["id", "property_id", "cost_type", "period_start", "period_end", "amount", "currency", "provider", "meter_value", "meter_unit", "is_recurring", "recurring_template_id"])
-            insert_rows("insurances", data.get("insurances", []), ["id", "user_id", "insurance_type", "provider", "policy_number", "subject_vehicle_id", "subject_property_id", "coverage_amount", "coverage_currency", "deductible_amount", "deductible_currency", "valid_from", "valid_to", "payment_frequency", "is_active"], True)
-            insert_rows("insurance_premiums", data.get("insurancePremiums", []), ["id", "insurance_id", "period_start", "period_end", "amount", "currency", "paid_at", "payment_transaction_id"])
-            for row in data.get("calendarIntegrations", []):
-                conn.execute(
-                    text(
-                        """
-                        insert into calendar_integrations (id, user_id, provider, external_calendar_id, access_token_encrypted, refresh_token_encrypted, token_expires_at, sync_enabled)
-                        values (:id, :user_id, :provider, :external_calendar_id, :access_token_encrypted, :refresh_token_encrypted, :token_expires_at, :sync_enabled)
-                        """
-                    ),
-                    {
-                        "id": row.get("id", str(uuid4())),
-                        "user_id": user_id,
-                        "provider": row.get("provider", "google"),
-                        "external_calendar_id": row.get("external_calendar_id", row.get("externalCalendarId", "primary")),
-                        "access_token_encrypted": row.get("access_token_encrypted", "imported-token"),
-                        "refresh_token_encrypted": row.get("refresh_token_encrypted", "imported-token"),
-                        "token_expires_at": row.get("token_expires_at"),
-                        "sync_enabled": row.get("sync_enabled", row.get("syncEnabled", True)),
-                    },
-                )
-            insert_rows("notification_rules", data.get("notificationRules", []), ["id", "user_id", "source", "source_entity_id", "title_template", "message_template", "due_at", "lead_days", "channel", "timezone", "is_active"], True)
-            insert_rows("notification_deliveries", data.get("notificationDeliveries", []), ["id", "notification_rule_id", "scheduled_for", "delivered_at", "status", "attempts", "error_message", "provider_message_id"])
-            insert_rows("calendar_events", data.get("calendarEvents", []), ["id", "notification_rule_id", "calendar_integration_id", "provider_event_id", "event_uid", "event_hash", "last_synced_at"])
+                            insert into rate_snapshots (id, user_id, symbol, price, currency, source, last_updated_at, created_at, updated_at)
+                            values (:id, :user_id, :symbol, :price, :currency, :source, :last_updated_at, now(), now())
+                            on conflict (user_id, symbol)
+                            do update set price = excluded.price, currency = excluded.currency, source = excluded.source, last_updated_at = excluded.last_updated_at, updated_at = now()
+                            """,
+                            snapshot_rows,
+                        )
+                    elif name in PG_IMPORT_TABLES:
+                        table, cols, force_user = PG_IMPORT_TABLES[name]
+                        if name == "calendarIntegrations":
+                            chunk = [_calendar_integration_import_row(row) for row in chunk]
+                        loader.copy(table, cols, [{**r, "user_id": user_id} if force_user else r for r in chunk])
+            self._rebuild_balance_days(user_id)
 
-        return self.debug_counts()
+        self._invalidate_app_settings(user_id)
+        return {"counts": self.debug_counts(), "loadStats": loader.stats}
 
+    @_unit_of_work
     def mark_auto_backup_run(self, user_id: UUID, when: datetime) -> None:
         self._run(
             "update app_settings set auto_backup_last_run_at = :when, updated_at = now() where user_id = :user_id",
             {"when": when, "user_id": user_id},
         )
+        self._invalidate_app_settings(user_id)
 
-    def register_user(self, email: str, password: str, full_name: str | None) -> dict[str, Any]:
-        self._ensure_auth_columns()
-        exists = self._run("select id from users where lower(email) = lower(:email) limit 1", {"email": email})
-        if exists:
-            raise HTTPException(status_code=409, detail="email already registered")
+    @_unit_of_work
+    def register_user(self, email: str, password_hash: str, full_name: str | None) -> dict[str, Any]:
+        email = _normalize_email(email)
         user_id = uuid4()
-        self._run(
-            "insert into users (id, email, full_name) values (:id, :email, :full_name)",
-            {"id": user_id, "email": email, "full_name": full_name},
-        )
+        params = {"id": user_id, "email": email, "full_name": full_name}
+        if self._email_index_ready:
+            # uq_users_email_lower arbitrates duplicates, so registration is one probe-free insert.
+            inserted = self._run(
+                """
+                insert into users (id, email, full_name) values (:id, :email, :full_name)
+                on conflict ((lower(email))) do nothing
+                returning id
+                """,
+                params,
+            )
+        elif self._run("select 1 as ok from users where lower(email) = :email limit 1", {"email": email}):
+            inserted = []
+        else:
+            # Without the index there is no conflict target for ON CONFLICT, so the probe above decides.
+            inserted = self._run("insert into users (id, email, full_name) values (:id, :email, :full_name) returning id", params)
+        if not inserted:
+            raise HTTPException(status_code=409, detail="email already registered")
         self._run(
             "insert into user_credentials (user_id, password_hash) values (:user_id, :password_hash)",
-            {"user_id": user_id, "password_hash": hash_password(password)},
+            {"user_id": user_id, "password_hash": password_hash},
         )
         return {"id": user_id, "email": email, "full_name": full_name}
 
-    def authenticate_user(self, email: str, password: str) -> dict[str, Any] | None:
-        self._ensure_auth_columns()
+    @_unit_of_work
+    def get_login_credentials(self, email: str) -> dict[str, Any] | None:
         rows = self._run(
             """
             select u.id, u.email, u.full_name, c.password_hash
             from users u
             join user_credentials c on c.user_id = u.id
-            where lower(u.email) = lower(:email)
+            where lower(u.email) = :email
             limit 1
             """,
-            {"email": email},
+            {"email": _normalize_email(email)},
         )
-        if not rows:
-            return None
-        row = rows[0]
-        if not verify_password(password, row["password_hash"]):
-            return None
-        return {"id": row["id"], "email": row["email"], "full_name": row["full_name"]}
+        return rows[0] if rows else None
 
+    @_unit_of_work
     def get_user_by_id(self, user_id: UUID) -> dict[str, Any] | None:
         rows = self._run("select id, email, full_name from users where id = :id limit 1", {"id": user_id})
         return rows[0] if rows else None
 
+    @_unit_of_work
     def update_user_profile(self, user_id: UUID, email: str | None, full_name: str | None) -> dict[str, Any]:
         row = self.get_user_by_id(user_id)
         if row is None:
             raise HTTPException(status_code=404, detail="user not found")
-        new_email = row["email"] if email is None else email
+        new_email = row["email"] if email is None else _normalize_email(email)
         new_full_name = row.get("full_name") if full_name is None else full_name
         if email is not None:
             exists = self._run(
-                "select id from users where lower(email) = lower(:email) and id <> :id limit 1",
-                {"email": email, "id": user_id},
+                "select id from users where lower(email) = :email and id <> :id limit 1",
+                {"email": new_email, "id": user_id},
             )
             if exists:
                 raise HTTPException(status_code=409, detail="email already registered")
@@ -1838,20 +2747,20 @@ class PostgresPersistence(Persistence):
         )
         return updated[0]
 
-    def change_user_password(self, user_id: UUID, current_password: str, new_password: str) -> None:
-        self._ensure_auth_columns()
-        row = self._run("select password_hash from user_credentials where user_id = :id limit 1", {"id": user_id})
-        if not row:
-            raise HTTPException(status_code=404, detail="credentials not found")
-        if not verify_password(current_password, row[0]["password_hash"]):
-            raise HTTPException(status_code=401, detail="invalid current password")
+    @_unit_of_work
+    def get_password_hash(self, user_id: UUID) -> str | None:
+        rows = self._run("select password_hash from user_credentials where user_id = :id limit 1", {"id": user_id})
+        return rows[0]["password_hash"] if rows else None
+
+    @_unit_of_work
+    def set_password_hash(self, user_id: UUID, password_hash: str) -> None:
         self._run(
             "update user_credentials set password_hash = :password_hash, updated_at = now() where user_id = :id",
-            {"id": user_id, "password_hash": hash_password(new_password)},
+            {"id": user_id, "password_hash": password_hash},
         )
 
+    @_unit_of_work
     def create_account(self, user_id: UUID, payload: AccountCreate) -> dict[str, Any]:
-        self._ensure_auth_columns()
         initial_balance_at = payload.initialBalanceAt or datetime.utcnow()
         row = self._run(
             """
@@ -1872,6 +2781,7 @@ class PostgresPersistence(Persistence):
         )[0]
         return row
 
+    @_unit_of_work
     def list_accounts(self, user_id: UUID) -> list[dict[str, Any]]:
         return self._run(
             """
@@ -1883,71 +2793,188 @@ class PostgresPersistence(Persistence):
             {"user_id": user_id},
         )
 
+    @_unit_of_work
     def create_transaction(self, user_id: UUID, payload: TransactionCreate) -> dict[str, Any]:
-        self._ensure_auth_columns()
         account = self._run("select id from accounts where id = :id and user_id = :user_id limit 1", {"id": payload.accountId, "user_id": user_id})
         if not account:
             raise HTTPException(status_code=404, detail=f"account not found: {payload.accountId}")
-        recurring_group_id = str(uuid4()) if payload.recurringFrequency else None
+        recurring_group_id = uuid4() if payload.recurringFrequency else None
         day_anchor = payload.recurringDayOfMonth or payload.occurredAt.day
         weekend_policy = payload.recurringWeekendPolicy or "exact"
-        first: dict[str, Any] | None = None
-        for idx in range(payload.recurringCount):
-            tx_time = (
-                _move_from_weekend(payload.occurredAt, weekend_policy)
-                if not payload.recurringFrequency
-                else _shift_recurring(payload.occurredAt, payload.recurringFrequency, idx, day_anchor, weekend_policy)
-            )
-            row = self._run(
-                """
+        schedule = _transaction_schedule(payload, day_anchor, weekend_policy)
+        ids = [uuid4() for _ in schedule]
+        # The whole series goes in as one INSERT ... SELECT FROM unnest(...), followed by one balance update.
+        rows = self._run(
+            """
+            with inserted as (
                 insert into transactions (
                   id, user_id, account_id, amount, currency, transaction_at, direction, category, note,
                   transfer_group_id, recurring_group_id, recurring_frequency, recurring_index, recurring_day_of_month, recurring_weekend_policy
                 )
-                values (
-                  :id, :user_id, :account_id, :amount, :currency, :transaction_at, :direction, :category, :note,
-                  null, :recurring_group_id, :recurring_frequency, :recurring_index, :recurring_day_of_month, :recurring_weekend_policy
-                )
+                select s.id, cast(:user_id as uuid), cast(:account_id as uuid), cast(:amount as numeric), cast(:currency as text),
+                       s.transaction_at, cast(:direction as text), cast(:category as text), cast(:note as text),
+                       null, cast(:recurring_group_id as uuid), cast(:recurring_frequency as text), s.recurring_index,
+                       cast(:recurring_day_of_month as integer), cast(:recurring_weekend_policy as text)
+                from unnest(cast(:ids as uuid[]), cast(:times as timestamptz[]), cast(:indexes as integer[]))
+                  as s(id, transaction_at, recurring_index)
                 returning id, account_id, direction, amount, currency, transaction_at, category, note,
                           transfer_group_id, recurring_group_id, recurring_frequency, recurring_index, recurring_day_of_month, recurring_weekend_policy
-                """,
-                {
-                    "id": str(uuid4()),
-                    "user_id": user_id,
-                    "account_id": payload.accountId,
-                    "amount": _to_float(payload.amount),
-                    "currency": payload.currency,
-                    "transaction_at": tx_time,
-                    "direction": payload.direction,
-                    "category": payload.category,
-                    "note": payload.note,
-                    "recurring_group_id": recurring_group_id,
-                    "recurring_frequency": payload.recurringFrequency,
-                    "recurring_index": idx + 1 if payload.recurringFrequency else None,
-                    "recurring_day_of_month": day_anchor if payload.recurringFrequency in {"monthly", "yearly"} else None,
-                    "recurring_weekend_policy": weekend_policy if payload.recurringFrequency else None,
-                },
-            )[0]
-            self._run(
-                "update accounts set current_balance = current_balance + :delta, updated_at = now() where id = :id",
-                {"delta": _to_float(payload.amount * _tx_sign(payload.direction)), "id": payload.accountId},
             )
-            if first is None:
-                first = row
-        return first or {}
-
-    def list_transactions(self, user_id: UUID) -> list[dict[str, Any]]:
-        return self._run(
-            """
+            select * from inserted where id = :first_id
+            """,
+            {
+                "ids": ids,
+                "times": schedule,
+                "indexes": [idx + 1 if payload.recurringFrequency else None for idx in range(len(schedule))],
+                "first_id": ids[0],
+                "user_id": user_id,
+                "account_id": payload.accountId,
+                "amount": _to_float(payload.amount),
+                "currency": payload.currency,
+                "direction": payload.direction,
+                "category": payload.category,
+                "note": payload.note,
+                "recurring_group_id": recurring_group_id,
+                "recurring_frequency": payload.recurringFrequency,
+                "recurring_day_of_month": day_anchor if payload.recurringFrequency in {"monthly", "yearly"} else None,
+                "recurring_weekend_policy": weekend_policy if payload.recurringFrequency else None,
+            },
+        )
+        self._run(
+            "update accounts set current_balance = current_balance + :delta, updated_at = now() where id = :id",
+            {"delta": _to_float(payload.amount * _tx_sign(payload.direction) * len(schedule)), "id": payload.accountId},
+        )
+        self._shift_balance_days((payload.accountId, _utc_day(moment), payload.amount * _tx_sign(payload.direction)) for moment in schedule)
+        return rows[0] if rows else {}
+
+    @_unit_of_work
+    def list_transactions(self, user_id: UUID, query: TransactionListQuery | None = None) -> dict[str, Any]:
+        query = query or TransactionListQuery()
+        clauses = ["user_id = :user_id"]
+        params: dict[str, Any] = {"user_id": user_id, "limit": query.limit + 1}
+        if query.accountId:
+            clauses.append("account_id = :account_id")
+            params["account_id"] = query.accountId
+        if query.direction:
+            clauses.append("direction = :direction")
+            params["direction"] = query.direction
+        if query.category:
+            clauses.append("category = :category")
+            params["category"] = query.category
+        if query.occurredFrom:
+            clauses.append("transaction_at >= :occurred_from")
+            params["occurred_from"] = query.occurredFrom
+        if query.occurredTo:
+            clauses.append("transaction_at <= :occurred_to")
+            params["occurred_to"] = query.occurredTo
+        if query.cursor:
+            cursor_at, cursor_id = _decode_tx_cursor(query.cursor)
+            # Keyset pagination on (transaction_at, id), served by idx_transactions_user_time.
+            clauses.append("(transaction_at, id) < (:cursor_at, :cursor_id)")
+            params["cursor_at"] = cursor_at
+            params["cursor_id"] = cursor_id
+        rows = self._run(
+            f"""
             select id, account_id, direction, amount, currency, transaction_at, category, note,
                    transfer_group_id, recurring_group_id, recurring_frequency, recurring_index, recurring_day_of_month, recurring_weekend_policy
             from transactions
+            where {" and ".join(clauses)}
+            order by transaction_at desc, id desc
+            limit :limit
+            """,
+            params,
+        )
+        return _tx_page(rows, query.limit)
+
+    @_unit_of_work
+    def get_dashboard_summary(self, user_id: UUID, period: DashboardPeriod) -> dict[str, Any]:
+        today = datetime.now(timezone.utc).date()
+        start = _dashboard_range_start(period, today)
+        month_start, month_end = _month_bounds(today)
+        stats_rows = self._run(
+            """
+            select account_id,
+                   sum(case when direction = 'income' then amount else -amount end) as net,
+                   coalesce(sum(case when direction = 'income' then amount else -amount end)
+                            filter (where transaction_at < :start_at), 0) as net_before,
+                   coalesce(sum(amount) filter (where direction = 'income'), 0) as income,
+                   coalesce(sum(amount) filter (where direction = 'expense'), 0) as expense,
+                   min(transaction_at) as first_at
+            from transactions
             where user_id = :user_id
-            order by transaction_at desc
+            group by account_id
             """,
-            {"user_id": user_id},
+            {"user_id": user_id, "start_at": _utc_midnight(start) if start else None},
+        )
+        if start is None:
+            first_days = [_utc_day(row["first_at"]) for row in stats_rows if row["first_at"] is not None]
+            start = min(min(first_days, default=today), today)
+        range_params = {
+            "user_id": user_id,
+            "start": start,
+            "end": today,
+            "start_at": _utc_midnight(start),
+            "end_at": _utc_midnight(today + timedelta(days=1)),
+        }
+        day_rows = self._run(
+            """
+            with daily as (
+                select account_id,
+                       (transaction_at at time zone 'UTC')::date as day,
+                       coalesce(sum(amount) filter (where direction = 'income'), 0) as income,
+                       coalesce(sum(amount) filter (where direction = 'expense'), 0) as expense
+                from transactions
+                where user_id = :user_id
+                group by account_id, (transaction_at at time zone 'UTC')::date
+            ), running as (
+                select account_id, day, income, expense,
+                       sum(income - expense) over (partition by account_id order by day) as cumulative
+                from daily
+            )
+            select account_id, day, income, expense, cumulative
+            from running
+            where day between :start and :end
+            order by account_id, day
+            """,
+            range_params,
+        )
+        month_rows = self._run(
+            """
+            select coalesce(sum(amount) filter (where direction = 'income'), 0) as income,
+                   coalesce(sum(amount) filter (where direction = 'expense'), 0) as expense
+            from transactions
+            where user_id = :user_id and transaction_at >= :month_start and transaction_at < :month_end
+            """,
+            {"user_id": user_id, "month_start": _utc_midnight(month_start), "month_end": _utc_midnight(month_end)},
+        )
+        category_rows = self._run(
+            """
+            select trim(category) as category, sum(amount) as amount
+            from transactions
+            where user_id = :user_id and direction = 'expense' and coalesce(trim(category), '') <> ''
+              and transaction_at >= :start_at and transaction_at < :end_at
+            group by trim(category)
+            order by amount desc, lower(trim(category))
+            limit :limit
+            """,
+            {**range_params, "limit": DASHBOARD_TOP_CATEGORIES},
+        )
+        account_days: dict[Any, list[dict[str, Any]]] = {}
+        for row in day_rows:
+            account_days.setdefault(row["account_id"], []).append(row)
+        month = month_rows[0] if month_rows else {"income": 0, "expense": 0}
+        return _dashboard_summary(
+            period,
+            start,
+            today,
+            self.list_accounts(user_id),
+            {row["account_id"]: row for row in stats_rows},
+            account_days,
+            {"month": month_start.strftime("%Y-%m"), "income": month["income"], "expense": month["expense"]},
+            category_rows,
         )
 
+    @_unit_of_work
     def update_account(self, user_id: UUID, account_id: UUID, payload: AccountUpdate) -> dict[str, Any]:
         current = self._run(
             "select id, name, account_type, currency, initial_balance, initial_balance_at, current_balance, created_at from accounts where id = :id and user_id = :user_id limit 1",
@@ -1998,6 +3025,7 @@ class PostgresPersistence(Persistence):
         )[0]
         return row
 
+    @_unit_of_work
     def delete_account(self, user_id: UUID, account_id: UUID, action: AccountDeleteAction, target_account_id: UUID | None = None) -> None:
         source_rows = self._run(
             "select id, current_balance from accounts where id = :id and user_id = :user_id limit 1",
@@ -2016,13 +3044,79 @@ class PostgresPersistence(Persistence):
             )
             if not target:
                 raise HTTPException(status_code=404, detail=f"account not found: {target_account_id}")
+            # Folded into the target's opening balance so current_balance stays initial_balance + transactions.
             self._run(
-                "update accounts set current_balance = current_balance + :delta, updated_at = now() where id = :id and user_id = :user_id",
+                """
+                update accounts
+                set initial_balance = initial_balance + :delta, current_balance = current_balance + :delta, updated_at = now()
+                where id = :id and user_id = :user_id
+                """,
                 {"delta": source_rows[0]["current_balance"], "id": target_account_id, "user_id": user_id},
             )
         self._run("delete from transactions where account_id = :account_id and user_id = :user_id", {"account_id": account_id, "user_id": user_id})
         self._run("delete from accounts where id = :id and user_id = :user_id", {"id": account_id, "user_id": user_id})
 
+    @_unit_of_work
+    def get_account_balance_at(self, user_id: UUID, account_id: UUID, day: date) -> dict[str, Any]:
+        # One primary-key probe for the latest ledger day on or before the date.
+        rows = self._run(
+            """
+            select a.id, a.currency, a.initial_balance + coalesce((
+                select b.closing_net from account_balance_days b
+                where b.account_id = a.id and b.day <= :day
+                order by b.day desc
+                limit 1
+            ), 0) as balance
+            from accounts a
+            where a.id = :id and a.user_id = :user_id
+            """,
+            {"id": account_id, "user_id": user_id, "day": day},
+        )
+        if not rows:
+            raise HTTPException(status_code=404, detail=f"account not found: {account_id}")
+        return rows[0]
+
+    @_unit_of_work
+    def get_account_balance_series(self, user_id: UUID, account_id: UUID, start: date, end: date, bucket: BalanceSeriesBucket) -> dict[str, Any]:
+        # Opening and bucket balances both come from account_balance_days: a bucket closes at the running
+        # net of its last ledger day, so no transaction rows are read.
+        account = self.get_account_balance_at(user_id, account_id, start - timedelta(days=1))
+        rows = self._run(
+            """
+            select date_trunc(:bucket, b.day)::date as bucket_start,
+                   a.initial_balance + (array_agg(b.closing_net order by b.day desc))[1] as balance
+            from account_balance_days b
+            join accounts a on a.id = b.account_id
+            where b.account_id = :account_id and b.day between :start and :end
+            group by 1, a.initial_balance
+            order by 1
+            """,
+            {"bucket": bucket.value, "account_id": account_id, "start": start, "end": end},
+        )
+        opening = Decimal(str(account["balance"]))
+        closings = {row["bucket_start"]: Decimal(str(row["balance"])) for row in rows}
+        return {"currency": account["currency"], "opening": opening, "points": _balance_series(opening, closings, _series_bucket_starts(start, end, bucket))}
+
+    @_unit_of_work
+    def reconcile_account_balances(self) -> dict[str, int]:
+        ledgers = self._rebuild_balance_days()
+        fixed = self._run(
+            """
+            update accounts a
+            set current_balance = a.initial_balance + coalesce(l.closing_net, 0), updated_at = now()
+            from accounts a2
+            left join (
+                select distinct on (account_id) account_id, closing_net
+                from account_balance_days
+                order by account_id, day desc
+            ) l on l.account_id = a2.id
+            where a.id = a2.id and a.current_balance <> a2.initial_balance + coalesce(l.closing_net, 0)
+            returning a.id
+            """
+        )
+        return {"ledgers": ledgers, "accounts": len(fixed)}
+
+    @_unit_of_work
     def update_transaction(self, user_id: UUID, transaction_id: UUID, payload: TransactionUpdate) -> dict[str, Any]:
         current = self._run(
             """
@@ -2082,6 +3176,12 @@ class PostgresPersistence(Persistence):
                 "note": merged.get("note"),
             },
         )[0]
+        self._shift_balance_days(
+            [
+                (original_account_id, _utc_day(current[0]["transaction_at"]), -old_delta),
+                (row["account_id"], _utc_day(row["transaction_at"]), new_delta),
+            ]
+        )
         if original_account_id != row["account_id"]:
             self._run(
                 "update accounts set current_balance = current_balance - :delta, updated_at = now() where id = :id and user_id = :user_id",
@@ -2098,9 +3198,10 @@ class PostgresPersistence(Persistence):
         )
         return row
 
+    @_unit_of_work
     def delete_transaction(self, user_id: UUID, transaction_id: UUID) -> None:
         current = self._run(
-            "select id, account_id, direction, amount from transactions where id = :id and user_id = :user_id limit 1",
+            "select id, account_id, direction, amount, transaction_at from transactions where id = :id and user_id = :user_id limit 1",
             {"id": transaction_id, "user_id": user_id},
         )
         if not current:
@@ -2112,9 +3213,10 @@ class PostgresPersistence(Persistence):
             "update accounts set current_balance = current_balance - :delta, updated_at = now() where id = :id and user_id = :user_id",
             {"delta": _to_float(delta), "id": row["account_id"], "user_id": user_id},
         )
+        self._shift_balance_days([(row["account_id"], _utc_day(row["transaction_at"]), -delta)])
 
+    @_unit_of_work
     def transfer_between_accounts(self, user_id: UUID, payload: TransactionTransferCreate) -> dict[str, Any]:
-        self._ensure_auth_columns()
         from_account = self._run(
             "select id from accounts where id = :id and user_id = :user_id limit 1",
             {"id": payload.fromAccountId, "user_id": user_id},
@@ -2186,8 +3288,11 @@ class PostgresPersistence(Persistence):
             "update accounts set current_balance = current_balance + :delta, updated_at = now() where id = :id and user_id = :user_id",
             {"delta": _to_float(payload.amount), "id": payload.toAccountId, "user_id": user_id},
         )
+        day = _utc_day(payload.occurredAt)
+        self._shift_balance_days([(payload.fromAccountId, day, -payload.amount), (payload.toAccountId, day, payload.amount)])
         return {"transferGroupId": UUID(transfer_group_id), "outgoing": outgoing, "incoming": incoming}
 
+    @_unit_of_work
     def list_transaction_category_stats(self, user_id: UUID) -> TransactionCategoryStatsResponse:
         rows = self._run(
             """
@@ -2203,6 +3308,7 @@ class PostgresPersistence(Persistence):
         most_used = categories[0]["category"] if categories else None
         return TransactionCategoryStatsResponse(mostUsedCategory=most_used, categories=categories)
 
+    @_unit_of_work
     def rename_transaction_category(self, user_id: UUID, category: str, payload: TransactionCategoryRename) -> TransactionCategoryStatsResponse:
         old_category = category.strip()
         if not old_category:
@@ -2220,13 +3326,14 @@ class PostgresPersistence(Persistence):
             raise HTTPException(status_code=404, detail=f"category not found: {category}")
         return self.list_transaction_category_stats(user_id)
 
+    @_unit_of_work
     def delete_transaction_category(self, user_id: UUID, category: str, delete_transactions: bool) -> TransactionCategoryStatsResponse:
         name = category.strip()
         if not name:
             raise HTTPException(status_code=400, detail="category must not be empty")
         rows = self._run(
             """
-            select id, account_id, direction, amount
+            select id, account_id, direction, amount, transaction_at
             from transactions
             where user_id = :user_id and category = :category
             """,
@@ -2242,6 +3349,9 @@ class PostgresPersistence(Persistence):
                     {"delta": _to_float(delta), "id": row["account_id"], "user_id": user_id},
                 )
             self._run("delete from transactions where user_id = :user_id and category = :category", {"user_id": user_id, "category": name})
+            self._shift_balance_days(
+                (row["account_id"], _utc_day(row["transaction_at"]), -Decimal(str(row["amount"])) * _tx_sign(row["direction"])) for row in rows
+            )
         else:
             self._run(
                 "update transactions set category = null, updated_at = now() where user_id = :user_id and category = :category",
@@ -2249,12 +3359,49 @@ class PostgresPersistence(Persistence):
             )
         return self.list_transaction_category_stats(user_id)
 
+    @_unit_of_work
     def delete_user(self, user_id: UUID) -> None:
-        self._ensure_auth_columns()
         self._run("delete from users where id = :id", {"id": user_id})
+        self._invalidate_app_settings(user_id)
 
 
 def get_persistence() -> Persistence:
     if settings.storage_backend == "postgres":
         return PostgresPersistence(settings.database_url, settings.default_user_id)
     return InMemoryPersistence()
+
+
+class AsyncPersistence:
+    # Awaitable facade over a Persistence backend. Blocking backends run on a thread pool sized to
+    # the connection pool so the event loop keeps serving other requests; in-memory calls stay inline.
+    def __init__(self, backend: Persistence, max_workers: int | None = None) -> None:
+        self.backend = backend
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="persistence") if max_workers else None
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.backend, name)
+        if not callable(attr):
+            return attr
+
+        @wraps(attr)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            if self._executor is None:
+                return attr(*args, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, partial(attr, *args, **kwargs))
+
+        return call
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+def get_async_persistence() -> AsyncPersistence:
+    backend = get_persistence()
+    max_workers = settings.db_pool_size if isinstance(backend, PostgresPersistence) else None
+    return AsyncPersistence(backend, max_workers)
@@ -455,6 +455,38 @@ class RatesRefreshResponse(BaseModel):
     snapshots: dict[str, RateSnapshotItem]
 
 
+class RateHistoryBucket(str, Enum):
+    raw = "raw"
+    day = "day"
+    week = "week"
+
+
+class RateHistoryPoint(BaseModel):
+    bucketStart: datetime
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    samples: int
+
+
+class RateHistoryResponse(BaseModel):
+    symbol: str
+    bucket: RateHistoryBucket
+    currency: str | None = None
+    points: list[RateHistoryPoint]
+
+
+class RateCacheStatsResponse(BaseModel):
+    entries: int
+    hits: int
+    staleHits: int
+    misses: int
+    upstreamCalls: int
+    ttlSeconds: int
+    staleSeconds: int
+
+
 class LocaleListResponse(BaseModel):
     locales: list[str]
 
@@ -470,15 +502,47 @@ class LocalePublishResponse(BaseModel):
     keys: int
 
 
+class BackupTableLoad(BaseModel):
+    table: str
+    rows: int
+    seconds: float
+    rowsPerSecond: int
+
+
 class BackupImportResponse(BaseModel):
     replaced: bool
     counts: dict[str, int]
+    loadStats: list[BackupTableLoad] = Field(default_factory=list)
 
 
 class BackupRunResponse(BaseModel):
     created: bool
     file: str
     timestamp: datetime
+    kind: str = "full"
+
+
+class BackupJobResponse(BaseModel):
+    id: str
+    status: str
+    trigger: str
+    kind: str | None = None
+    file: str | None = None
+    section: str | None = None
+    rowsWritten: int = 0
+    createdAt: datetime
+    startedAt: datetime | None = None
+    finishedAt: datetime | None = None
+    error: str | None = None
+
+
+class BackupFileInfo(BaseModel):
+    file: str
+    kind: str
+    base: str
+    sequence: int
+    startedAt: datetime | None = None
+    sizeBytes: int
 
 
 class RegisterRequest(BaseModel):
@@ -566,6 +630,35 @@ class AccountResponse(BaseModel):
     createdAt: datetime
 
 
+class AccountBalanceAtResponse(BaseModel):
+    accountId: UUID
+    at: date
+    currency: str
+    balance: Decimal
+
+
+class BalanceSeriesBucket(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class BalanceSeriesPoint(BaseModel):
+    bucketStart: date
+    balance: Decimal
+    change: Decimal
+
+
+class AccountBalanceSeriesResponse(BaseModel):
+    accountId: UUID
+    currency: str
+    bucket: BalanceSeriesBucket
+    fromDate: date
+    toDate: date
+    openingBalance: Decimal
+    points: list[BalanceSeriesPoint]
+
+
 class AccountUpdate(BaseModel):
     name: Optional[str] = Field(default=None, min_length=1, max_length=120)
     accountType: Optional[str] = Field(default=None, min_length=1, max_length=50)
@@ -661,6 +754,40 @@ class TransactionResponse(BaseModel):
     recurringWeekendPolicy: Optional[str] = None
 
 
+class TransactionListQuery(BaseModel):
+    accountId: Optional[UUID] = None
+    direction: Optional[str] = None
+    category: Optional[str] = None
+    occurredFrom: Optional[datetime] = None
+    occurredTo: Optional[datetime] = None
+    limit: int = Field(default=100, ge=1, le=500)
+    cursor: Optional[str] = None
+
+    @field_validator("direction")
+    @classmethod
+    def validate_direction(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return value
+        v = value.lower().strip()
+        if v not in {"income", "expense"}:
+            raise ValueError("direction must be income or expense")
+        return v
+
+    @field_validator("category")
+    @classmethod
+    def validate_category(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return value
+        v = value.strip()
+        return v or None
+
+    @model_validator(mode="after")
+    def validate_range(self) -> "TransactionListQuery":
+        if self.occurredFrom and self.occurredTo and self.occurredTo < self.occurredFrom:
+            raise ValueError("occurredTo must be >= occurredFrom")
+        return self
+
+
 class TransactionUpdate(BaseModel):
     accountId: Optional[UUID] = None
     direction: Optional[str] = None
@@ -735,6 +862,70 @@ class TransactionCategoryRename(BaseModel):
     newCategory: str = Field(min_length=1, max_length=100)
 
 
+class DashboardPeriod(str, Enum):
+    week = "week"
+    month = "month"
+    quarter = "quarter"
+    year = "year"
+    all = "all"
+
+
+class DashboardSeriesPoint(BaseModel):
+    day: date
+    balance: Decimal
+    income: Decimal
+    expense: Decimal
+
+
+class DashboardAccountSummary(BaseModel):
+    accountId: UUID
+    income: Decimal
+    expense: Decimal
+    balanceSeries: list[DashboardSeriesPoint]
+
+
+class DashboardCategoryTotal(BaseModel):
+    category: str
+    amount: Decimal
+
+
+class DashboardMonthTotals(BaseModel):
+    month: str
+    income: Decimal
+    expense: Decimal
+
+
+class DashboardSummaryResponse(BaseModel):
+    period: DashboardPeriod
+    rangeStart: date
+    rangeEnd: date
+    bucketDays: int
+    totalBalance: Decimal
+    periodIncome: Decimal
+    periodExpense: Decimal
+    balanceSeries: list[DashboardSeriesPoint]
+    accounts: list[DashboardAccountSummary]
+    monthTotals: DashboardMonthTotals
+    topExpenseCategories: list[DashboardCategoryTotal]
+
+
+class NetWorthAccountValue(BaseModel):
+    accountId: UUID
+    name: str
+    currency: str
+    balance: Decimal
+    values: dict[str, Optional[Decimal]]
+
+
+class NetWorthResponse(BaseModel):
+    currencies: list[str]
+    totals: dict[str, Decimal]
+    accounts: list[NetWorthAccountValue]
+    missingRates: list[str]
+    ratesAsOf: Optional[datetime] = None
+    computedAt: datetime
+
+
 class AccountDeleteAction(str, Enum):
     transfer_balance = "transfer_balance"
     delete_transactions = "delete_transactions"
@@ -0,0 +1,406 @@
+import codecs
+import gzip
+import io
+import json
+import re
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, BinaryIO
+from uuid import UUID
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for BACKUP_COMPRESSION=zstd
+    zstandard = None
+
+READ_CHUNK_BYTES = 64 * 1024
+BACKUP_PREFIX = "my-finance-backup-"
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# Incrementals re-read rows changed shortly before the parent started, so rows committed while the
+# parent was being exported are not missed because of clock skew or long transactions.
+INCREMENTAL_OVERLAP = timedelta(minutes=5)
+# Raised while reading a damaged or non-JSON backup (bad gzip/zstd stream, truncated or invalid JSON).
+BACKUP_READ_ERRORS: tuple[type[Exception], ...] = (json.JSONDecodeError, UnicodeDecodeError, OSError, EOFError) + (
+    (zstandard.ZstdError,) if zstandard is not None else ()
+)
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _json_default(value: Any) -> Any:
+    # Mirrors fastapi.encoders.jsonable_encoder for the types stored in backup rows.
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+def _iter_json_object(sections: Iterable[tuple[str, Any]]) -> Iterator[str]:
+    yield "{"
+    for index, (name, content) in enumerate(sections):
+        yield ("," if index else "") + "\n" + _dumps(name) + ": "
+        if isinstance(content, dict):
+            yield _dumps(content)
+            continue
+        yield "["
+        for row_index, row in enumerate(content):
+            yield ("," if row_index else "") + "\n  " + _dumps(row)
+        yield "\n]"
+    yield "\n}"
+
+
+def iter_backup_json(
+    meta: dict[str, Any],
+    sections: Iterable[tuple[str, Any]],
+    present: Iterable[tuple[str, Any]] | None = None,
+) -> Iterator[str]:
+    # Emits {"meta": ..., "data": {...}} one row at a time; dict sections are written whole.
+    # Incremental backups add "present": the ids of every tracked row, so restore can drop deletions.
+    yield '{"meta": ' + _dumps(meta) + ', "data": '
+    yield from _iter_json_object(sections)
+    if present is not None:
+        yield ', "present": '
+        yield from _iter_json_object(present)
+    yield "}\n"
+
+
+def compression_suffix(compression: str) -> str:
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"unsupported backup compression: {compression}")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd backup compression requires the zstandard package")
+    return COMPRESSION_SUFFIXES[compression]
+
+
+@contextmanager
+def _open_for_write(path: Path, suffix: str) -> Iterator[IO[str]]:
+    if suffix == ".gz":
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as handle:
+            yield handle
+    elif suffix == ".zst":
+        with path.open("wb") as raw, zstandard.ZstdCompressor().stream_writer(raw) as writer:
+            with io.TextIOWrapper(writer, encoding="utf-8") as handle:
+                yield handle
+    else:
+        with path.open("w", encoding="utf-8") as handle:
+            yield handle
+
+
+def write_backup_file(
+    path: Path,
+    meta: dict[str, Any],
+    sections: Iterable[tuple[str, Any]],
+    present: Iterable[tuple[str, Any]] | None = None,
+) -> None:
+    # Compression follows the file suffix (.gz / .zst); the file only appears once fully written.
+    tmp_path = path.with_name(path.name + ".tmp")
+    with _open_for_write(tmp_path, path.suffix) as handle:
+        for chunk in iter_backup_json(meta, sections, present):
+            handle.write(chunk)
+    tmp_path.replace(path)
+
+
+def decompressed(handle: BinaryIO) -> BinaryIO:
+    # Sniffs the magic bytes, so uploads and stored files may be plain, gzip or zstd JSON.
+    head = handle.read(4)
+    handle.seek(0)
+    if head.startswith(GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=handle, mode="rb")
+    if head.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError("zstd backup compression requires the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(handle)
+    return handle
+
+
+class _JsonReader:
+    # Pull parser over a binary stream: structural characters are walked by hand and every scalar,
+    # row or small object is decoded with raw_decode, so only the current value sits in memory.
+    def __init__(self, handle: BinaryIO) -> None:
+        self.handle = handle
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int = 0) -> bool:
+        if self.eof:
+            return False
+        chunk = self.handle.read(max(size, READ_CHUNK_BYTES))
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(chunk, final=self.eof)
+        self.pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Probably cut off at the buffer end; read at least as much again and retry.
+                if not self._fill(len(self.buffer) - self.pos):
+                    raise
+                continue
+            if end == len(self.buffer) and self._fill():
+                # A number such as 12 may continue as 123 in the next chunk.
+                continue
+            self.pos = end
+            return value
+
+    def _separator(self, close: str) -> bool:
+        char = self.peek()
+        self.pos += 1
+        if char == ",":
+            return True
+        if char == close:
+            return False
+        self.pos -= 1
+        raise self._error(f"Expecting ',' or '{close}'")
+
+    def keys(self) -> Iterator[str]:
+        # The caller reads (or skips) each key's value before asking for the next key.
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name enclosed in double quotes")
+            self.expect(":")
+            yield key
+            if not self._separator("}"):
+                return
+
+    def items(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if not self._separator("]"):
+                return
+
+
+def read_backup_meta(handle: BinaryIO) -> dict[str, Any]:
+    # The writer always puts "meta" first, so this reads only the head of the file.
+    reader = _JsonReader(handle)
+    for key in reader.keys():
+        if key == "meta":
+            meta = reader.value()
+            return meta if isinstance(meta, dict) else {}
+        reader.value()
+    return {}
+
+
+def iter_backup_sections(handle: BinaryIO, part: str = "data") -> Iterator[tuple[str, Any]]:
+    # Inverse of iter_backup_json: yields (section, rows) pairs with rows as a lazy iterator for list
+    # sections. Rows a consumer leaves unread are skipped before the next section is produced.
+    reader = _JsonReader(handle)
+    for key in reader.keys():
+        if key != part:
+            reader.value()
+            continue
+        if reader.peek() != "{":
+            raise reader._error(f"Backup {part} must be an object")
+        for name in reader.keys():
+            if reader.peek() == "[":
+                rows = reader.items()
+                yield name, rows
+                for _ in rows:
+                    pass
+            else:
+                yield name, reader.value()
+    if reader.peek():
+        raise reader._error("Extra data")
+
+
+@dataclass
+class StoredBackup:
+    path: Path
+    meta: dict[str, Any]
+
+    @property
+    def kind(self) -> str:
+        return self.meta.get("kind", "full")
+
+    @property
+    def base(self) -> str:
+        return self.meta.get("base") or self.path.name
+
+    @property
+    def started_at(self) -> datetime | None:
+        value = self.meta.get("startedAt")
+        return datetime.fromisoformat(value) if value else None
+
+
+@dataclass
+class BackupPlan:
+    path: Path
+    meta: dict[str, Any]
+    changed_since: datetime | None = None
+
+
+def list_stored_backups(directory: Path, user_id: UUID | None = None) -> list[StoredBackup]:
+    # Oldest first; the timestamped file names sort chronologically.
+    out: list[StoredBackup] = []
+    for path in sorted(directory.glob(f"{BACKUP_PREFIX}*.json*")):
+        if path.name.endswith(".tmp"):
+            continue
+        try:
+            with path.open("rb") as raw:
+                meta = read_backup_meta(decompressed(raw))
+        except BACKUP_READ_ERRORS:
+            continue
+        if user_id is not None and meta.get("userId") != str(user_id):
+            continue
+        out.append(StoredBackup(path, meta))
+    return out
+
+
+def plan_backup(directory: Path, user_id: UUID, started_at: datetime, compression: str, full_every: int) -> BackupPlan:
+    # Chains are a full snapshot followed by up to full_every - 1 incrementals, each holding only
+    # rows changed since its parent started.
+    stamp = started_at.strftime("%Y%m%d_%H%M%S_%f")
+    suffix = compression_suffix(compression)
+    meta: dict[str, Any] = {"userId": str(user_id), "startedAt": started_at.isoformat(), "kind": "full", "sequence": 0}
+    stored = list_stored_backups(directory, user_id)
+    parent = stored[-1] if stored else None
+    if parent is None or parent.started_at is None or parent.meta.get("sequence", 0) + 1 >= full_every:
+        return BackupPlan(directory / f"{BACKUP_PREFIX}{stamp}.json{suffix}", meta)
+    if not (directory / parent.base).exists():
+        return BackupPlan(directory / f"{BACKUP_PREFIX}{stamp}.json{suffix}", meta)
+    changed_since = parent.started_at - INCREMENTAL_OVERLAP
+    meta.update(
+        {
+            "kind": "incremental",
+            "sequence": parent.meta.get("sequence", 0) + 1,
+            "base": parent.base,
+            "parent": parent.path.name,
+            "changedSince": changed_since.isoformat(),
+        }
+    )
+    return BackupPlan(directory / f"{BACKUP_PREFIX}{stamp}-inc.json{suffix}", meta, changed_since)
+
+
+def backup_chain(directory: Path, name: str) -> list[Path]:
+    # Full snapshot first, then every incremental up to and including `name`.
+    chain: list[Path] = []
+    current: str | None = name
+    while current:
+        path = directory / current
+        if path.parent != directory or not path.name.startswith(BACKUP_PREFIX) or not path.is_file():
+            raise FileNotFoundError(current)
+        with path.open("rb") as raw:
+            meta = read_backup_meta(decompressed(raw))
+        chain.append(path)
+        current = meta.get("parent") if meta.get("kind") == "incremental" else None
+    chain.reverse()
+    return chain
+
+
+def _row_key(row: Any) -> str | None:
+    return str(row["id"]) if isinstance(row, dict) and row.get("id") is not None else None
+
+
+def iter_restored_sections(chain: list[Path]) -> Iterator[tuple[str, Any]]:
+    # Replays a chain as if it were one full backup. Incrementals are small and read up front; the
+    # base snapshot is streamed and its rows are replaced, kept or dropped on the way through.
+    base, *increments = chain
+    replaced: dict[str, Any] = {}
+    changed: dict[str, dict[str, Any]] = {}
+    present: dict[str, set[str]] = {}
+    for path in increments:
+        with path.open("rb") as raw:
+            ids = {name: {str(row_id) for row_id in rows} for name, rows in iter_backup_sections(decompressed(raw), "present")}
+        with path.open("rb") as raw:
+            for name, content in iter_backup_sections(decompressed(raw)):
+                if name not in ids:
+                    replaced[name] = content if isinstance(content, dict) else list(content)
+                    continue
+                rows = changed.setdefault(name, {})
+                for row in content:
+                    key = _row_key(row)
+                    if key is not None:
+                        rows[key] = row
+        present.update(ids)
+
+    def merged(name: str, rows: Iterable[Any]) -> Iterator[Any]:
+        overrides = changed.pop(name, {})
+        alive = present[name]
+        for row in rows:
+            key = _row_key(row)
+            if key is None or (key in alive and key not in overrides):
+                yield row
+        for key, row in overrides.items():
+            if key in alive:
+                yield row
+
+    with base.open("rb") as raw:
+        for name, content in iter_backup_sections(decompressed(raw)):
+            if name in replaced:
+                yield name, replaced.pop(name)
+            elif name in present and not isinstance(content, dict):
+                yield name, merged(name, content)
+            else:
+                yield name, content
+    yield from replaced.items()
+    for name in list(changed):
+        yield name, merged(name, ())
+
+
+def cleanup_backups(directory: Path, retention_days: int, now: datetime | None = None) -> None:
+    # Retention works on whole chains: a full snapshot is kept while any incremental still needs it.
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=retention_days)
+    chains: dict[str, list[Path]] = {}
+    for path in directory.glob(f"{BACKUP_PREFIX}*.json*"):
+        if path.name.endswith(".tmp"):
+            continue
+        try:
+            with path.open("rb") as raw:
+                meta = read_backup_meta(decompressed(raw))
+        except BACKUP_READ_ERRORS:
+            meta = {}
+        base = meta.get("base") if meta.get("kind") == "incremental" else path.name
+        chains.setdefault(base or path.name, []).append(path)
+    for paths in chains.values():
+        newest = max(datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc) for path in paths)
+        if newest < cutoff:
+            for path in paths:
+                path.unlink(missing_ok=True)
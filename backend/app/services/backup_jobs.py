@@ -0,0 +1,98 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID, uuid4
+
+JOB_HISTORY = 20
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class BackupJob:
+    user_id: UUID
+    trigger: str
+    id: str = field(default_factory=lambda: uuid4().hex)
+    status: str = "queued"
+    created_at: datetime = field(default_factory=_utcnow)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    kind: str | None = None
+    file: str | None = None
+    section: str | None = None
+    rows_written: int = 0
+    error: str | None = None
+
+    def track(self, sections: Iterable[tuple[str, Any]]) -> Iterator[tuple[str, Any]]:
+        # Passes sections through to the writer while counting rows for the status endpoint.
+        for name, content in sections:
+            self.section = name
+            if isinstance(content, dict):
+                yield name, content
+                continue
+            yield name, self._count(content)
+        self.section = None
+
+    def _count(self, rows: Iterable[Any]) -> Iterator[Any]:
+        for row in rows:
+            self.rows_written += 1
+            yield row
+
+
+class BackupBusyError(Exception):
+    def __init__(self, job: BackupJob) -> None:
+        super().__init__(f"backup already running: {job.id}")
+        self.job = job
+
+
+class BackupJobRunner:
+    # A single worker thread, so at most one backup exports, compresses or prunes files at a time and
+    # none of that work runs on the event loop. Recent jobs are kept in memory for status polling.
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backup")
+        self._jobs: OrderedDict[str, BackupJob] = OrderedDict()
+        self._active: BackupJob | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, user_id: UUID, trigger: str, work: Callable[[BackupJob], None]) -> tuple[BackupJob, Future]:
+        with self._lock:
+            if self._active is not None and self._active.status in ACTIVE_STATUSES:
+                raise BackupBusyError(self._active)
+            job = BackupJob(user_id=user_id, trigger=trigger)
+            self._active = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > JOB_HISTORY:
+                self._jobs.popitem(last=False)
+        return job, self._executor.submit(self._run, job, work)
+
+    @staticmethod
+    def _run(job: BackupJob, work: Callable[[BackupJob], None]) -> BackupJob:
+        job.status = "running"
+        job.started_at = _utcnow()
+        try:
+            work(job)
+        except Exception as exc:
+            job.status = "failed"
+            job.error = str(getattr(exc, "detail", None) or exc)
+            raise
+        else:
+            job.status = "succeeded"
+        finally:
+            job.finished_at = _utcnow()
+        return job
+
+    def get(self, job_id: str) -> BackupJob | None:
+        return self._jobs.get(job_id)
+
+    def list(self, user_id: UUID) -> list[BackupJob]:
+        return [job for job in reversed(self._jobs.values()) if job.user_id == user_id]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,38 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+from uuid import UUID
+
+
+class BalanceSeriesCache:
+    # Recently requested balance series per (user, range key), least recently used evicted first.
+    # Any write touching a user's balances drops all of that user's entries.
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 512, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[tuple[UUID, Hashable], tuple[float, Any]] = OrderedDict()
+
+    def get(self, user_id: UUID, key: Hashable) -> Any | None:
+        entry = self._entries.get((user_id, key))
+        if entry is None:
+            return None
+        if self.clock() >= entry[0]:
+            del self._entries[(user_id, key)]
+            return None
+        self._entries.move_to_end((user_id, key))
+        return entry[1]
+
+    def put(self, user_id: UUID, key: Hashable, value: Any) -> None:
+        self._entries[(user_id, key)] = (self.clock() + self.ttl_seconds, value)
+        self._entries.move_to_end((user_id, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        for entry_key in [k for k in self._entries if k[0] == user_id]:
+            del self._entries[entry_key]
+
+    def clear(self) -> None:
+        self._entries.clear()
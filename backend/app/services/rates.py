@@ -0,0 +1,352 @@
+import asyncio
+import time
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Protocol
+
+import httpx
+
+COINGECKO_URL = "https://api.coingecko.com/api/v3/simple/price"
+FRANKFURTER_URL = "https://api.frankfurter.app/latest"
+USER_AGENT = "my-finance/0.3"
+
+CRYPTO_SYMBOL_MAP = {
+    "BTC": "bitcoin",
+    "ETH": "ethereum",
+    "SOL": "solana",
+    "SHIB": "shiba-inu",
+    "ADA": "cardano",
+    "DOGE": "dogecoin",
+}
+
+Quotes = dict[str, dict[str, Any]]
+
+
+class RateProvider(Protocol):
+    async def fetch(self, symbols: list[str]) -> tuple[Quotes, dict[str, str]]: ...
+
+    async def aclose(self) -> None: ...
+
+
+def is_fx_pair(symbol: str) -> bool:
+    parts = symbol.split("/")
+    return len(parts) == 2 and all(len(p) == 3 and p.isalpha() for p in parts)
+
+
+def is_supported(symbol: str) -> bool:
+    return symbol in CRYPTO_SYMBOL_MAP or is_fx_pair(symbol)
+
+
+def provider_for(symbol: str) -> str | None:
+    if symbol in CRYPTO_SYMBOL_MAP:
+        return "coingecko"
+    if is_fx_pair(symbol) and symbol[:3] != symbol[4:]:
+        return "frankfurter"
+    return None
+
+
+def _quote(symbol: str, price: Any, currency: str, source: str, now: datetime) -> dict[str, Any]:
+    return {"symbol": symbol, "price": price, "currency": currency, "source": source, "updatedAt": now}
+
+
+class RateClient:
+    # One pooled keep-alive client per process; providers are queried concurrently and FX pairs that
+    # share a base currency collapse into a single Frankfurter request.
+    def __init__(self, timeout: float = 10.0, max_connections: int = 20, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                headers={"User-Agent": USER_AGENT},
+                transport=self.transport,
+            )
+        return self._client
+
+    async def _get_json(self, url: str, params: dict[str, str]) -> dict[str, Any]:
+        response = await self._http().get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def _fetch_crypto(self, symbols: list[str], now: datetime) -> tuple[Quotes, dict[str, str]]:
+        updated: Quotes = {}
+        skipped: dict[str, str] = {}
+        params = {"ids": ",".join(CRYPTO_SYMBOL_MAP[s] for s in symbols), "vs_currencies": "usd"}
+        try:
+            data = await self._get_json(COINGECKO_URL, params)
+        except (httpx.HTTPError, ValueError) as exc:
+            return updated, {sym: f"coingecko error: {exc}" for sym in symbols}
+        for sym in symbols:
+            price = data.get(CRYPTO_SYMBOL_MAP[sym], {}).get("usd")
+            if price is None:
+                skipped[sym] = "no price in provider response"
+                continue
+            updated[sym] = _quote(sym, price, "USD", "coingecko", now)
+        return updated, skipped
+
+    async def _fetch_fx(self, base: str, pairs: dict[str, str], now: datetime) -> tuple[Quotes, dict[str, str]]:
+        # pairs maps quote currency -> symbol, e.g. {"CZK": "EUR/CZK", "USD": "EUR/USD"}.
+        updated: Quotes = {}
+        skipped: dict[str, str] = {}
+        try:
+            data = await self._get_json(FRANKFURTER_URL, {"from": base, "to": ",".join(sorted(pairs))})
+        except (httpx.HTTPError, ValueError) as exc:
+            return updated, {sym: f"frankfurter error: {exc}" for sym in pairs.values()}
+        rates = data.get("rates", {})
+        for quote, sym in pairs.items():
+            rate = rates.get(quote)
+            if rate is None:
+                skipped[sym] = "no fx rate in provider response"
+                continue
+            updated[sym] = _quote(sym, rate, quote, "frankfurter", now)
+        return updated, skipped
+
+    async def fetch(self, symbols: list[str]) -> tuple[Quotes, dict[str, str]]:
+        updated: Quotes = {}
+        skipped: dict[str, str] = {}
+        now = datetime.now(timezone.utc)
+        requests = []
+
+        crypto_symbols = [s for s in dict.fromkeys(symbols) if s in CRYPTO_SYMBOL_MAP]
+        if crypto_symbols:
+            requests.append(self._fetch_crypto(crypto_symbols, now))
+
+        fx_by_base: dict[str, dict[str, str]] = {}
+        for sym in symbols:
+            if sym in CRYPTO_SYMBOL_MAP or sym in updated:
+                continue
+            if not is_fx_pair(sym):
+                skipped[sym] = "unsupported symbol for auto-refresh"
+                continue
+            base, quote = sym.split("/")
+            if base == quote:
+                updated[sym] = _quote(sym, 1.0, quote, "fx-static", now)
+                continue
+            fx_by_base.setdefault(base, {})[quote] = sym
+        requests.extend(self._fetch_fx(base, pairs, now) for base, pairs in fx_by_base.items())
+
+        for part_updated, part_skipped in await asyncio.gather(*requests):
+            updated.update(part_updated)
+            skipped.update(part_skipped)
+        return updated, skipped
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class FakeRateProvider:
+    # Offline provider for tests and local development (RATES_PROVIDER=fake): deterministic prices derived
+    # from the symbol, the same skip rules as the public providers, and a log of every upstream call.
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    async def fetch(self, symbols: list[str]) -> tuple[Quotes, dict[str, str]]:
+        self.calls.append(list(symbols))
+        updated: Quotes = {}
+        skipped: dict[str, str] = {}
+        now = datetime.now(timezone.utc)
+        for sym in symbols:
+            if sym in CRYPTO_SYMBOL_MAP:
+                currency = "USD"
+            elif is_fx_pair(sym):
+                currency = sym.split("/")[1]
+            else:
+                skipped[sym] = "unsupported symbol for auto-refresh"
+                continue
+            price = 1.0 if currency == sym.split("/")[0] else round(1 + zlib.crc32(sym.encode()) % 100000 / 100, 2)
+            updated[sym] = _quote(sym, price, currency, "fake", now)
+        return updated, skipped
+
+    async def aclose(self) -> None:
+        return None
+
+
+@dataclass
+class CachedQuote:
+    quote: dict[str, Any]
+    fetched_at: float
+
+
+class QuoteCache:
+    # Process-wide quote cache keyed by symbol and shared by all users. Fresh entries (younger than ttl)
+    # are served directly; entries within the stale window are served immediately while one background
+    # fetch revalidates them. Concurrent misses for the same symbol wait on a single upstream request.
+    def __init__(
+        self,
+        provider: RateProvider,
+        ttl_seconds: float = 300,
+        stale_seconds: float = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.provider = provider
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.clock = clock
+        self.entries: dict[str, CachedQuote] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._background: set[asyncio.Task] = set()
+
+    async def _load(self, symbols: list[str]) -> tuple[Quotes, dict[str, str]]:
+        updated, skipped = await self.provider.fetch(symbols)
+        fetched_at = self.clock()
+        for sym, quote in updated.items():
+            self.entries[sym] = CachedQuote(quote=quote, fetched_at=fetched_at)
+        return updated, skipped
+
+    def _start(self, symbols: list[str]) -> list[asyncio.Task]:
+        missing = [sym for sym in symbols if sym not in self._inflight or self._inflight[sym].done()]
+        if missing:
+            self.upstream_calls += 1
+            task = asyncio.create_task(self._load(missing))
+            for sym in missing:
+                self._inflight[sym] = task
+            task.add_done_callback(lambda done, keys=tuple(missing): self._finish(keys, done))
+        return list(dict.fromkeys(self._inflight[sym] for sym in symbols))
+
+    def _finish(self, symbols: tuple[str, ...], task: asyncio.Task) -> None:
+        for sym in symbols:
+            if self._inflight.get(sym) is task:
+                del self._inflight[sym]
+        if not task.cancelled():
+            task.exception()
+
+    async def fetch(self, symbols: list[str]) -> tuple[Quotes, dict[str, str]]:
+        updated: Quotes = {}
+        skipped: dict[str, str] = {}
+        now = self.clock()
+        missing: list[str] = []
+        stale: list[str] = []
+        for sym in dict.fromkeys(symbols):
+            if not is_supported(sym):
+                skipped[sym] = "unsupported symbol for auto-refresh"
+                continue
+            entry = self.entries.get(sym)
+            age = now - entry.fetched_at if entry is not None else None
+            if age is not None and age < self.ttl_seconds:
+                self.hits += 1
+                updated[sym] = entry.quote
+            elif age is not None and age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                updated[sym] = entry.quote
+                stale.append(sym)
+            else:
+                self.misses += 1
+                missing.append(sym)
+
+        if stale:
+            for task in self._start(stale):
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+        if missing:
+            part_updated, part_skipped = await self._load_shared(missing)
+            updated.update(part_updated)
+            skipped.update(part_skipped)
+        return updated, skipped
+
+    async def _load_shared(self, symbols: list[str]) -> tuple[Quotes, dict[str, str]]:
+        updated: Quotes = {}
+        skipped: dict[str, str] = {}
+        wanted = set(symbols)
+        for part_updated, part_skipped in await asyncio.gather(*self._start(symbols)):
+            updated.update({sym: quote for sym, quote in part_updated.items() if sym in wanted})
+            skipped.update({sym: reason for sym, reason in part_skipped.items() if sym in wanted})
+        return updated, skipped
+
+    async def refresh(self, symbols: list[str]) -> tuple[Quotes, dict[str, str]]:
+        # Unconditional upstream fetch used by the background refresher; still shares in-flight requests.
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}, {}
+        return await self._load_shared(symbols)
+
+    def peek(self, symbols: list[str]) -> Quotes:
+        # Cached quotes still inside the stale window, without touching counters or providers.
+        now = self.clock()
+        limit = self.ttl_seconds + self.stale_seconds
+        return {
+            sym: entry.quote
+            for sym in symbols
+            if (entry := self.entries.get(sym)) is not None and now - entry.fetched_at < limit
+        }
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "upstreamCalls": self.upstream_calls,
+            "ttlSeconds": self.ttl_seconds,
+            "staleSeconds": self.stale_seconds,
+        }
+
+    async def aclose(self) -> None:
+        for task in list(self._background):
+            task.cancel()
+        await self.provider.aclose()
+
+
+class ProviderBackoff:
+    # Exponential backoff per provider: after n consecutive failures the provider is skipped for
+    # base * 2^(n-1) seconds, capped at max_seconds. One success resets it.
+    def __init__(self, base_seconds: float = 60, max_seconds: float = 3600, clock: Callable[[], float] = time.monotonic) -> None:
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self.clock = clock
+        self.failures: dict[str, int] = {}
+        self.retry_at: dict[str, float] = {}
+
+    def available(self, provider: str) -> bool:
+        return self.clock() >= self.retry_at.get(provider, 0.0)
+
+    def failed(self, provider: str) -> None:
+        failures = self.failures.get(provider, 0) + 1
+        self.failures[provider] = failures
+        self.retry_at[provider] = self.clock() + min(self.base_seconds * 2 ** (failures - 1), self.max_seconds)
+
+    def succeeded(self, provider: str) -> None:
+        self.failures.pop(provider, None)
+        self.retry_at.pop(provider, None)
+
+
+class RateRefresher:
+    # One scheduled pass: refresh every watched symbol through the shared cache, skipping providers
+    # that are backing off and recording which providers failed this time.
+    def __init__(self, cache: QuoteCache, backoff: ProviderBackoff) -> None:
+        self.cache = cache
+        self.backoff = backoff
+
+    async def refresh(self, symbols: list[str]) -> tuple[Quotes, dict[str, str]]:
+        skipped: dict[str, str] = {}
+        wanted: list[str] = []
+        used: set[str] = set()
+        for sym in dict.fromkeys(symbols):
+            provider = provider_for(sym)
+            if provider is not None and not self.backoff.available(provider):
+                skipped[sym] = f"{provider} backing off"
+                continue
+            if provider is not None:
+                used.add(provider)
+            wanted.append(sym)
+        updated, fetch_skipped = await self.cache.refresh(wanted)
+        skipped.update(fetch_skipped)
+        failed = {provider for provider in used if any(reason.startswith(f"{provider} error") for reason in fetch_skipped.values())}
+        for provider in used:
+            if provider in failed:
+                self.backoff.failed(provider)
+            else:
+                self.backoff.succeeded(provider)
+        return updated, skipped
@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import secrets
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+SWEEP_BUCKET_SECONDS = 60
+TOUCH_INTERVAL = timedelta(seconds=60)
+
+
+@dataclass
+class SessionRecord:
+    user_id: UUID
+    last_seen: datetime
+    expires_at: datetime
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _bucket(moment: datetime) -> int:
+    return int(moment.timestamp()) // SWEEP_BUCKET_SECONDS
+
+
+class SessionStore:
+    async def create(self, user_id: UUID, ttl: timedelta) -> str:
+        raise NotImplementedError
+
+    async def get(self, token: str) -> SessionRecord | None:
+        raise NotImplementedError
+
+    async def touch(self, token: str, ttl: timedelta) -> None:
+        raise NotImplementedError
+
+    async def delete(self, token: str) -> None:
+        raise NotImplementedError
+
+    async def delete_user(self, user_id: UUID) -> None:
+        raise NotImplementedError
+
+    async def sweep(self) -> int:
+        raise NotImplementedError
+
+
+class MemorySessionStore(SessionStore):
+    # Sessions are filed into per-minute expiry buckets, so a sweep only visits buckets that are due.
+    def __init__(self) -> None:
+        self.sessions: dict[str, SessionRecord] = {}
+        self.buckets: dict[int, set[str]] = {}
+        self.tokens_by_user: dict[UUID, set[str]] = {}
+
+    def _file(self, token: str, record: SessionRecord) -> None:
+        self.buckets.setdefault(_bucket(record.expires_at), set()).add(token)
+
+    def _unfile(self, token: str, record: SessionRecord) -> None:
+        bucket = self.buckets.get(_bucket(record.expires_at))
+        if bucket is not None:
+            bucket.discard(token)
+            if not bucket:
+                del self.buckets[_bucket(record.expires_at)]
+
+    def _drop(self, token: str) -> None:
+        record = self.sessions.pop(token, None)
+        if record is None:
+            return
+        self._unfile(token, record)
+        tokens = self.tokens_by_user.get(record.user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self.tokens_by_user[record.user_id]
+
+    async def create(self, user_id: UUID, ttl: timedelta) -> str:
+        token = secrets.token_urlsafe(32)
+        now = _utcnow()
+        record = SessionRecord(user_id=user_id, last_seen=now, expires_at=now + ttl)
+        self.sessions[token] = record
+        self._file(token, record)
+        self.tokens_by_user.setdefault(user_id, set()).add(token)
+        return token
+
+    async def get(self, token: str) -> SessionRecord | None:
+        record = self.sessions.get(token)
+        if record is None:
+            return None
+        if record.expires_at <= _utcnow():
+            self._drop(token)
+            return None
+        return record
+
+    async def touch(self, token: str, ttl: timedelta) -> None:
+        record = self.sessions.get(token)
+        if record is None:
+            return
+        self._unfile(token, record)
+        record.last_seen = _utcnow()
+        record.expires_at = record.last_seen + ttl
+        self._file(token, record)
+
+    async def delete(self, token: str) -> None:
+        self._drop(token)
+
+    async def delete_user(self, user_id: UUID) -> None:
+        for token in list(self.tokens_by_user.get(user_id, ())):
+            self._drop(token)
+
+    async def sweep(self) -> int:
+        now = _utcnow()
+        current = _bucket(now)
+        removed = 0
+        for bucket in sorted(key for key in self.buckets if key <= current):
+            for token in list(self.buckets.get(bucket, ())):
+                record = self.sessions.get(token)
+                if record is not None and record.expires_at <= now:
+                    self._drop(token)
+                    removed += 1
+        return removed
+
+
+class PostgresSessionStore(SessionStore):
+    # Shared across workers and nodes; only a SHA-256 digest of the token is stored. `runner` moves the
+    # blocking queries off the event loop; the app passes the persistence executor so DB_POOL_SIZE bounds them.
+    def __init__(self, engine: Engine, runner: Callable[..., Awaitable[Any]] = asyncio.to_thread) -> None:
+        self.engine = engine
+        self.runner = runner
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _execute(self, sql: str, params: dict) -> list[dict]:
+        with self.engine.begin() as conn:
+            result = conn.execute(text(sql), params)
+            if result.returns_rows:
+                return [dict(row._mapping) for row in result.fetchall()]
+            return []
+
+    async def _run(self, sql: str, params: dict) -> list[dict]:
+        return await self.runner(self._execute, sql, params)
+
+    async def create(self, user_id: UUID, ttl: timedelta) -> str:
+        token = secrets.token_urlsafe(32)
+        now = _utcnow()
+        await self._run(
+            """
+            insert into user_sessions (token_hash, user_id, last_seen_at, expires_at)
+            values (:token_hash, :user_id, :now, :expires_at)
+            """,
+            {"token_hash": self._digest(token), "user_id": user_id, "now": now, "expires_at": now + ttl},
+        )
+        return token
+
+    async def get(self, token: str) -> SessionRecord | None:
+        rows = await self._run(
+            "select user_id, last_seen_at, expires_at from user_sessions where token_hash = :token_hash and expires_at > now()",
+            {"token_hash": self._digest(token)},
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        return SessionRecord(user_id=row["user_id"], last_seen=row["last_seen_at"], expires_at=row["expires_at"])
+
+    async def touch(self, token: str, ttl: timedelta) -> None:
+        now = _utcnow()
+        # Skip the write when the session was refreshed recently; idle checks stay accurate to TOUCH_INTERVAL.
+        await self._run(
+            """
+            update user_sessions
+            set last_seen_at = :now, expires_at = :expires_at
+            where token_hash = :token_hash and last_seen_at < :stale_before
+            """,
+            {"token_hash": self._digest(token), "now": now, "expires_at": now + ttl, "stale_before": now - TOUCH_INTERVAL},
+        )
+
+    async def delete(self, token: str) -> None:
+        await self._run("delete from user_sessions where token_hash = :token_hash", {"token_hash": self._digest(token)})
+
+    async def delete_user(self, user_id: UUID) -> None:
+        await self._run("delete from user_sessions where user_id = :user_id", {"user_id": user_id})
+
+    async def sweep(self) -> int:
+        rows = await self._run("delete from user_sessions where expires_at <= now() returning 1 as removed", {})
+        return len(rows)
@@ -0,0 +1,95 @@
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+PIVOT_CURRENCIES = ("USD", "EUR")
+
+RateGraph = dict[str, dict[str, Decimal]]
+
+
+def rate_graph(snapshots: Iterable[dict[str, Any]]) -> RateGraph:
+    # edges[a][b] is the price of one unit of a in b. "EUR/CZK" quoted in CZK gives EUR -> CZK,
+    # a plain asset such as "BTC" quoted in USD gives BTC -> USD; every edge also gets its inverse.
+    edges: RateGraph = {}
+    for snap in snapshots:
+        symbol = str(snap.get("symbol") or "").upper()
+        currency = str(snap.get("currency") or "").upper()
+        price = Decimal(str(snap.get("price") or 0))
+        if not symbol or not currency or price <= 0:
+            continue
+        base, _, quote = symbol.partition("/")
+        if quote and quote != currency:
+            continue
+        if base == currency:
+            continue
+        edges.setdefault(base, {})[currency] = price
+        edges.setdefault(currency, {})[base] = 1 / price
+    return edges
+
+
+def conversion_factors(graph: RateGraph, target: str) -> dict[str, Decimal]:
+    # Value of one unit of every reachable currency in target, by breadth-first search outward from
+    # target. Pivot currencies are expanded first, so equally short paths cross via USD/EUR.
+    factors = {target: Decimal("1")}
+    queue = deque([target])
+    while queue:
+        current = queue.popleft()
+        neighbours = sorted(graph.get(current, {}), key=lambda cur: (cur not in PIVOT_CURRENCIES, cur))
+        for cur in neighbours:
+            if cur in factors:
+                continue
+            rate = graph.get(cur, {}).get(current)
+            if rate is None:
+                continue
+            factors[cur] = rate * factors[current]
+            queue.append(cur)
+    return factors
+
+
+def value_accounts(accounts: list[dict[str, Any]], graph: RateGraph, currencies: list[str]) -> dict[str, Any]:
+    # Balances are summed per account currency first, so each display currency costs one
+    # multiplication per distinct currency rather than one conversion per account.
+    by_currency: dict[str, Decimal] = {}
+    for account in accounts:
+        cur = str(account["currency"]).upper()
+        by_currency[cur] = by_currency.get(cur, Decimal("0")) + Decimal(str(account.get("current_balance") or 0))
+    factors = {target: conversion_factors(graph, target) for target in currencies}
+    totals = {
+        target: sum((amount * factors[target][cur] for cur, amount in by_currency.items() if cur in factors[target]), Decimal("0"))
+        for target in currencies
+    }
+    missing = sorted({cur for cur in by_currency for target in currencies if cur not in factors[target]})
+    items = []
+    for account in accounts:
+        cur = str(account["currency"]).upper()
+        balance = Decimal(str(account.get("current_balance") or 0))
+        values = {target: balance * factors[target][cur] if cur in factors[target] else None for target in currencies}
+        items.append({"accountId": account["id"], "name": account["name"], "currency": cur, "balance": balance, "values": values})
+    return {"currencies": currencies, "totals": totals, "accounts": items, "missingRates": missing}
+
+
+class ValuationCache:
+    # Per-user results with a TTL; writes that change balances, rates or display currencies invalidate
+    # the user's entry, and the background rate refresher clears everything.
+    def __init__(self, ttl_seconds: float = 60, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: dict[UUID, tuple[float, Any]] = {}
+
+    def get(self, user_id: UUID) -> Any | None:
+        entry = self._entries.get(user_id)
+        if entry is None or self.clock() >= entry[0]:
+            return None
+        return entry[1]
+
+    def put(self, user_id: UUID, value: Any) -> None:
+        self._entries[user_id] = (self.clock() + self.ttl_seconds, value)
+
+    def invalidate(self, user_id: UUID) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,8 +1,77 @@
-from datetime import datetime
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterator
+from datetime import date, datetime, timezone
+from decimal import Decimal
 import json
 from pathlib import Path
+from typing import Any
 from uuid import UUID, uuid4
 
+TransactionKey = tuple[float, str, UUID]
+
+
+def _as_uuid(value: Any) -> Any:
+    if value is None or isinstance(value, UUID):
+        return value
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return value
+
+
+def _transaction_key(row: dict) -> TransactionKey:
+    moment = row.get("transaction_at")
+    ts = moment.timestamp() if isinstance(moment, datetime) else 0.0
+    return (ts, str(row["id"]), row["id"])
+
+
+def _category_name(row: dict) -> str:
+    return (row.get("category") or "").strip()
+
+
+def _email_key(email: Any) -> str:
+    return str(email or "").strip().lower()
+
+
+def _ledger_day(row: dict) -> date:
+    moment = row.get("transaction_at")
+    if isinstance(moment, datetime):
+        return (moment.astimezone(timezone.utc) if moment.tzinfo else moment).date()
+    return moment if isinstance(moment, date) else date.min
+
+
+def _signed_amount(row: dict) -> Decimal:
+    amount = Decimal(str(row.get("amount") or 0))
+    return amount if row.get("direction") == "income" else -amount
+
+
+class BalanceLedger:
+    # Days that have transactions, ascending, with the running signed net through each day; the balance
+    # at any date is one bisect. A write shifts the running net of its own day and every later one.
+    def __init__(self) -> None:
+        self.days: list[date] = []
+        self.closing: list[Decimal] = []
+        self.counts: list[int] = []
+
+    def add(self, day: date, delta: Decimal, count: int = 1) -> None:
+        pos = bisect_left(self.days, day)
+        if pos == len(self.days) or self.days[pos] != day:
+            self.days.insert(pos, day)
+            self.closing.insert(pos, self.closing[pos - 1] if pos else Decimal("0"))
+            self.counts.insert(pos, 0)
+        for i in range(pos, len(self.closing)):
+            self.closing[i] += delta
+        self.counts[pos] += count
+        if self.counts[pos] <= 0:
+            del self.days[pos], self.closing[pos], self.counts[pos]
+
+    def net_through(self, day: date) -> Decimal:
+        pos = bisect_right(self.days, day)
+        return self.closing[pos - 1] if pos else Decimal("0")
+
+    def total(self) -> Decimal:
+        return self.closing[-1] if self.closing else Decimal("0")
+
 
 class InMemoryStore:
     def __init__(self) -> None:
@@ -23,6 +92,7 @@ class InMemoryStore:
         self.calendar_events: dict[str, dict] = {}
         self.rate_watchlists: dict[UUID, list[str]] = {}
         self.rate_snapshots: dict[UUID, dict[str, dict]] = {}
+        self.rate_history: dict[tuple[str, str], dict[datetime, dict]] = {}
         self.settings: dict[str, object] = {
             "defaultLocale": "en",
             "defaultTimezone": "Europe/Prague",
@@ -40,6 +110,140 @@ class InMemoryStore:
         }
         self.base_locales: dict[str, dict[str, str]] = self._load_locales_from_files()
         self.custom_locales: dict[str, dict[str, str]] = {}
+        # Secondary indexes over users/accounts/transactions, kept in sync by the put_*/remove_* methods.
+        self.user_ids_by_email: dict[str, UUID] = {}
+        self._user_index_entries: dict[UUID, str] = {}
+        self.account_ids_by_user: dict[UUID, set[UUID]] = {}
+        self.transaction_keys_by_user: dict[UUID, list[TransactionKey]] = {}
+        self.transaction_ids_by_account: dict[UUID, set[UUID]] = {}
+        self.transaction_ids_by_category: dict[UUID, dict[str, set[UUID]]] = {}
+        self._account_index_entries: dict[UUID, UUID] = {}
+        self._transaction_index_entries: dict[UUID, tuple[UUID, Any, TransactionKey, str, date, Decimal]] = {}
+        self.balance_ledgers: dict[Any, BalanceLedger] = {}
+
+    def put_user(self, row: dict) -> None:
+        self._unindex_user(row["id"])
+        self.users[row["id"]] = row
+        email = _email_key(row.get("email"))
+        if email:
+            self.user_ids_by_email[email] = row["id"]
+            self._user_index_entries[row["id"]] = email
+
+    def remove_user(self, user_id: UUID) -> dict | None:
+        self._unindex_user(user_id)
+        return self.users.pop(user_id, None)
+
+    def _unindex_user(self, user_id: UUID) -> None:
+        email = self._user_index_entries.pop(user_id, None)
+        if email is not None and self.user_ids_by_email.get(email) == user_id:
+            del self.user_ids_by_email[email]
+
+    def user_by_email(self, email: str) -> dict | None:
+        user_id = self.user_ids_by_email.get(_email_key(email))
+        return self.users.get(user_id) if user_id is not None else None
+
+    def put_account(self, row: dict) -> None:
+        self._unindex_account(row["id"])
+        self.accounts[row["id"]] = row
+        user_id = _as_uuid(row.get("user_id"))
+        self.account_ids_by_user.setdefault(user_id, set()).add(row["id"])
+        self._account_index_entries[row["id"]] = user_id
+
+    def remove_account(self, account_id: UUID) -> dict | None:
+        self._unindex_account(account_id)
+        return self.accounts.pop(account_id, None)
+
+    def _unindex_account(self, account_id: UUID) -> None:
+        user_id = self._account_index_entries.pop(account_id, None)
+        if user_id is not None:
+            self.account_ids_by_user.get(user_id, set()).discard(account_id)
+
+    def put_transaction(self, row: dict) -> None:
+        # Also used after in-place edits: the previous index entry is looked up by id, not by row values.
+        self._unindex_transaction(row["id"])
+        self.transactions[row["id"]] = row
+        user_id = _as_uuid(row.get("user_id"))
+        account_id = _as_uuid(row.get("account_id"))
+        key = _transaction_key(row)
+        category = _category_name(row)
+        day, delta = _ledger_day(row), _signed_amount(row)
+        insort(self.transaction_keys_by_user.setdefault(user_id, []), key)
+        self.transaction_ids_by_account.setdefault(account_id, set()).add(row["id"])
+        if category:
+            self.transaction_ids_by_category.setdefault(user_id, {}).setdefault(category, set()).add(row["id"])
+        self.balance_ledgers.setdefault(account_id, BalanceLedger()).add(day, delta)
+        self._transaction_index_entries[row["id"]] = (user_id, account_id, key, category, day, delta)
+
+    def remove_transaction(self, transaction_id: UUID) -> dict | None:
+        self._unindex_transaction(transaction_id)
+        return self.transactions.pop(transaction_id, None)
+
+    def _unindex_transaction(self, transaction_id: UUID) -> None:
+        entry = self._transaction_index_entries.pop(transaction_id, None)
+        if entry is None:
+            return
+        user_id, account_id, key, category, day, delta = entry
+        keys = self.transaction_keys_by_user.get(user_id, [])
+        pos = bisect_left(keys, key)
+        if pos < len(keys) and keys[pos] == key:
+            keys.pop(pos)
+        self.transaction_ids_by_account.get(account_id, set()).discard(transaction_id)
+        ledger = self.balance_ledgers.get(account_id)
+        if ledger is not None:
+            ledger.add(day, -delta, count=-1)
+            if not ledger.days:
+                del self.balance_ledgers[account_id]
+        if category:
+            by_name = self.transaction_ids_by_category.get(user_id, {})
+            ids = by_name.get(category)
+            if ids is not None:
+                ids.discard(transaction_id)
+                if not ids:
+                    del by_name[category]
+
+    def rebuild_indexes(self) -> None:
+        self.user_ids_by_email = {}
+        self._user_index_entries = {}
+        self.account_ids_by_user = {}
+        self.transaction_keys_by_user = {}
+        self.transaction_ids_by_account = {}
+        self.transaction_ids_by_category = {}
+        self._account_index_entries = {}
+        self._transaction_index_entries = {}
+        self.balance_ledgers = {}
+        for row in list(self.users.values()):
+            self.put_user(row)
+        for row in list(self.accounts.values()):
+            self.put_account(row)
+        for row in list(self.transactions.values()):
+            self.put_transaction(row)
+
+    def user_accounts(self, user_id: UUID) -> list[dict]:
+        return [self.accounts[account_id] for account_id in self.account_ids_by_user.get(user_id, ())]
+
+    def user_transactions(self, user_id: UUID, before: tuple[float, str] | None = None) -> Iterator[dict]:
+        # Newest first; `before` is an exclusive (timestamp, str(id)) keyset bound.
+        keys = self.transaction_keys_by_user.get(user_id, [])
+        end = bisect_left(keys, before) if before is not None else len(keys)
+        for pos in range(end - 1, -1, -1):
+            yield self.transactions[keys[pos][2]]
+
+    def account_transactions(self, account_id: UUID) -> list[dict]:
+        return [self.transactions[tx_id] for tx_id in self.transaction_ids_by_account.get(account_id, ())]
+
+    def account_net_through(self, account_id: UUID, day: date) -> Decimal:
+        ledger = self.balance_ledgers.get(account_id)
+        return ledger.net_through(day) if ledger is not None else Decimal("0")
+
+    def account_net_total(self, account_id: UUID) -> Decimal:
+        ledger = self.balance_ledgers.get(account_id)
+        return ledger.total() if ledger is not None else Decimal("0")
+
+    def category_transaction_ids(self, user_id: UUID, category: str) -> set[UUID]:
+        return set(self.transaction_ids_by_category.get(user_id, {}).get(category, ()))
+
+    def category_counts(self, user_id: UUID) -> dict[str, int]:
+        return {name: len(ids) for name, ids in self.transaction_ids_by_category.get(user_id, {}).items()}
 
     @staticmethod
     def _fallback_locales() -> dict[str, dict[str, str]]:
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.auth_utils import PasswordHashPool, Pbkdf2Hasher, ScryptHasher  # noqa: E402
+
+PASSWORD = "Secret123!"
+
+
+def candidates() -> list[tuple[str, object]]:
+    return [
+        ("scrypt n=2^13", ScryptHasher(n=2**13)),
+        ("scrypt n=2^14", ScryptHasher(n=2**14)),
+        ("scrypt n=2^15", ScryptHasher(n=2**15)),
+        ("pbkdf2 100k", Pbkdf2Hasher(iterations=100_000)),
+        ("pbkdf2 300k", Pbkdf2Hasher(iterations=300_000)),
+        ("pbkdf2 600k", Pbkdf2Hasher(iterations=600_000)),
+    ]
+
+
+def per_core(hasher: object, seconds: float) -> float:
+    # One login is one verify against an existing hash, timed on a single thread.
+    encoded = hasher.hash(PASSWORD)
+    done = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        hasher.verify(PASSWORD, encoded)
+        done += 1
+    return done / (time.perf_counter() - start)
+
+
+async def pooled(hasher: object, workers: int, logins: int) -> float:
+    encoded = hasher.hash(PASSWORD)
+    pool = PasswordHashPool(workers)
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(pool.verify(PASSWORD, encoded) for _ in range(logins)))
+        return logins / (time.perf_counter() - start)
+    finally:
+        pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure password verification throughput per cost setting.")
+    parser.add_argument("--seconds", type=float, default=2.0, help="time spent per setting on one core")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker threads for the pooled run")
+    args = parser.parse_args()
+
+    print(f"{'setting':<16}{'ms/login':>10}{'logins/s/core':>16}{f'pool x{args.workers}':>14}")
+    for label, hasher in candidates():
+        rate = per_core(hasher, args.seconds)
+        total = asyncio.run(pooled(hasher, args.workers, max(args.workers * 4, int(rate * args.seconds))))
+        print(f"{label:<16}{1000 / rate:>10.1f}{rate:>16.1f}{total:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,10 @@ def split_sql_statements(sql: str) -> list[str]:
     tail = "".join(current).strip()
     if tail:
         statements.append(tail)
-    return [s for s in statements if s and not s.startswith("--")]
+    # Comment lines are stripped rather than the chunk dropped: a header comment shares its chunk with
+    # the first statement of the file.
+    cleaned = ["\n".join(line for line in stmt.splitlines() if not line.strip().startswith("--")).strip() for stmt in statements]
+    return [stmt for stmt in cleaned if stmt]
 
 
 def main() -> None:
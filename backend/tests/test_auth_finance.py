@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta, timezone
+
 from fastapi.testclient import TestClient
 
 from app.main import app
@@ -53,3 +55,117 @@ def test_register_create_account_and_transaction() -> None:
     list_tx = client.get("/api/v1/transactions", headers=headers)
     assert list_tx.status_code == 200
     assert len(list_tx.json()) >= 1
+
+
+def test_transactions_cursor_pagination_and_filters() -> None:
+    reg_res = client.post(
+        "/api/v1/auth/register",
+        json={"email": "pager@example.com", "password": "Secret123!", "fullName": "Pager"},
+    )
+    assert reg_res.status_code == 201
+    headers = {"Authorization": f"Bearer {reg_res.json()['token']}"}
+    account_id = client.post(
+        "/api/v1/accounts",
+        json={"name": "Paged", "accountType": "checking", "currency": "CZK", "initialBalance": 0},
+        headers=headers,
+    ).json()["id"]
+    for day in range(1, 6):
+        res = client.post(
+            "/api/v1/transactions",
+            json={
+                "accountId": account_id,
+                "direction": "income" if day % 2 else "expense",
+                "amount": 10,
+                "currency": "CZK",
+                "occurredAt": f"2026-03-0{day}T10:00:00Z",
+                "category": "salary" if day % 2 else "food",
+            },
+            headers=headers,
+        )
+        assert res.status_code == 201
+
+    first = client.get("/api/v1/transactions?limit=2", headers=headers)
+    assert first.status_code == 200
+    assert [tx["occurredAt"][:10] for tx in first.json()] == ["2026-03-05", "2026-03-04"]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/api/v1/transactions", params={"limit": 2, "cursor": cursor}, headers=headers)
+    assert [tx["occurredAt"][:10] for tx in second.json()] == ["2026-03-03", "2026-03-02"]
+    third = client.get("/api/v1/transactions", params={"limit": 2, "cursor": second.headers["X-Next-Cursor"]}, headers=headers)
+    assert [tx["occurredAt"][:10] for tx in third.json()] == ["2026-03-01"]
+    assert "X-Next-Cursor" not in third.headers
+
+    filtered = client.get(
+        "/api/v1/transactions",
+        params={"direction": "income", "occurredFrom": "2026-03-02T00:00:00Z", "accountId": account_id},
+        headers=headers,
+    )
+    assert [tx["category"] for tx in filtered.json()] == ["salary", "salary"]
+
+    padded = {"accountId": account_id, "direction": "expense", "amount": 1, "currency": "CZK", "occurredAt": "2026-02-01T10:00:00Z", "category": " food "}
+    assert client.post("/api/v1/transactions", json=padded, headers=headers).status_code == 201
+    by_category = client.get("/api/v1/transactions", params={"category": "food", "accountId": account_id}, headers=headers)
+    # Exact match, as the PostgreSQL filter `category = :category` does.
+    assert [tx["occurredAt"][:10] for tx in by_category.json()] == ["2026-03-04", "2026-03-02"]
+
+    bad_cursor = client.get("/api/v1/transactions?cursor=not-a-cursor", headers=headers)
+    assert bad_cursor.status_code == 422
+
+
+def test_dashboard_summary_aggregates_series_and_categories() -> None:
+    reg_res = client.post(
+        "/api/v1/auth/register",
+        json={"email": "dashboard@example.com", "password": "Secret123!", "fullName": "Dash"},
+    )
+    assert reg_res.status_code == 201
+    headers = {"Authorization": f"Bearer {reg_res.json()['token']}"}
+    account_id = client.post(
+        "/api/v1/accounts",
+        json={"name": "Main", "accountType": "checking", "currency": "CZK", "initialBalance": 1000},
+        headers=headers,
+    ).json()["id"]
+    today = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+    for days_ago, direction, amount, category in [
+        (60, "expense", 100, "food"),
+        (2, "income", 200, "salary"),
+        (1, "expense", 50, "food"),
+        (0, "expense", 30, "rent"),
+        (-10, "expense", 5, "rent"),
+    ]:
+        res = client.post(
+            "/api/v1/transactions",
+            json={
+                "accountId": account_id,
+                "direction": direction,
+                "amount": amount,
+                "currency": "CZK",
+                "occurredAt": (today - timedelta(days=days_ago)).isoformat(),
+                "category": category,
+            },
+            headers=headers,
+        )
+        assert res.status_code == 201
+
+    summary = client.get("/api/v1/dashboard/summary?period=month", headers=headers)
+    assert summary.status_code == 200
+    body = summary.json()
+    assert body["rangeEnd"] == today.date().isoformat()
+    assert len(body["balanceSeries"]) == 30
+    assert float(body["totalBalance"]) == 1015
+    assert float(body["balanceSeries"][0]["balance"]) == 900
+    assert float(body["balanceSeries"][-1]["balance"]) == 1020
+    assert float(body["periodIncome"]) == 200
+    assert float(body["periodExpense"]) == 80
+    assert [item["category"] for item in body["topExpenseCategories"]] == ["food", "rent"]
+    assert body["monthTotals"]["month"] == today.strftime("%Y-%m")
+    account = body["accounts"][0]
+    assert account["accountId"] == account_id
+    assert float(account["expense"]) == 185
+    assert [float(point["balance"]) for point in account["balanceSeries"]] == [1100, 1050, 1020]
+
+    everything = client.get("/api/v1/dashboard/summary?period=all", headers=headers).json()
+    assert everything["rangeStart"] == (today - timedelta(days=60)).date().isoformat()
+    assert float(everything["balanceSeries"][0]["balance"]) == 900
+
+    invalid = client.get("/api/v1/dashboard/summary?period=decade", headers=headers)
+    assert invalid.status_code == 422
@@ -0,0 +1,135 @@
+import gzip
+import io
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.services import backup
+from app.services.backup import (
+    backup_chain,
+    cleanup_backups,
+    iter_backup_json,
+    iter_backup_sections,
+    iter_restored_sections,
+    list_stored_backups,
+    plan_backup,
+    write_backup_file,
+)
+
+
+def test_streamed_backup_matches_jsonable_encoder(tmp_path) -> None:
+    meta = {"version": 1, "storageBackend": "memory"}
+    rows = [
+        {"id": uuid4(), "amount": Decimal("12.50"), "occurred_at": datetime(2026, 1, 1, tzinfo=timezone.utc), "note": "kava"},
+        {"id": uuid4(), "amount": Decimal("-3"), "occurred_at": datetime(2026, 1, 2, tzinfo=timezone.utc), "note": None},
+    ]
+    sections = [("appSettings", {"defaultLocale": "cs"}), ("transactions", rows), ("rateWatchlist", iter(["BTC"])), ("vehicles", [])]
+    expected = jsonable_encoder({"meta": meta, "data": {name: list(value) if not isinstance(value, dict) else value for name, value in sections}})
+
+    sections[2] = ("rateWatchlist", iter(["BTC"]))
+    assert json.loads("".join(iter_backup_json(meta, sections))) == expected
+
+    target = tmp_path / "backup.json"
+    sections[2] = ("rateWatchlist", iter(["BTC"]))
+    write_backup_file(target, meta, sections)
+    assert json.loads(target.read_text(encoding="utf-8")) == expected
+    assert not (tmp_path / "backup.json.tmp").exists()
+
+
+def test_backup_sections_are_read_incrementally(monkeypatch) -> None:
+    monkeypatch.setattr(backup, "READ_CHUNK_BYTES", 5)
+    rows = [{"id": str(uuid4()), "amount": 1234567.25, "note": "spotřeba"} for _ in range(50)]
+    raw = json.dumps(
+        {"meta": {"version": 1}, "data": {"appSettings": {"defaultLocale": "cs"}, "skipped": [1, 2, 3], "transactions": rows}},
+        ensure_ascii=False,
+        indent=2,
+    ).encode("utf-8")
+
+    handle = io.BytesIO(raw)
+    sections = iter_backup_sections(handle)
+    assert next(sections) == ("appSettings", {"defaultLocale": "cs"})
+    name, skipped = next(sections)
+    assert name == "skipped"
+    name, streamed = next(sections)
+    assert name == "transactions"
+    assert next(streamed) == rows[0]
+    assert handle.tell() < len(raw)
+    assert list(streamed) == rows[1:]
+    assert list(sections) == []
+
+
+@pytest.mark.parametrize("raw", [b'{"data": {"rows": [1, 2', b'{"data": {"rows": [1 2]}}', b'{"data": []}', b'{"data": {}} trailing'])
+def test_backup_sections_reject_invalid_json(raw: bytes) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        for _, content in iter_backup_sections(io.BytesIO(raw)):
+            list(content) if not isinstance(content, dict) else content
+
+
+def _write(directory, user_id, started_at, state: dict, full_every: int = 3):
+    plan = plan_backup(directory, user_id, started_at, "gzip", full_every)
+    rows = state["transactions"]
+    if plan.changed_since is not None:
+        rows = [row for row in rows if row["updated_at"] > plan.changed_since.isoformat()]
+        present = [("transactions", [row["id"] for row in state["transactions"]])]
+    else:
+        present = None
+    sections = [("appSettings", dict(state["appSettings"])), ("transactions", rows)]
+    write_backup_file(plan.path, {"version": 1, **plan.meta}, sections, present)
+    return plan
+
+
+def test_incremental_chain_replays_to_latest_state(tmp_path) -> None:
+    user_id = uuid4()
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    def row(row_id: str, note: str, day: int) -> dict:
+        return {"id": row_id, "note": note, "updated_at": (start + timedelta(days=day)).isoformat()}
+
+    state = {"appSettings": {"defaultLocale": "en"}, "transactions": [row("a", "a0", 0), row("b", "b0", 0), row("c", "c0", 0)]}
+    full = _write(tmp_path, user_id, start + timedelta(hours=1), state)
+    assert full.meta["kind"] == "full" and full.path.name.endswith(".json.gz")
+    with gzip.open(full.path, "rt", encoding="utf-8") as handle:
+        assert len(json.load(handle)["data"]["transactions"]) == 3
+
+    state["transactions"] = [row("a", "a1", 1), row("c", "c0", 0), row("d", "d1", 1)]
+    first = _write(tmp_path, user_id, start + timedelta(days=1, hours=1), state)
+    state["appSettings"] = {"defaultLocale": "cs"}
+    state["transactions"] = [row("a", "a1", 1), row("c", "c2", 2), row("d", "d1", 1)]
+    second = _write(tmp_path, user_id, start + timedelta(days=2, hours=1), state)
+    assert [first.meta["kind"], second.meta["kind"]] == ["incremental", "incremental"]
+    assert second.meta["base"] == full.path.name and second.meta["parent"] == first.path.name
+    with gzip.open(second.path, "rt", encoding="utf-8") as handle:
+        assert [r["id"] for r in json.load(handle)["data"]["transactions"]] == ["c"]
+
+    third = _write(tmp_path, user_id, start + timedelta(days=3, hours=1), state)
+    assert third.meta["kind"] == "full"
+
+    chain = backup_chain(tmp_path, second.path.name)
+    assert chain == [full.path, first.path, second.path]
+    restored = {name: content if isinstance(content, dict) else list(content) for name, content in iter_restored_sections(chain)}
+    assert restored["appSettings"] == {"defaultLocale": "cs"}
+    assert sorted((r["id"], r["note"]) for r in restored["transactions"]) == [("a", "a1"), ("c", "c2"), ("d", "d1")]
+    assert [item.meta["kind"] for item in list_stored_backups(tmp_path, user_id)] == ["full", "incremental", "incremental", "full"]
+    assert list_stored_backups(tmp_path, uuid4()) == []
+
+
+def test_retention_keeps_chains_that_are_still_needed(tmp_path) -> None:
+    user_id = uuid4()
+    now = datetime(2026, 3, 20, tzinfo=timezone.utc)
+    state = {"appSettings": {}, "transactions": []}
+    old_full = _write(tmp_path, user_id, now - timedelta(days=40), state, full_every=2)
+    stale = now - timedelta(days=40)
+    os.utime(old_full.path, (stale.timestamp(), stale.timestamp()))
+    base = _write(tmp_path, user_id, now - timedelta(days=39), state, full_every=1)
+    os.utime(base.path, (stale.timestamp(), stale.timestamp()))
+    latest = _write(tmp_path, user_id, now - timedelta(days=1), state, full_every=2)
+    assert latest.meta["base"] == base.path.name
+
+    cleanup_backups(tmp_path, retention_days=30, now=now)
+    assert not old_full.path.exists()
+    assert base.path.exists() and latest.path.exists()
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.persistence import InMemoryPersistence
+from app.services.backup_jobs import BackupBusyError, BackupJobRunner
+from app.store import store
+
+client = TestClient(main.app)
+
+
+def test_runner_allows_one_backup_at_a_time_and_reports_progress() -> None:
+    runner = BackupJobRunner()
+    user_id = uuid4()
+    release = threading.Event()
+    seen: list[str] = []
+
+    def work(job) -> None:
+        for name, rows in job.track([("settings", {"a": 1}), ("transactions", iter(range(5)))]):
+            if not isinstance(rows, dict):
+                list(rows)
+            seen.append(name)
+        release.wait(2)
+
+    job, future = runner.submit(user_id, "manual", work)
+    with pytest.raises(BackupBusyError) as busy:
+        runner.submit(user_id, "scheduled", work)
+    assert busy.value.job is job
+
+    release.set()
+    future.result(timeout=2)
+    assert job.status == "succeeded"
+    assert job.rows_written == 5 and seen == ["settings", "transactions"]
+    assert job.started_at is not None and job.finished_at >= job.started_at
+    assert runner.list(user_id) == [job] and runner.list(uuid4()) == []
+    runner.shutdown()
+
+
+def test_runner_records_failures_and_accepts_the_next_job() -> None:
+    runner = BackupJobRunner()
+    user_id = uuid4()
+
+    def broken(job) -> None:
+        raise RuntimeError("disk full")
+
+    job, future = runner.submit(user_id, "scheduled", broken)
+    with pytest.raises(RuntimeError):
+        future.result(timeout=2)
+    assert job.status == "failed" and job.error == "disk full"
+
+    worker_names: list[str] = []
+    second, future = runner.submit(user_id, "manual", lambda job: worker_names.append(threading.current_thread().name))
+    future.result(timeout=2)
+    assert second.status == "succeeded"
+    assert worker_names[0].startswith("backup")
+    assert runner.get(job.id) is job
+    runner.shutdown()
+
+
+def test_in_memory_backup_copies_rows_and_marks_the_run_on_the_loop(monkeypatch) -> None:
+    reg = client.post("/api/v1/auth/register", json={"email": f"jobs-{uuid4().hex[:8]}@example.com", "password": "Secret123!"})
+    headers = {"Authorization": f"Bearer {reg.json()['token']}"}
+    account_id = client.post(
+        "/api/v1/accounts",
+        json={"name": "Main", "accountType": "checking", "currency": "CZK", "initialBalance": 10},
+        headers=headers,
+    ).json()["id"]
+    user_id = UUID(reg.json()["userId"])
+    release = threading.Event()
+    written: dict[str, list] = {}
+    marks: list[bool] = []
+
+    def fake_write(path, meta, sections, present=None) -> None:
+        release.wait(2)
+        written.update({name: rows for name, rows in sections if name == "accounts"})
+
+    monkeypatch.setattr(main, "write_backup_file", fake_write)
+    monkeypatch.setattr(InMemoryPersistence, "mark_auto_backup_run", lambda self, uid, when: marks.append(threading.current_thread() is threading.main_thread()))
+
+    async def run() -> None:
+        _, future = main._start_backup(user_id, "manual")
+        next(a for a in store.accounts.values() if str(a["id"]) == account_id)["name"] = "Renamed"
+        release.set()
+        await asyncio.wrap_future(future)
+        assert marks == [True]
+
+    asyncio.run(run())
+    assert [row["name"] for row in written["accounts"]] == ["Main"]
@@ -0,0 +1,110 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.persistence import InMemoryPersistence
+from app.store import store
+
+client = TestClient(app)
+
+
+def _register() -> dict[str, str]:
+    reg = client.post(
+        "/api/v1/auth/register",
+        json={"email": f"balances-{uuid4().hex[:8]}@example.com", "password": "Secret123!", "fullName": "Balances"},
+    )
+    return {"Authorization": f"Bearer {reg.json()['token']}"}
+
+
+def _account(headers: dict[str, str], name: str, initial: int) -> str:
+    res = client.post(
+        "/api/v1/accounts",
+        json={"name": name, "accountType": "checking", "currency": "CZK", "initialBalance": initial},
+        headers=headers,
+    )
+    return res.json()["id"]
+
+
+def _tx(headers: dict[str, str], account_id: str, direction: str, amount: int, occurred_at: str) -> str:
+    res = client.post(
+        "/api/v1/transactions",
+        json={"accountId": account_id, "direction": direction, "amount": amount, "currency": "CZK", "occurredAt": occurred_at},
+        headers=headers,
+    )
+    return res.json()["id"]
+
+
+def _balance_at(headers: dict[str, str], account_id: str, day: str) -> Decimal:
+    res = client.get(f"/api/v1/accounts/{account_id}/balance", params={"at": day}, headers=headers)
+    assert res.status_code == 200
+    return Decimal(res.json()["balance"])
+
+
+def test_balance_at_date_follows_writes() -> None:
+    headers = _register()
+    account_id = _account(headers, "Main", 1000)
+    _tx(headers, account_id, "income", 500, "2026-01-05T10:00:00Z")
+    late = _tx(headers, account_id, "expense", 200, "2026-01-20T23:30:00Z")
+
+    assert _balance_at(headers, account_id, "2026-01-01") == Decimal("1000")
+    assert _balance_at(headers, account_id, "2026-01-05") == Decimal("1500")
+    assert _balance_at(headers, account_id, "2026-01-20") == Decimal("1300")
+
+    client.put(f"/api/v1/transactions/{late}", json={"occurredAt": "2026-01-03T08:00:00Z"}, headers=headers)
+    assert _balance_at(headers, account_id, "2026-01-04") == Decimal("800")
+    client.delete(f"/api/v1/transactions/{late}", headers=headers)
+    assert _balance_at(headers, account_id, "2026-01-04") == Decimal("1000")
+    assert client.get(f"/api/v1/accounts/{uuid4()}/balance", headers=headers).status_code == 404
+
+
+def test_reconciliation_restores_drifted_balances() -> None:
+    headers = _register()
+    source = _account(headers, "Old", 100)
+    target = _account(headers, "New", 0)
+    _tx(headers, source, "income", 50, "2026-02-01T12:00:00Z")
+    _tx(headers, target, "expense", 30, "2026-02-02T12:00:00Z")
+    client.delete(f"/api/v1/accounts/{source}", params={"action": "transfer_balance", "targetAccountId": target}, headers=headers)
+
+    row = store.accounts[next(a for a in store.accounts if str(a) == target)]
+    assert row["current_balance"] == Decimal("120")
+    assert InMemoryPersistence().reconcile_account_balances()["accounts"] == 0
+
+    row["current_balance"] = Decimal("999")
+    assert InMemoryPersistence().reconcile_account_balances()["accounts"] == 1
+    assert row["current_balance"] == Decimal("120")
+    assert _balance_at(headers, target, "2026-02-01") == Decimal("150")
+
+
+def test_balance_series_buckets_and_cache() -> None:
+    headers = _register()
+    account_id = _account(headers, "Series", 100)
+    _tx(headers, account_id, "income", 50, "2025-12-31T12:00:00Z")
+    _tx(headers, account_id, "expense", 20, "2026-01-02T12:00:00Z")
+    _tx(headers, account_id, "income", 5, "2026-01-02T18:00:00Z")
+    _tx(headers, account_id, "expense", 10, "2026-02-10T08:00:00Z")
+    url = f"/api/v1/accounts/{account_id}/balance-series"
+
+    daily = client.get(url, params={"from": "2026-01-01", "to": "2026-01-04"}, headers=headers).json()
+    assert Decimal(daily["openingBalance"]) == Decimal("150")
+    assert [p["bucketStart"] for p in daily["points"]] == ["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"]
+    assert [Decimal(p["balance"]) for p in daily["points"]] == [Decimal("150"), Decimal("135"), Decimal("135"), Decimal("135")]
+    assert Decimal(daily["points"][1]["change"]) == Decimal("-15")
+
+    monthly = client.get(url, params={"from": "2026-01-15", "to": "2026-03-01", "bucket": "month"}, headers=headers).json()
+    assert [p["bucketStart"] for p in monthly["points"]] == ["2026-01-01", "2026-02-01", "2026-03-01"]
+    assert [Decimal(p["balance"]) for p in monthly["points"]] == [Decimal("135"), Decimal("125"), Decimal("125")]
+
+    weekly = client.get(url, params={"from": "2026-01-01", "to": "2026-01-14", "bucket": "week"}, headers=headers).json()
+    assert [p["bucketStart"] for p in weekly["points"]] == ["2025-12-29", "2026-01-05", "2026-01-12"]
+
+    assert client.get(url, params={"from": "2026-01-04", "to": "2026-01-01"}, headers=headers).status_code == 400
+    assert client.get(url, params={"from": "2020-01-01", "to": "2026-01-01"}, headers=headers).status_code == 400
+
+    store.accounts[next(a for a in store.accounts if str(a) == account_id)]["initial_balance"] = Decimal("0")
+    cached = client.get(url, params={"from": "2026-01-01", "to": "2026-01-04"}, headers=headers).json()
+    assert cached == daily
+    _tx(headers, account_id, "income", 1, "2026-01-03T09:00:00Z")
+    fresh = client.get(url, params={"from": "2026-01-01", "to": "2026-01-04"}, headers=headers).json()
+    assert [Decimal(p["balance"]) for p in fresh["points"]] == [Decimal("50"), Decimal("35"), Decimal("36"), Decimal("36")]
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from scripts.run_migrations import split_sql_statements
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "db" / "migrations"
+
+
+def test_every_migration_statement_survives_splitting() -> None:
+    files = sorted(MIGRATIONS_DIR.glob("*.sql"))
+    assert files
+    for file in files:
+        sql = file.read_text(encoding="utf-8")
+        statements = split_sql_statements(sql)
+        kept = "\n".join(statements)
+        code_lines = [line.strip() for line in sql.splitlines() if line.strip() and not line.strip().startswith("--")]
+        assert [line for line in code_lines if line not in kept] == [], file.name
+        assert not any(stmt.startswith("--") for stmt in statements), file.name
+
+
+def test_header_comment_does_not_swallow_first_statement() -> None:
+    sql = "-- Migration: example\n-- Target DB: PostgreSQL\n\ncreate table t (id int);\n\n-- trailing note\ninsert into t values (1);\n"
+    assert split_sql_statements(sql) == ["create table t (id int);", "insert into t values (1);"]
@@ -0,0 +1,86 @@
+import asyncio
+import hashlib
+import threading
+
+from fastapi.testclient import TestClient
+
+from app import auth_utils
+from app.auth_utils import PasswordHashPool, Pbkdf2Hasher, ScryptHasher, needs_rehash, verify_password
+from app.main import app
+from app.store import store
+
+client = TestClient(app)
+
+
+def test_hashers_roundtrip_and_flag_old_costs() -> None:
+    scrypt = ScryptHasher(n=2**10)
+    encoded = scrypt.hash("Secret123!")
+    assert encoded.startswith("scrypt$1024$8$1$")
+    assert scrypt.verify("Secret123!", encoded)
+    assert not scrypt.verify("wrong", encoded)
+    assert verify_password("Secret123!", encoded)
+    assert ScryptHasher(n=2**11).needs_rehash(encoded)
+
+    pbkdf2 = Pbkdf2Hasher(iterations=1000)
+    encoded = pbkdf2.hash("Secret123!")
+    assert encoded.startswith("pbkdf2_sha256$1000$")
+    assert verify_password("Secret123!", encoded)
+    assert not verify_password("wrong", encoded)
+    assert not pbkdf2.needs_rehash(encoded)
+    assert Pbkdf2Hasher(iterations=2000).needs_rehash(encoded)
+
+
+def test_login_upgrades_legacy_hash() -> None:
+    res = client.post("/api/v1/auth/register", json={"email": "legacy@example.com", "password": "Secret123!"})
+    assert res.status_code == 201
+    user_id = store.user_by_email("legacy@example.com")["id"]
+    legacy = "abc123$" + hashlib.sha256(b"abc123:Secret123!").hexdigest()
+    store.user_credentials[user_id] = legacy
+    assert verify_password("Secret123!", legacy)
+    assert needs_rehash(legacy)
+
+    assert client.post("/api/v1/auth/login", json={"email": "legacy@example.com", "password": "Wrong1234!"}).status_code == 401
+    assert store.user_credentials[user_id] == legacy
+
+    res = client.post("/api/v1/auth/login", json={"email": "legacy@example.com", "password": "Secret123!"})
+    assert res.status_code == 200
+    upgraded = store.user_credentials[user_id]
+    assert upgraded.startswith(auth_utils.hasher.scheme + "$")
+    assert not needs_rehash(upgraded)
+    assert client.post("/api/v1/auth/login", json={"email": "legacy@example.com", "password": "Secret123!"}).status_code == 200
+
+
+def test_hash_pool_bounds_worker_threads() -> None:
+    pool = PasswordHashPool(max_workers=2)
+    seen: set[str] = set()
+    original = auth_utils.hasher
+    auth_utils.hasher = ScryptHasher(n=2**10)
+
+    async def run() -> list[bool]:
+        hashes = await asyncio.gather(*(pool.hash(f"pw{i}") for i in range(8)))
+        return await asyncio.gather(*(pool.verify(f"pw{i}", h) for i, h in enumerate(hashes)))
+
+    try:
+        pool._executor.submit(lambda: seen.add(threading.current_thread().name)).result()
+        assert all(asyncio.run(run()))
+        seen.update(t.name for t in threading.enumerate() if t.name.startswith("password"))
+    finally:
+        auth_utils.hasher = original
+        pool.shutdown()
+    assert seen and all(name.startswith("password") for name in seen)
+    assert pool._executor._max_workers == 2
+
+
+def test_login_with_unknown_email_still_verifies_a_hash(monkeypatch) -> None:
+    verified: list[str] = []
+    original = auth_utils.verify_password
+
+    def recording_verify(password: str, stored_hash: str) -> bool:
+        verified.append(stored_hash)
+        return original(password, stored_hash)
+
+    monkeypatch.setattr(auth_utils, "verify_password", recording_verify)
+    res = client.post("/api/v1/auth/login", json={"email": "nobody-here@example.com", "password": "Secret123!"})
+    assert res.status_code == 401
+    assert len(verified) == 1 and verified[0].startswith(auth_utils.hasher.scheme + "$")
+    assert auth_utils.dummy_hash() == verified[0]
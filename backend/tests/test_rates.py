@@ -0,0 +1,223 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import httpx
+
+from app.persistence import InMemoryPersistence
+from app.schemas import RateHistoryBucket, RatesWatchlistUpdate
+from app.services.rates import FakeRateProvider, ProviderBackoff, QuoteCache, RateClient, RateRefresher
+
+
+def make_client(handler) -> RateClient:
+    async def transport_handler(request: httpx.Request) -> httpx.Response:
+        return await handler(request)
+
+    return RateClient(transport=httpx.MockTransport(transport_handler))
+
+
+def test_fx_pairs_sharing_a_base_use_one_request() -> None:
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.host == "api.coingecko.com":
+            return httpx.Response(200, json={"bitcoin": {"usd": 60000}})
+        base = request.url.params["from"]
+        rates = {"EUR": {"USD": 1.1, "CZK": 25.0}, "USD": {"CZK": 23.0}}[base]
+        return httpx.Response(200, json={"base": base, "rates": rates})
+
+    client = make_client(handler)
+    updated, skipped = asyncio.run(client.fetch(["BTC", "EUR/USD", "EUR/CZK", "EUR/GBP", "USD/CZK", "CZK/CZK", "XYZ"]))
+    asyncio.run(client.aclose())
+
+    frankfurter = [r for r in requests if r.url.host == "api.frankfurter.app"]
+    assert len(requests) == 3
+    assert sorted(r.url.params["from"] for r in frankfurter) == ["EUR", "USD"]
+    eur = next(r for r in frankfurter if r.url.params["from"] == "EUR")
+    assert eur.url.params["to"] == "CZK,GBP,USD"
+    assert updated["EUR/CZK"]["price"] == 25.0 and updated["EUR/CZK"]["currency"] == "CZK"
+    assert updated["BTC"]["source"] == "coingecko"
+    assert updated["CZK/CZK"]["source"] == "fx-static"
+    assert skipped == {"EUR/GBP": "no fx rate in provider response", "XYZ": "unsupported symbol for auto-refresh"}
+
+
+def test_providers_are_queried_concurrently() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.2)
+        if request.url.host == "api.coingecko.com":
+            return httpx.Response(200, json={"ethereum": {"usd": 3000}})
+        return httpx.Response(200, json={"rates": {"CZK": 1.0}})
+
+    async def run() -> tuple[float, dict, dict]:
+        client = make_client(handler)
+        started = time.perf_counter()
+        updated, skipped = await client.fetch(["ETH", "EUR/CZK", "USD/CZK", "GBP/CZK"])
+        elapsed = time.perf_counter() - started
+        await client.aclose()
+        return elapsed, updated, skipped
+
+    elapsed, updated, skipped = asyncio.run(run())
+    assert elapsed < 0.6
+    assert len(updated) == 4 and not skipped
+
+
+def test_provider_error_skips_only_its_symbols() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "api.coingecko.com":
+            return httpx.Response(503)
+        return httpx.Response(200, json={"rates": {"CZK": 25.0}})
+
+    client = make_client(handler)
+    updated, skipped = asyncio.run(client.fetch(["BTC", "EUR/CZK"]))
+    asyncio.run(client.aclose())
+    assert list(updated) == ["EUR/CZK"]
+    assert skipped["BTC"].startswith("coingecko error:")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_costs_one_upstream_call_per_symbol_per_ttl() -> None:
+    provider = FakeRateProvider()
+    clock = FakeClock()
+    cache = QuoteCache(provider, ttl_seconds=60, stale_seconds=0, clock=clock)
+
+    async def run() -> None:
+        await cache.fetch(["BTC", "EUR/CZK"])
+        for _ in range(10):
+            updated, skipped = await cache.fetch(["EUR/CZK", "BTC"])
+            assert set(updated) == {"BTC", "EUR/CZK"} and not skipped
+        clock.now = 61
+        await cache.fetch(["BTC"])
+
+    asyncio.run(run())
+    assert provider.calls == [["BTC", "EUR/CZK"], ["BTC"]]
+    stats = cache.stats()
+    assert stats["hits"] == 20 and stats["misses"] == 3 and stats["upstreamCalls"] == 2
+
+
+def test_concurrent_misses_share_one_request() -> None:
+    class SlowProvider(FakeRateProvider):
+        async def fetch(self, symbols):
+            await asyncio.sleep(0.05)
+            return await super().fetch(symbols)
+
+    provider = SlowProvider()
+    cache = QuoteCache(provider)
+
+    async def run() -> list:
+        return await asyncio.gather(*(cache.fetch(["ETH", "USD/CZK"]) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert provider.calls == [["ETH", "USD/CZK"]]
+    assert all(updated["ETH"]["source"] == "fake" for updated, _ in results)
+
+
+def test_stale_entries_are_served_while_revalidating() -> None:
+    provider = FakeRateProvider()
+    clock = FakeClock()
+    cache = QuoteCache(provider, ttl_seconds=60, stale_seconds=600, clock=clock)
+
+    async def run() -> None:
+        first, _ = await cache.fetch(["SOL"])
+        clock.now = 120
+        stale, _ = await cache.fetch(["SOL"])
+        assert stale["SOL"] is first["SOL"]
+        assert len(provider.calls) == 1
+        await asyncio.sleep(0)
+        assert len(provider.calls) == 2
+        assert cache.entries["SOL"].fetched_at == 120
+        clock.now = 1000
+        await cache.fetch(["SOL"])
+
+    asyncio.run(run())
+    assert cache.stats()["staleHits"] == 1
+    assert cache.stats()["misses"] == 2
+    assert len(provider.calls) == 3
+
+
+def test_refresher_backs_off_per_provider() -> None:
+    class FlakyProvider(FakeRateProvider):
+        crypto_down = True
+
+        async def fetch(self, symbols):
+            updated, skipped = await super().fetch(symbols)
+            if self.crypto_down:
+                for sym in [s for s in updated if "/" not in s]:
+                    del updated[sym]
+                    skipped[sym] = "coingecko error: 503"
+            return updated, skipped
+
+    provider = FlakyProvider()
+    clock = FakeClock()
+    backoff = ProviderBackoff(base_seconds=60, max_seconds=300, clock=clock)
+    refresher = RateRefresher(QuoteCache(provider, clock=clock), backoff)
+
+    async def run() -> None:
+        updated, skipped = await refresher.refresh(["BTC", "EUR/CZK"])
+        assert list(updated) == ["EUR/CZK"] and skipped["BTC"].startswith("coingecko error")
+        updated, skipped = await refresher.refresh(["BTC", "EUR/CZK"])
+        assert skipped == {"BTC": "coingecko backing off"}
+        assert provider.calls[-1] == ["EUR/CZK"]
+        clock.now = 60
+        await refresher.refresh(["BTC"])
+        assert backoff.retry_at["coingecko"] == 180
+        clock.now = 180
+        provider.crypto_down = False
+        updated, skipped = await refresher.refresh(["BTC"])
+        assert list(updated) == ["BTC"] and not skipped
+
+    asyncio.run(run())
+    assert backoff.failures == {}
+
+
+def test_refreshed_quotes_reach_every_watcher() -> None:
+    backend = InMemoryPersistence()
+    first, second = uuid4(), uuid4()
+    backend.update_rates_watchlist(first, RatesWatchlistUpdate(symbols=["BTC", "EUR/CZK"]))
+    backend.update_rates_watchlist(second, RatesWatchlistUpdate(symbols=["BTC"]))
+    assert {"BTC", "EUR/CZK"} <= set(backend.list_rate_symbols())
+
+    updated, _ = asyncio.run(FakeRateProvider().fetch(["BTC", "EUR/CZK"]))
+    written = backend.apply_rate_quotes(list(updated.values()))
+    assert written >= 3
+    assert backend.get_rates_state(second)["snapshots"]["BTC"]["source"] == "fake"
+    assert set(backend.get_rates_state(first)["snapshots"]) == {"BTC", "EUR/CZK"}
+
+
+def test_rate_history_downsamples_into_ohlc_buckets() -> None:
+    backend = InMemoryPersistence()
+    symbol = f"T{uuid4().hex[:6].upper()}"
+    monday = datetime(2026, 3, 2, tzinfo=timezone.utc)
+    prices = [10, 14, 8, 11, 20, 19]
+    quotes = [
+        {"symbol": symbol, "price": price, "currency": "USD", "source": "fake", "updatedAt": monday + timedelta(hours=10 * idx)}
+        for idx, price in enumerate(prices)
+    ]
+    assert backend.append_rate_history(quotes) == 6
+    assert backend.append_rate_history(quotes[:1]) == 0
+
+    start, end = monday, monday + timedelta(days=7)
+    raw_days = backend.get_rate_history(symbol, start, end, RateHistoryBucket.day)
+    moved = backend.downsample_rate_history(monday + timedelta(days=2), monday)
+    assert moved == 5
+    assert backend.get_rate_history(symbol, start, end, RateHistoryBucket.day) == raw_days
+    assert [(row["open"], row["high"], row["low"], row["close"], row["samples"]) for row in raw_days] == [
+        (10, 14, 8, 8, 3),
+        (11, 20, 11, 20, 2),
+        (19, 19, 19, 19, 1),
+    ]
+    assert len(backend.get_rate_history(symbol, start, end, RateHistoryBucket.raw)) == 1
+
+    backend.downsample_rate_history(end, end)
+    (week,) = backend.get_rate_history(symbol, start, end, RateHistoryBucket.week)
+    assert (week["bucket_start"], week["open"], week["high"], week["low"], week["close"], week["samples"]) == (
+        monday, 10, 20, 8, 19, 6
+    )
@@ -0,0 +1,63 @@
+import asyncio
+from datetime import timedelta
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.services.sessions import MemorySessionStore, PostgresSessionStore
+
+client = TestClient(main.app)
+
+
+def test_memory_session_store_expiry_and_sweep() -> None:
+    async def scenario() -> None:
+        store = MemorySessionStore()
+        user_id = uuid4()
+        short = await store.create(user_id, timedelta(seconds=-1))
+        kept = await store.create(user_id, timedelta(minutes=30))
+        other = await store.create(uuid4(), timedelta(minutes=30))
+
+        assert await store.sweep() == 1
+        assert await store.get(short) is None
+        assert (await store.get(kept)).user_id == user_id
+
+        await store.touch(kept, timedelta(seconds=-1))
+        assert await store.get(kept) is None
+        assert kept not in store.sessions
+
+        await store.delete_user(user_id)
+        assert user_id not in store.tokens_by_user
+        assert await store.get(other) is not None
+        await store.delete(other)
+        assert store.sessions == {}
+        assert store.buckets == {}
+
+    asyncio.run(scenario())
+
+
+def test_authenticated_request_resolves_the_session_once(monkeypatch) -> None:
+    reg = client.post("/api/v1/auth/register", json={"email": f"once-{uuid4().hex[:8]}@example.com", "password": "Secret123!"})
+    headers = {"Authorization": f"Bearer {reg.json()['token']}"}
+    original = main.session_store.get
+    lookups: list[str] = []
+
+    async def counting_get(token: str):
+        lookups.append(token)
+        return await original(token)
+
+    monkeypatch.setattr(main.session_store, "get", counting_get)
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    assert lookups == [reg.json()["token"]]
+
+
+def test_postgres_session_store_runs_queries_on_the_given_runner() -> None:
+    executed: list[str] = []
+
+    async def runner(func, sql: str, params: dict) -> list[dict]:
+        executed.append(sql)
+        return []
+
+    sessions = PostgresSessionStore(engine=None, runner=runner)
+    assert asyncio.run(sessions.get("missing")) is None
+    assert len(executed) == 1 and "from user_sessions" in executed[0]
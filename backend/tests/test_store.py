@@ -0,0 +1,102 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from app.store import InMemoryStore
+
+
+def _tx(user_id, account_id, day: int, category: str | None) -> dict:
+    return {
+        "id": uuid4(),
+        "user_id": user_id,
+        "account_id": account_id,
+        "direction": "expense",
+        "amount": 1,
+        "transaction_at": datetime(2026, 1, day, tzinfo=timezone.utc),
+        "category": category,
+    }
+
+
+def test_store_indexes_follow_mutations() -> None:
+    store = InMemoryStore()
+    user_id, other_user = uuid4(), uuid4()
+    account_id, other_account = uuid4(), uuid4()
+    store.put_account({"id": account_id, "user_id": user_id})
+    store.put_account({"id": other_account, "user_id": other_user})
+    rows = [_tx(user_id, account_id, day, "food") for day in (3, 1, 2)]
+    for row in rows:
+        store.put_transaction(row)
+    store.put_transaction(_tx(other_user, other_account, 5, "food"))
+
+    assert [row["id"] for row in store.user_accounts(user_id)] == [account_id]
+    assert [row["transaction_at"].day for row in store.user_transactions(user_id)] == [3, 2, 1]
+    assert store.category_counts(user_id) == {"food": 3}
+
+    moved = rows[1]
+    moved["transaction_at"] = datetime(2026, 1, 9, tzinfo=timezone.utc)
+    moved["category"] = "travel"
+    store.put_transaction(moved)
+    assert [row["transaction_at"].day for row in store.user_transactions(user_id)] == [9, 3, 2]
+    assert store.category_counts(user_id) == {"food": 2, "travel": 1}
+    newest = next(store.user_transactions(user_id))
+    before = (newest["transaction_at"].timestamp(), str(newest["id"]))
+    assert [row["transaction_at"].day for row in store.user_transactions(user_id, before=before)] == [3, 2]
+
+    store.remove_transaction(rows[0]["id"])
+    assert len(store.account_transactions(account_id)) == 2
+    assert store.category_transaction_ids(user_id, "food") == {rows[2]["id"]}
+
+    store.rebuild_indexes()
+    assert [row["transaction_at"].day for row in store.user_transactions(user_id)] == [9, 2]
+    assert store.category_counts(other_user) == {"food": 1}
+
+
+def test_user_email_index_follows_mutations() -> None:
+    store = InMemoryStore()
+    user_id, other_id = uuid4(), uuid4()
+    store.put_user({"id": user_id, "email": "Alice@Example.com"})
+    store.put_user({"id": other_id, "email": "bob@example.com"})
+    assert store.user_by_email(" alice@example.COM")["id"] == user_id
+
+    store.users[user_id]["email"] = "alice@new.example.com"
+    store.put_user(store.users[user_id])
+    assert store.user_by_email("alice@example.com") is None
+    assert store.user_by_email("ALICE@new.example.com")["id"] == user_id
+
+    store.remove_user(other_id)
+    assert store.user_by_email("bob@example.com") is None
+
+    store.users = {other_id: {"id": other_id, "email": "Carol@example.com"}}
+    store.rebuild_indexes()
+    assert store.user_by_email("carol@example.com")["id"] == other_id
+    assert store.user_by_email("alice@new.example.com") is None
+
+
+def test_balance_ledger_follows_transaction_mutations() -> None:
+    store = InMemoryStore()
+    user_id, account_id = uuid4(), uuid4()
+    store.put_account({"id": account_id, "user_id": user_id})
+    rows = [{**_tx(user_id, account_id, day, None), "amount": Decimal("10")} for day in (1, 3, 3, 8)]
+    rows[1]["direction"] = "income"
+    for row in rows:
+        store.put_transaction(row)
+    ledger = store.balance_ledgers[account_id]
+    assert ledger.days == [date(2026, 1, d) for d in (1, 3, 8)]
+    assert store.account_net_through(account_id, date(2025, 12, 31)) == 0
+    assert store.account_net_through(account_id, date(2026, 1, 5)) == Decimal("-10")
+    assert store.account_net_total(account_id) == Decimal("-20")
+
+    rows[0]["transaction_at"] = datetime(2026, 1, 4, tzinfo=timezone.utc)
+    rows[0]["amount"] = Decimal("5")
+    store.put_transaction(rows[0])
+    assert ledger.days == [date(2026, 1, d) for d in (3, 4, 8)]
+    assert store.account_net_through(account_id, date(2026, 1, 3)) == 0
+    assert store.account_net_total(account_id) == Decimal("-15")
+
+    store.remove_transaction(rows[3]["id"])
+    store.remove_transaction(rows[2]["id"])
+    assert ledger.days == [date(2026, 1, d) for d in (3, 4)]
+    assert store.account_net_total(account_id) == Decimal("5")
+
+    store.rebuild_indexes()
+    assert store.balance_ledgers[account_id].closing == [Decimal("10"), Decimal("5")]
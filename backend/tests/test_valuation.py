@@ -0,0 +1,67 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.valuation import conversion_factors, rate_graph, value_accounts
+
+client = TestClient(app)
+
+SNAPSHOTS = [
+    {"symbol": "EUR/CZK", "price": "25", "currency": "CZK"},
+    {"symbol": "EUR/USD", "price": "1.25", "currency": "USD"},
+    {"symbol": "GBP/EUR", "price": "1.2", "currency": "EUR"},
+    {"symbol": "BTC", "price": "50000", "currency": "USD"},
+    {"symbol": "EUR/PLN", "price": "4", "currency": "USD"},
+]
+
+
+def test_cross_rates_go_through_pivot_currencies() -> None:
+    graph = rate_graph(SNAPSHOTS)
+    assert "PLN" not in graph
+    to_czk = conversion_factors(graph, "CZK")
+    assert to_czk["USD"] == Decimal("20")
+    assert to_czk["GBP"] == Decimal("30.0")
+    assert to_czk["BTC"] == Decimal("1000000")
+
+
+def test_accounts_are_valued_in_both_display_currencies() -> None:
+    accounts = [
+        {"id": uuid4(), "name": "Main", "currency": "CZK", "current_balance": Decimal("1000")},
+        {"id": uuid4(), "name": "Travel", "currency": "EUR", "current_balance": Decimal("100")},
+        {"id": uuid4(), "name": "Cold wallet", "currency": "BTC", "current_balance": Decimal("0.01")},
+        {"id": uuid4(), "name": "Zloty", "currency": "PLN", "current_balance": Decimal("50")},
+    ]
+    result = value_accounts(accounts, rate_graph(SNAPSHOTS), ["CZK", "USD"])
+    assert result["totals"] == {"CZK": Decimal("13500.00"), "USD": Decimal("675.0000")}
+    assert result["missingRates"] == ["PLN"]
+    assert result["accounts"][3]["values"] == {"CZK": None, "USD": None}
+
+
+def test_net_worth_endpoint_is_cached_until_balances_change() -> None:
+    reg = client.post(
+        "/api/v1/auth/register",
+        json={"email": f"valuation-{uuid4().hex[:8]}@example.com", "password": "Secret123!", "fullName": "Valuation"},
+    )
+    headers = {"Authorization": f"Bearer {reg.json()['token']}"}
+    client.post("/api/v1/rates/snapshot", json={"symbol": "USD/CZK", "price": 20, "currency": "CZK"}, headers=headers)
+    client.post(
+        "/api/v1/accounts",
+        json={"name": "Dollars", "accountType": "checking", "currency": "USD", "initialBalance": 10},
+        headers=headers,
+    )
+
+    first = client.get("/api/v1/valuation/net-worth", headers=headers).json()
+    assert first["currencies"] == ["CZK", "USD"]
+    assert Decimal(first["totals"]["CZK"]) == Decimal("200")
+    assert client.get("/api/v1/valuation/net-worth", headers=headers).json()["computedAt"] == first["computedAt"]
+
+    client.post(
+        "/api/v1/accounts",
+        json={"name": "Koruny", "accountType": "checking", "currency": "CZK", "initialBalance": 100},
+        headers=headers,
+    )
+    second = client.get("/api/v1/valuation/net-worth", headers=headers).json()
+    assert Decimal(second["totals"]["CZK"]) == Decimal("300")
+    assert Decimal(second["totals"]["USD"]) == Decimal("15")
@@ -46,6 +46,12 @@ window.MFUI = (function () {
     return ct.includes("application/json") ? await res.json() : res;
   }
 
+  async function apiPage(path) {
+    const res = await fetch(path, { credentials: "include" });
+    if (!res.ok) throw new Error(await parseError(res));
+    return { items: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") };
+  }
+
   function applyTheme() {
     const theme = localStorage.getItem("mf_theme") || "system";
     document.body.classList.remove("dark");
@@ -165,5 +171,5 @@ window.MFUI = (function () {
     return () => clearInterval(timer);
   }
 
-  return { t, api, init, setMsg, applyTheme, applyLayout, periodicRefresh, formatError: localizeErrorMessage };
+  return { t, api, apiPage, init, setMsg, applyTheme, applyLayout, periodicRefresh, formatError: localizeErrorMessage };
 })();
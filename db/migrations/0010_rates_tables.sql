@@ -0,0 +1,24 @@
+create table if not exists rate_assets (
+  id uuid primary key default gen_random_uuid(),
+  user_id uuid not null references users(id) on delete cascade,
+  symbol text not null,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now(),
+  unique (user_id, symbol)
+);
+
+create table if not exists rate_snapshots (
+  id uuid primary key default gen_random_uuid(),
+  user_id uuid not null references users(id) on delete cascade,
+  symbol text not null,
+  price numeric(30,10) not null,
+  currency text not null default 'USD',
+  source text not null default 'manual',
+  last_updated_at timestamptz not null,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now(),
+  unique (user_id, symbol)
+);
+
+create index if not exists idx_rate_assets_user on rate_assets(user_id, symbol);
+create index if not exists idx_rate_snapshots_user on rate_snapshots(user_id, symbol);
@@ -0,0 +1,10 @@
+create table if not exists user_sessions (
+  token_hash text primary key,
+  user_id uuid not null references users(id) on delete cascade,
+  last_seen_at timestamptz not null default now(),
+  expires_at timestamptz not null,
+  created_at timestamptz not null default now()
+);
+
+create index if not exists idx_user_sessions_expires on user_sessions(expires_at);
+create index if not exists idx_user_sessions_user on user_sessions(user_id);
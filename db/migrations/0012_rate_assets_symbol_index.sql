@@ -0,0 +1 @@
+create index if not exists idx_rate_assets_symbol on rate_assets(symbol, user_id);
@@ -0,0 +1,14 @@
+create table if not exists rate_history (
+  symbol text not null,
+  resolution text not null check (resolution in ('raw', 'day', 'week')),
+  bucket_start timestamptz not null,
+  open numeric(30,10) not null,
+  high numeric(30,10) not null,
+  low numeric(30,10) not null,
+  close numeric(30,10) not null,
+  currency text not null,
+  samples integer not null default 1,
+  primary key (symbol, resolution, bucket_start)
+);
+
+create index if not exists idx_rate_history_resolution on rate_history(resolution, bucket_start);
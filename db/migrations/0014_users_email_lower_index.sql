@@ -0,0 +1,7 @@
+do $$
+begin
+  if not exists (select 1 from users group by lower(trim(email)) having count(*) > 1) then
+    update users set email = lower(trim(email)) where email <> lower(trim(email));
+    create unique index if not exists uq_users_email_lower on users (lower(email));
+  end if;
+end$$;
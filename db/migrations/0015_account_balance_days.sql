@@ -0,0 +1,17 @@
+create table if not exists account_balance_days (
+  account_id uuid not null references accounts(id) on delete cascade,
+  day date not null,
+  net_change numeric(14,2) not null default 0,
+  closing_net numeric(14,2) not null default 0,
+  primary key (account_id, day)
+);
+
+insert into account_balance_days (account_id, day, net_change, closing_net)
+select account_id, day, net_change, sum(net_change) over (partition by account_id order by day)
+from (
+  select account_id, (transaction_at at time zone 'UTC')::date as day,
+         sum(case when direction = 'income' then amount else -amount end) as net_change
+  from transactions
+  group by 1, 2
+) per_day
+on conflict (account_id, day) do nothing;